@@ -0,0 +1,52 @@
+/**
+ * Al-Tijarah Blog Archive
+ * Reads the month-partitioned archive written by scripts/archive_store.py.
+ * The index lists every month; a month's articles are fetched only when
+ * that month is opened, and cached for the rest of the visit.
+ */
+
+const BlogArchive = (() => {
+  const BASE = new URL('../data/archive/', document.currentScript ? document.currentScript.src : location.href);
+
+  let indexPromise = null;
+  const monthPromises = new Map();
+
+  const index = () => indexPromise || (indexPromise = fetch(new URL('index.json', BASE)).then(response => {
+    if (!response.ok) throw new Error(`archive index: HTTP ${response.status}`);
+    return response.json();
+  }));
+
+  /**
+   * Archived months, newest first.
+   * Resolves to [{month, count, first, last}].
+   */
+  const months = async () => (await index()).months.map(({ month, count, first, last }) => ({ month, count, first, last }));
+
+  /**
+   * Articles of one month (YYYY-MM), newest first. Partitions are append-only,
+   * so their size is the cache-busting version.
+   */
+  const month = async (key) => {
+    const entry = (await index()).months.find(item => item.month === key);
+    if (!entry) return [];
+    if (!monthPromises.has(key)) {
+      const url = new URL(`${entry.file}?v=${entry.bytes}`, BASE);
+      monthPromises.set(key, fetch(url).then(response => {
+        if (!response.ok) throw new Error(`archive ${key}: HTTP ${response.status}`);
+        return response.text();
+      }).then(text => text.split('\n')
+        .filter(line => line.trim())
+        .map(line => JSON.parse(line))
+        .sort((a, b) => String(b.date).localeCompare(String(a.date)))));
+    }
+    return monthPromises.get(key);
+  };
+
+  /** Month holding an article, from the index alone. */
+  const monthOf = async (slug) => {
+    const entry = (await index()).months.find(item => item.slugs.includes(slug));
+    return entry ? entry.month : null;
+  };
+
+  return { months, month, monthOf };
+})();
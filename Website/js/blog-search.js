@@ -0,0 +1,149 @@
+/**
+ * Al-Tijarah Blog Search
+ * Queries the sharded index written by scripts/search_index.py. Only the
+ * manifest and the shards holding the query's terms are fetched; shards are
+ * decoded once and cached for the rest of the visit. The manifest is always
+ * revalidated, and docs.json and shards are fetched under the versions it
+ * lists, so a visit never mixes two builds of the index.
+ */
+
+const BlogSearch = (() => {
+  const BASE = new URL('../data/search/', document.currentScript ? document.currentScript.src : location.href);
+
+  let manifestPromise = null;
+  let docsPromise = null;
+  const shardPromises = new Map();
+
+  // ==========================================================================
+  // TOKENIZING (mirrors keyword_matcher.tokenize / fold)
+  // ==========================================================================
+
+  const fold = (token) => {
+    if (token.length > 3 && token.endsWith('s') && !'sui'.includes(token[token.length - 2])) {
+      return token.slice(0, -1);
+    }
+    return token;
+  };
+
+  const tokenize = (text) => (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [])
+    .map(fold)
+    .filter(token => [...token].length > 1 && !token.includes('_'));
+
+  const shardKey = (term, prefixLength) => {
+    const prefix = [...term].slice(0, prefixLength).join('');
+    if (/^[a-z0-9_]+$/.test(prefix)) return prefix;
+    return 'u' + Array.from(new TextEncoder().encode(prefix), b => b.toString(16).padStart(2, '0')).join('');
+  };
+
+  // ==========================================================================
+  // LOADING
+  // ==========================================================================
+
+  const fetchJSON = (name, options) => fetch(new URL(name, BASE), options).then(response => {
+    if (!response.ok) throw new Error(`${name}: HTTP ${response.status}`);
+    return response.json();
+  });
+
+  const manifest = () => manifestPromise || (manifestPromise = fetchJSON('index.json', { cache: 'no-cache' }));
+  const docs = () => docsPromise || (docsPromise = manifest().then(index => fetchJSON(`docs.json?v=${index.docs_hash}`)));
+
+  // Shard layout: varint(terms) { varint(len) utf8 varint(n) { varint(gap) varint(weight) }* }*
+  const decodeShard = (buffer) => {
+    const bytes = new Uint8Array(buffer);
+    const decoder = new TextDecoder();
+    let pos = 0;
+    const varint = () => {
+      let value = 0;
+      let scale = 1;
+      let byte;
+      do {
+        byte = bytes[pos++];
+        value += (byte & 0x7f) * scale;
+        scale *= 128;
+      } while (byte >= 0x80);
+      return value;
+    };
+
+    const postings = new Map();
+    const count = varint();
+    for (let i = 0; i < count; i++) {
+      const length = varint();
+      const term = decoder.decode(bytes.subarray(pos, pos + length));
+      pos += length;
+      const entries = varint();
+      const list = new Array(entries);
+      let doc = 0;
+      for (let j = 0; j < entries; j++) {
+        doc += varint();
+        list[j] = [doc, varint()];
+      }
+      postings.set(term, list);
+    }
+    return postings;
+  };
+
+  const shard = async (key) => {
+    const index = await manifest();
+    const entry = index.shards[key];
+    if (!entry) return new Map();
+    if (!shardPromises.has(key)) {
+      const url = new URL(`shards/${entry.file}?v=${entry.hash}`, BASE);
+      shardPromises.set(key, fetch(url).then(response => {
+        if (!response.ok) throw new Error(`shard ${key}: HTTP ${response.status}`);
+        return response.arrayBuffer();
+      }).then(decodeShard));
+    }
+    return shardPromises.get(key);
+  };
+
+  // ==========================================================================
+  // SEARCH
+  // ==========================================================================
+
+  /**
+   * Articles matching every word of the query, best first. The last word
+   * also matches as a prefix, so results update while typing.
+   * Resolves to [{url, title, date, category, score}].
+   */
+  const search = async (query, limit = 10) => {
+    const index = await manifest();
+    const stopwords = new Set(index.stopwords);
+    const terms = [...new Set(tokenize(query))].filter(term => !stopwords.has(term));
+    if (!terms.length) return [];
+
+    const total = Math.max(index.doc_count, 1);
+    const shards = await Promise.all(terms.map(term => shard(shardKey(term, index.prefix_length))));
+
+    let scores = null;
+    terms.forEach((term, i) => {
+      const isLast = i === terms.length - 1;
+      const termScores = new Map();
+      for (const [candidate, list] of shards[i]) {
+        if (candidate !== term && !(isLast && candidate.startsWith(term))) continue;
+        const idf = Math.log(1 + total / list.length);
+        for (const [doc, weight] of list) {
+          termScores.set(doc, Math.max(termScores.get(doc) || 0, (1 + Math.log(weight)) * idf));
+        }
+      }
+      if (scores === null) {
+        scores = termScores;
+      } else {
+        for (const [doc, score] of scores) {
+          if (termScores.has(doc)) scores.set(doc, score + termScores.get(doc));
+          else scores.delete(doc);
+        }
+      }
+    });
+
+    const table = await docs();
+    return [...scores]
+      .sort((a, b) => b[1] - a[1] || b[0] - a[0])
+      .slice(0, limit)
+      .map(([doc, score]) => {
+        const [url, title, date, category] = table[doc];
+        return { url, title, date, category, score };
+      });
+  };
+
+  return { search, tokenize };
+})();
@@ -0,0 +1,200 @@
+"""
+Month-partitioned archive of aged-out articles.
+
+Articles that leave articles.json are archived by the month they were
+published in, one JSON Lines partition per month, under Website/data/archive/:
+
+    index.json      {version, total, months: [{month, file, count, first,
+                    last, bytes, slugs}, ...]}, newest month first
+    2026-09.jsonl   one article per line, in the order archived
+
+Partitions are only ever appended to, and index.json is small and rewritten
+atomically. Archive pages fetch index.json, then only the partition for the
+month being viewed; `bytes` changes with every append, so it doubles as the
+cache-busting version (see Website/js/blog-archive.js).
+
+If a run dies between appending to a partition and writing the index, the
+partition's size no longer matches and it is rescanned when the archive is
+next opened. Articles already archived (by slug) are never appended twice, so
+re-archiving after such a crash is harmless. The older layout, one JSON
+array per month of archiving, is folded into partitions on open.
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from article_store import date_key, truncate_torn_line, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_NAME = 'index.json'
+PARTITION_RE = re.compile(r'^\d{4}-\d{2}\.jsonl$')
+LEGACY_RE = re.compile(r'^\d{4}-\d{2}\.json$')
+
+
+def article_month(article: Dict) -> str:
+    """Publication month of an article as YYYY-MM."""
+    return date_key(article.get('date'))[:7]
+
+
+def article_id(article: Dict) -> str:
+    return article.get('slug') or article.get('url') or ''
+
+
+class ArchiveStore:
+    """Archive partitions keyed by publication month, plus their index."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_NAME
+        self.months: Dict[str, Dict] = {}
+
+    @classmethod
+    def open(cls, directory: Path) -> 'ArchiveStore':
+        archive = cls(directory)
+        archive._load_index()
+        archive._check_partitions()
+        archive._migrate_legacy()
+        return archive
+
+    # -- index -------------------------------------------------------------
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.months = {entry['month']: entry for entry in data.get('months', [])}
+
+    def _save_index(self) -> None:
+        months = [self.months[month] for month in sorted(self.months, reverse=True)]
+        write_json_atomic(
+            self.index_path,
+            {
+                'version': INDEX_VERSION,
+                'total': sum(entry['count'] for entry in months),
+                'months': months,
+            },
+            indent=None,
+        )
+
+    def _partition(self, month: str) -> Path:
+        return self.directory / f"{month}.jsonl"
+
+    def _scan(self, month: str) -> Dict:
+        """Index entry for a partition, read from the file itself."""
+        path = self._partition(month)
+        truncate_torn_line(path)
+        entry = {'month': month, 'file': path.name, 'count': 0, 'first': '', 'last': '', 'bytes': 0, 'slugs': []}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    self._add_to_entry(entry, json.loads(line))
+        entry['bytes'] = path.stat().st_size
+        return entry
+
+    @staticmethod
+    def _add_to_entry(entry: Dict, article: Dict) -> None:
+        key = date_key(article.get('date'))
+        entry['count'] += 1
+        entry['first'] = min(entry['first'] or key, key)
+        entry['last'] = max(entry['last'], key)
+        entry['slugs'].append(article_id(article))
+
+    def _check_partitions(self) -> None:
+        """Rescan partitions the index does not describe, e.g. after a crash mid-append."""
+        on_disk = {path.stem for path in self.directory.glob('*.jsonl') if PARTITION_RE.match(path.name)}
+        stale = [
+            month for month in on_disk
+            if month not in self.months or self.months[month]['bytes'] != self._partition(month).stat().st_size
+        ]
+        gone = [month for month in self.months if month not in on_disk]
+        for month in stale:
+            logger.warning(f"Rescanning archive partition {self._partition(month)}")
+            self.months[month] = self._scan(month)
+        for month in gone:
+            del self.months[month]
+        if stale or gone:
+            self._save_index()
+
+    def _migrate_legacy(self) -> None:
+        """Fold YYYY-MM.json arrays (keyed by month of archiving) into partitions."""
+        legacy = sorted(path for path in self.directory.glob('*.json') if LEGACY_RE.match(path.name))
+        for path in legacy:
+            with open(path, 'r', encoding='utf-8') as f:
+                articles = json.load(f)
+            self.append(sorted(articles, key=lambda a: date_key(a.get('date'))))
+            path.unlink()
+            logger.info(f"Moved {len(articles)} archived articles from {path.name} into monthly partitions")
+
+    # -- public API --------------------------------------------------------
+
+    def append(self, articles: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Append articles to the partitions of their publication months.
+
+        Articles already in the archive are skipped.
+
+        Returns:
+            {month: articles appended}
+        """
+        by_month: Dict[str, List[Dict]] = {}
+        for article in articles:
+            by_month.setdefault(article_month(article), []).append(article)
+
+        appended: Dict[str, int] = {}
+        for month, batch in sorted(by_month.items()):
+            entry = self.months.get(month) or {
+                'month': month, 'file': f"{month}.jsonl", 'count': 0, 'first': '', 'last': '', 'bytes': 0,
+                'slugs': [],
+            }
+            seen = set(entry['slugs'])
+            new = []
+            for article in batch:
+                if article_id(article) not in seen:
+                    seen.add(article_id(article))
+                    new.append(article)
+            if not new:
+                continue
+
+            path = self._partition(month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'ab') as f:
+                for article in new:
+                    f.write((json.dumps(article, ensure_ascii=False) + '\n').encode('utf-8'))
+                    self._add_to_entry(entry, article)
+                f.flush()
+                os.fsync(f.fileno())
+            entry['bytes'] = path.stat().st_size
+            self.months[month] = entry
+            appended[month] = len(new)
+
+        if appended:
+            self._save_index()
+        return appended
+
+    def index(self) -> List[Dict]:
+        """Index entries, newest month first."""
+        return [self.months[month] for month in sorted(self.months, reverse=True)]
+
+    def load_month(self, month: str) -> List[Dict]:
+        """Articles published in one month (YYYY-MM), newest first. Reads only that partition."""
+        if month not in self.months:
+            return []
+        with open(self._partition(month), 'r', encoding='utf-8') as f:
+            articles = [json.loads(line) for line in f if line.strip()]
+        return sorted(articles, key=lambda a: date_key(a.get('date')), reverse=True)
+
+    def month_of(self, slug: str) -> Optional[str]:
+        """Month whose partition holds an article, from the index alone."""
+        for month, entry in self.months.items():
+            if slug in entry['slugs']:
+                return month
+        return None
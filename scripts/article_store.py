@@ -0,0 +1,246 @@
+"""
+Append-only article store for the Al-Tijarah newspaper.
+
+Generated articles are appended to a JSON Lines log (data/articles.jsonl)
+instead of rewriting the whole of Website/data/articles.json on every run.
+A small date index (data/articles.idx.json) records each record's date and byte
+offset, so the current window can be read by seeking to just those lines.
+
+compact() materializes the files the site consumes: articles.json (articles
+newer than MAX_ARTICLE_AGE_DAYS, newest first) and the archive partitions
+(see archive_store) for articles that have aged out since the previous
+compaction. Every output is
+written to a temp file and renamed into place, so a job that dies mid-write
+never leaves a torn file behind. A torn trailing log line from a crash during
+append is truncated when the store is next opened.
+"""
+
+import bisect
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import DATA_DIR, MAX_ARTICLE_AGE_DAYS
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DATE_KEY_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+def date_key(value: Any) -> str:
+    """Normalize an article date to a sortable naive ISO string."""
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except (ValueError, TypeError):
+        parsed = datetime.now()
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime(DATE_KEY_FORMAT)
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    """Write JSON to a sibling temp file, fsync it and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.write('\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def truncate_torn_line(path: Path) -> None:
+    """Drop a partial trailing line of a JSON Lines file left by a crash during append."""
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                position += newline + 1
+                break
+        logger.warning(f"Truncating torn record at byte {position} of {path}")
+        f.truncate(position)
+
+
+class ArticleStore:
+    """JSON Lines article log with a date-sorted offset index."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.log_path = self.project_root / DATA_DIR / 'articles.jsonl'
+        self.index_path = self.project_root / DATA_DIR / 'articles.idx.json'
+        self.site_data_dir = self.project_root / 'Website' / 'data'
+        self.articles_file = self.site_data_dir / 'articles.json'
+        self.archive_dir = self.site_data_dir / 'archive'
+
+        # [date_key, offset, length] sorted by date_key
+        self.entries: List[List] = []
+        self.archived_before: Optional[str] = None
+
+    @classmethod
+    def open(cls, project_root: Path) -> 'ArticleStore':
+        store = cls(project_root)
+        store.log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not store.log_path.exists():
+            store._import_site_articles()
+            return store
+
+        store._repair_log()
+        if not store._load_index():
+            store._rebuild_index()
+        return store
+
+    # -- log and index -----------------------------------------------------
+
+    def _repair_log(self) -> None:
+        truncate_torn_line(self.log_path)
+
+    def _load_index(self) -> bool:
+        if not self.index_path.exists():
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get('version') != INDEX_VERSION:
+            return False
+
+        # Keep the archive watermark even if the offsets are stale, so a
+        # rebuild never archives the same articles twice.
+        self.archived_before = data.get('archived_before')
+        if data.get('log_size') != self.log_path.stat().st_size:
+            return False
+
+        self.entries = data.get('entries', [])
+        return True
+
+    def _rebuild_index(self) -> None:
+        logger.info(f"Rebuilding article index from {self.log_path}")
+        self.entries = []
+        offset = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    bisect.insort(self.entries, [date_key(record.get('date')), offset, len(line)])
+                offset += len(line)
+        self._save_index()
+
+    def _save_index(self) -> None:
+        write_json_atomic(
+            self.index_path,
+            {
+                'version': INDEX_VERSION,
+                'log_size': self.log_size,
+                'archived_before': self.archived_before,
+                'entries': self.entries,
+            },
+            indent=None,
+        )
+
+    def _import_site_articles(self) -> None:
+        """Seed a new log from the existing articles.json, oldest first."""
+        existing: List[Dict] = []
+        if self.articles_file.exists():
+            with open(self.articles_file, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+
+        self.log_path.touch()
+        if existing:
+            logger.info(f"Importing {len(existing)} articles from {self.articles_file} into {self.log_path}")
+            self.append(sorted(existing, key=lambda a: date_key(a.get('date'))))
+        else:
+            self._save_index()
+
+    def _read(self, entries: List[List]) -> List[Dict]:
+        records = []
+        with open(self.log_path, 'rb') as f:
+            for _, offset, length in entries:
+                f.seek(offset)
+                records.append(json.loads(f.read(length)))
+        return records
+
+    # -- public API --------------------------------------------------------
+
+    def append(self, articles: List[Dict]) -> None:
+        """Append articles to the log and index them. Never rewrites the log."""
+        if not articles:
+            return
+
+        with open(self.log_path, 'ab') as f:
+            offset = f.tell()
+            for article in articles:
+                line = (json.dumps(article, ensure_ascii=False) + '\n').encode('utf-8')
+                f.write(line)
+                bisect.insort(self.entries, [date_key(article.get('date')), offset, len(line)])
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._save_index()
+
+    @property
+    def log_size(self) -> int:
+        return self.log_path.stat().st_size if self.log_path.exists() else 0
+
+    def records_since(self, offset: int = 0) -> List[Dict]:
+        """Records appended at or after a byte offset of the log, in append order."""
+        tail = sorted((entry for entry in self.entries if entry[1] >= offset), key=lambda e: e[1])
+        return self._read(tail)
+
+    def current(self, max_age_days: int = MAX_ARTICLE_AGE_DAYS) -> List[Dict]:
+        """Articles newer than the age cutoff, newest first."""
+        cutoff = date_key(datetime.now() - timedelta(days=max_age_days))
+        start = bisect.bisect_left(self.entries, [cutoff])
+        return list(reversed(self._read(self.entries[start:])))
+
+    def compact(self, max_age_days: int = MAX_ARTICLE_AGE_DAYS) -> List[Dict]:
+        """
+        Materialize articles.json and archive newly aged-out articles.
+
+        Returns:
+            The current articles written to articles.json
+        """
+        from archive_store import ArchiveStore  # archive_store imports this module
+
+        cutoff = date_key(datetime.now() - timedelta(days=max_age_days))
+        start = bisect.bisect_left(self.entries, [cutoff])
+
+        archive_from = 0
+        if self.archived_before is not None:
+            archive_from = bisect.bisect_left(self.entries, [self.archived_before])
+        newly_archived = self._read(self.entries[archive_from:start]) if archive_from < start else []
+
+        current_articles = list(reversed(self._read(self.entries[start:])))
+        write_json_atomic(self.articles_file, current_articles)
+
+        if newly_archived:
+            archived = ArchiveStore.open(self.archive_dir).append(newly_archived)
+            logger.info(f"Archived {sum(archived.values())} old articles into {len(archived)} month(s)")
+
+        if self.archived_before is None or cutoff > self.archived_before:
+            self.archived_before = cutoff
+            self._save_index()
+
+        logger.info(f"Updated articles.json with {len(current_articles)} current articles")
+        return current_articles
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Static asset pipeline for the site's CSS and JavaScript.
+
+Every file in Website/css/ and Website/js/ is minified and written to
+Website/assets/ under a content-hashed name (style.3f9c0a1b2d.css), with
+.gz and .br siblings (.br only if the brotli package is installed). A new
+name for every new version lets browsers cache the files indefinitely.
+
+Website/assets/manifest.json maps each source to its hashed file and records
+the source's hash. On the next run a source whose hash is unchanged, and whose
+output still exists, is skipped, and only edited files are minified and
+compressed again. Superseded hashed files are deleted.
+
+rewrite_html() points src/href attributes at the hashed files. It resolves
+relative links against the page's own directory, so blog/*.html keeps its
+../ prefix. Links to an older hashed name are moved to the current one, so
+pages can be rewritten again after every asset change. build_site's assets
+stage applies it to every page, but only with --deploy: the deploy workflow
+rewrites the copy of the site it publishes, and the committed pages keep
+plain css/ and js/ links. Website/assets/ is not committed.
+
+CSS is minified with rcssmin and JS with rjsmin when they are installed.
+Without rcssmin, a conservative built-in pass strips comments and surplus
+whitespace. Without rjsmin, JS is copied unminified, because stripping
+JavaScript safely needs a real tokenizer.
+
+Usage (on a copy of the site being published):
+    python scripts/assets.py            # rebuild changed assets, rewrite pages
+    python scripts/assets.py --force    # rebuild every asset
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+from article_store import write_json_atomic
+from config import ASSET_DIRS, ASSET_HASH_LENGTH, ASSET_OUTPUT_DIR, ASSET_REWRITE_EXCLUDE
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+ASSET_SUFFIXES = ('.css', '.js')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+# A quoted src/href value ending in .css or .js, optionally with ?query/#hash.
+LINK_RE = re.compile(r'''\b(?P<attr>src|href)=(?P<quote>["'])(?P<url>[^"'?#]+\.(?:css|js))(?P<tail>[?#][^"']*)?(?P=quote)''')
+HASHED_NAME_RE = re.compile(rf'^(?P<stem>.+)\.[0-9a-f]{{{ASSET_HASH_LENGTH}}}(?P<suffix>\.(?:css|js))$')
+
+CSS_TOKEN_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/|\s+''', re.S)
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+
+
+# -- minifying -------------------------------------------------------------
+
+def _minify_css_builtin(text: str) -> str:
+    """Drop comments and collapse whitespace, leaving strings untouched."""
+    parts: List[str] = []
+    last = 0
+    for match in CSS_TOKEN_RE.finditer(text):
+        parts.append(CSS_PUNCT_RE.sub(r'\1', text[last:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        elif not match.group(0).startswith('/*'):
+            parts.append(' ')
+        last = match.end()
+    parts.append(CSS_PUNCT_RE.sub(r'\1', text[last:]))
+
+    # Whitespace next to punctuation only becomes visible once tokens are joined.
+    out: List[str] = []
+    for part in parts:
+        if part == ' ' and (not out or out[-1][-1:] in '{};,> '):
+            continue
+        if part[:1] in '{};,>' and out and out[-1] == ' ':
+            out.pop()
+        out.append(part)
+    return ''.join(out).replace(';}', '}').strip()
+
+
+def minify(text: str, suffix: str) -> str:
+    if suffix == '.css':
+        return rcssmin.cssmin(text) if rcssmin is not None else _minify_css_builtin(text)
+    if suffix == '.js' and rjsmin is not None:
+        return rjsmin.jsmin(text)
+    return text
+
+
+def minifier_names() -> Dict[str, str]:
+    """Tools in use, stored in the manifest so a change rebuilds every asset."""
+    return {
+        'css': 'rcssmin' if rcssmin is not None else 'builtin',
+        'js': 'rjsmin' if rjsmin is not None else 'none',
+        'brotli': 'yes' if brotli is not None else 'no',
+    }
+
+
+# -- writing ---------------------------------------------------------------
+
+def write_precompressed(path: Path, data: bytes) -> int:
+    """Write a file with its precompressed siblings; returns the gzip size."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    # mtime=0 keeps the .gz byte-identical across runs.
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(compressed)
+    if brotli is not None:
+        path.with_name(path.name + '.br').write_bytes(brotli.compress(data, quality=11))
+    return len(compressed)
+
+
+def hashed_name(source: str, data: bytes) -> str:
+    stem, suffix = posixpath.splitext(posixpath.basename(source))
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:ASSET_HASH_LENGTH]}{suffix}"
+
+
+def asset_sources(website: Path) -> List[Path]:
+    """CSS and JS sources under ASSET_DIRS, in path order."""
+    sources = []
+    for directory in ASSET_DIRS:
+        sources.extend(
+            path for path in (website / directory).glob('*')
+            if path.suffix in ASSET_SUFFIXES and path.is_file()
+        )
+    return sorted(sources)
+
+
+def manifest_path(website: Path) -> Path:
+    return website / ASSET_OUTPUT_DIR / MANIFEST_NAME
+
+
+def load_manifest(website: Path) -> Dict:
+    empty = {'version': MANIFEST_VERSION, 'minifiers': minifier_names(), 'assets': {}}
+    try:
+        with open(manifest_path(website), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if data.get('version') != MANIFEST_VERSION or data.get('minifiers') != minifier_names():
+        return empty
+    return data
+
+
+def build_assets(website: Path, force: bool = False) -> Tuple[Dict, int]:
+    """
+    Minify, fingerprint and precompress every changed asset.
+
+    Args:
+        website: The Website/ directory
+        force: Rebuild assets whose source hash is unchanged too
+
+    Returns:
+        (the updated manifest, number of assets rebuilt)
+    """
+    output_dir = website / ASSET_OUTPUT_DIR
+    previous = {} if force else load_manifest(website)['assets']
+    assets: Dict[str, Dict] = {}
+    names: Dict[str, str] = {}
+    rebuilt = 0
+
+    for path in asset_sources(website):
+        source = path.relative_to(website).as_posix()
+        if path.name in names:
+            raise ValueError(f"{source} and {names[path.name]} would share a name in {ASSET_OUTPUT_DIR}/")
+        names[path.name] = source
+
+        raw = path.read_bytes()
+        sha = hashlib.sha256(raw).hexdigest()
+        entry = previous.get(source)
+        if entry and entry['sha256'] == sha and (output_dir / entry['file']).exists():
+            assets[source] = entry
+            continue
+
+        data = minify(raw.decode('utf-8'), path.suffix).encode('utf-8')
+        name = hashed_name(source, data)
+        gzip_bytes = write_precompressed(output_dir / name, data)
+        assets[source] = {
+            'sha256': sha,
+            'file': name,
+            'bytes': len(raw),
+            'min_bytes': len(data),
+            'gzip_bytes': gzip_bytes,
+        }
+        rebuilt += 1
+
+    # Superseded versions are no longer linked once pages are rewritten.
+    current = {entry['file'] for entry in assets.values()}
+    if output_dir.exists():
+        for path in output_dir.iterdir():
+            base = path.name[:-3] if path.name.endswith(COMPRESSED_SUFFIXES) else path.name
+            if base != MANIFEST_NAME and base not in current:
+                path.unlink()
+
+    manifest = {'version': MANIFEST_VERSION, 'minifiers': minifier_names(), 'assets': assets}
+    if rebuilt or previous.keys() != assets.keys():
+        write_json_atomic(manifest_path(website), manifest)
+    return manifest, rebuilt
+
+
+# -- rewriting -------------------------------------------------------------
+
+def asset_map(manifest: Dict) -> Dict[str, str]:
+    """Site-relative source path -> site-relative hashed path."""
+    return {
+        source: f"{ASSET_OUTPUT_DIR}/{entry['file']}"
+        for source, entry in manifest.get('assets', {}).items()
+    }
+
+
+def rewrite_html(html: str, page: str, mapping: Dict[str, str]) -> str:
+    """
+    Point a page's CSS/JS links at their hashed files.
+
+    Args:
+        html: Page source
+        page: Site-relative path of the page, e.g. 'blog/foo.html'
+        mapping: Result of asset_map()
+
+    Returns:
+        The page with every known source (or older hashed name) replaced
+    """
+    if not mapping:
+        return html
+    by_name = {posixpath.basename(source): target for source, target in mapping.items()}
+    page_dir = posixpath.dirname(page)
+
+    def replace(match: re.Match) -> str:
+        url = match.group('url')
+        if '//' in url or url.startswith('/'):
+            return match.group(0)
+        target_path = posixpath.normpath(posixpath.join(page_dir, url))
+        target = mapping.get(target_path)
+        if target is None and posixpath.dirname(target_path) == ASSET_OUTPUT_DIR:
+            stale = HASHED_NAME_RE.match(posixpath.basename(target_path))
+            if stale:
+                target = by_name.get(stale.group('stem') + stale.group('suffix'))
+        if target is None:
+            return match.group(0)
+        new_url = posixpath.relpath(target, page_dir or '.')
+        quote = match.group('quote')
+        return f"{match.group('attr')}={quote}{new_url}{match.group('tail') or ''}{quote}"
+
+    return LINK_RE.sub(replace, html)
+
+
+def strip_fingerprints(html: str, page: str, mapping: Dict[str, str]) -> str:
+    """
+    Undo rewrite_html(): point hashed asset links back at their sources.
+
+    Pages are hashed this way for sitemap lastmod, so an asset edit, which
+    renames the hashed files every page links to, does not read as a change
+    to every page.
+
+    Args:
+        html: Page source
+        page: Site-relative path of the page, e.g. 'blog/foo.html'
+        mapping: Result of asset_map()
+    """
+    by_name = {posixpath.basename(source): source for source in mapping}
+    page_dir = posixpath.dirname(page)
+
+    def replace(match: re.Match) -> str:
+        url = match.group('url')
+        hashed = HASHED_NAME_RE.match(posixpath.basename(url))
+        if hashed is None or posixpath.basename(posixpath.dirname(url)) != ASSET_OUTPUT_DIR:
+            return match.group(0)
+        source = by_name.get(hashed.group('stem') + hashed.group('suffix'))
+        if source is None:
+            return match.group(0)
+        quote = match.group('quote')
+        return f"{match.group('attr')}={quote}{posixpath.relpath(source, page_dir or '.')}{match.group('tail') or ''}{quote}"
+
+    return LINK_RE.sub(replace, html)
+
+
+def html_pages(website: Path, exclude: Tuple[str, ...] = ASSET_REWRITE_EXCLUDE) -> List[str]:
+    """HTML pages under website/ whose site-relative path does not start with an excluded prefix."""
+    root = str(website)
+    pages = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        prefix = '' if rel_dir == '.' else f"{rel_dir}/"
+        if prefix.startswith(exclude):
+            dirnames.clear()
+            continue
+        pages.extend(
+            os.path.join(dirpath, name) for name in filenames
+            if name.endswith('.html') and not f"{prefix}{name}".startswith(exclude)
+        )
+    return sorted(pages)
+
+
+def rewrite_pages(website: Path, pages: Iterable[str], mapping: Dict[str, str]) -> int:
+    """Rewrite asset links in the given pages; returns how many changed."""
+    root = str(website)
+    changed = 0
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+        rel = os.path.relpath(page, root).replace(os.sep, '/')
+        rewritten = rewrite_html(html, rel, mapping)
+        if rewritten != html:
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(rewritten)
+            changed += 1
+    return changed
+
+
+def summarize(manifest: Dict) -> str:
+    assets = manifest['assets'].values()
+    raw = sum(entry['bytes'] for entry in assets)
+    minified = sum(entry['min_bytes'] for entry in assets)
+    gzipped = sum(entry['gzip_bytes'] for entry in assets)
+    return (
+        f"{len(manifest['assets'])} assets, {raw / 1024:.1f} KB -> {minified / 1024:.1f} KB minified, "
+        f"{gzipped / 1024:.1f} KB gzip"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Fingerprint and precompress CSS/JS, then rewrite page links.')
+    parser.add_argument('--force', action='store_true', help='Rebuild every asset')
+    args = parser.parse_args(argv)
+
+    website = Path(__file__).resolve().parent.parent / 'Website'
+    manifest, rebuilt = build_assets(website, force=args.force)
+    changed = rewrite_pages(website, html_pages(website), asset_map(manifest))
+    if rjsmin is None:
+        logger.info("rjsmin not installed; JavaScript copied unminified")
+    logger.info(f"Assets: {rebuilt} rebuilt, {changed} pages rewritten; {summarize(manifest)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
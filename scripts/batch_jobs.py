@@ -0,0 +1,282 @@
+"""
+Offline batch jobs against an OpenAI-compatible Batch API.
+
+A job is a JSONL file with one request per line:
+
+    {"custom_id": "...", "method": "POST", "url": "/v1/responses", "body": {...}}
+
+It is submitted once and finished by a later run. Job state lives in
+data/batch_jobs.json, which the daily workflow commits. For each job it keeps
+the remote batch id, the caller's payload for every custom_id (the news item
+a request was made for), the raw output text once the batch completes, and
+whatever the caller records while ingesting. State is rewritten atomically
+after every step, so a run that dies at any point resumes where it stopped.
+
+Two backends:
+    openai  Files + Batches endpoints of the configured client (honours
+            OPENAI_BASE_URL, so any compatible server works)
+    local   a stand-in that runs the requests itself, on a thread pool, the
+            next time the job is polled. The output uses the Batch API's
+            format, so ingestion is identical. Useful offline and against
+            endpoints without a batch API.
+
+BATCH_BACKEND picks the backend (environment variable, else config).
+"""
+
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from article_store import write_json_atomic
+from config import (
+    BATCH_BACKEND, BATCH_COMPLETION_WINDOW, BATCH_ENDPOINT, BATCH_KEEP_JOBS, CACHE_DIR, DATA_DIR,
+    GENERATION_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Remote statuses after which a batch will not change any more.
+FINISHED = ('completed', 'failed', 'expired', 'cancelled')
+
+
+def response_text(body: Dict) -> str:
+    """Concatenated output_text of a Responses API body (what SDK .output_text returns)."""
+    if body.get('output_text'):
+        return body['output_text']
+    parts = []
+    for item in body.get('output') or []:
+        if item.get('type') != 'message':
+            continue
+        for content in item.get('content') or []:
+            if content.get('type') == 'output_text':
+                parts.append(content.get('text', ''))
+    return ''.join(parts)
+
+
+def parse_output(text: str) -> Dict[str, Dict]:
+    """
+    Batch output JSONL -> {custom_id: {'text': ..., 'error': ..., 'usage': ...}}.
+
+    A request that failed, or whose response was not a 200, gets an error
+    and no text.
+    """
+    results: Dict[str, Dict] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        body = response.get('body') or {}
+        error = record.get('error')
+        if not error and response.get('status_code') != 200:
+            error = body.get('error') or f"HTTP {response.get('status_code')}"
+        results[record['custom_id']] = {
+            'text': '' if error else response_text(body),
+            'error': json.dumps(error) if isinstance(error, dict) else (error or ''),
+            'usage': body.get('usage') or {},
+        }
+    return results
+
+
+# -- backends --------------------------------------------------------------
+
+class OpenAIBatchBackend:
+    """Files upload + Batches API of an OpenAI(-compatible) client."""
+
+    name = 'openai'
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def submit(self, input_path: Path, metadata: Dict[str, str]) -> str:
+        with open(input_path, 'rb') as f:
+            uploaded = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+            metadata=metadata,
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        """(remote status, output JSONL once completed)."""
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != 'completed':
+            return batch.status, None
+        output = self.client.files.content(batch.output_file_id).text if batch.output_file_id else ''
+        if batch.error_file_id:
+            output += '\n' + self.client.files.content(batch.error_file_id).text
+        return batch.status, output
+
+
+class LocalBatchBackend:
+    """Runs a job's requests itself when polled, writing Batch API-style output."""
+
+    name = 'local'
+
+    def __init__(self, client: Any, directory: Path, workers: int = GENERATION_WORKERS):
+        self.client = client
+        self.directory = Path(directory)
+        self.workers = workers
+
+    def submit(self, input_path: Path, metadata: Dict[str, str]) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:16]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{batch_id}.input.jsonl").write_bytes(input_path.read_bytes())
+        return batch_id
+
+    def _run(self, line: str) -> str:
+        request = json.loads(line)
+        try:
+            response = self.client.responses.create(**request['body'])
+            record = {'response': {'status_code': 200, 'body': response.model_dump()}, 'error': None}
+        except Exception as e:
+            record = {'response': None, 'error': {'code': type(e).__name__, 'message': str(e)}}
+        return json.dumps({'custom_id': request['custom_id'], **record}, ensure_ascii=False)
+
+    def poll(self, batch_id: str) -> Tuple[str, Optional[str]]:
+        input_path = self.directory / f"{batch_id}.input.jsonl"
+        output_path = self.directory / f"{batch_id}.output.jsonl"
+        if not output_path.exists():
+            if not input_path.exists():
+                return 'failed', None
+            lines = [line for line in input_path.read_text(encoding='utf-8').splitlines() if line.strip()]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(lines) or 1))) as executor:
+                output = '\n'.join(executor.map(self._run, lines)) + '\n'
+            tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+            tmp_path.write_text(output, encoding='utf-8')
+            tmp_path.replace(output_path)
+        return 'completed', output_path.read_text(encoding='utf-8')
+
+
+def get_backend(client: Any, project_root: Path, name: Optional[str] = None):
+    name = name or os.environ.get('BATCH_BACKEND', BATCH_BACKEND)
+    if name == 'local':
+        return LocalBatchBackend(client, Path(project_root) / CACHE_DIR / 'batches' / 'local')
+    if name == 'openai':
+        return OpenAIBatchBackend(client)
+    raise ValueError(f"Unknown batch backend: {name}")
+
+
+# -- job state -------------------------------------------------------------
+
+class BatchQueue:
+    """Submitted batch jobs and their progress, persisted in data/batch_jobs.json."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self.state_path = self.project_root / DATA_DIR / 'batch_jobs.json'
+        self.input_dir = self.project_root / CACHE_DIR / 'batches'
+        self.jobs: List[Dict] = []
+
+    @classmethod
+    def load(cls, project_root: Path) -> 'BatchQueue':
+        queue = cls(project_root)
+        try:
+            with open(queue.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return queue
+        if data.get('version') == STATE_VERSION:
+            queue.jobs = data.get('jobs', [])
+        return queue
+
+    def save(self) -> None:
+        # Finished jobs are only kept as a short history.
+        finished = [job for job in self.jobs if job['status'] in ('ingested', 'failed')]
+        for job in finished[:max(0, len(finished) - BATCH_KEEP_JOBS)]:
+            self.jobs.remove(job)
+        write_json_atomic(self.state_path, {'version': STATE_VERSION, 'jobs': self.jobs})
+
+    def pending(self) -> List[Dict]:
+        return [job for job in self.jobs if job['status'] not in ('ingested', 'failed')]
+
+    def submit(self, backend, requests: Iterable[Tuple[str, Dict, Dict]], label: str) -> Optional[Dict]:
+        """
+        Serialize requests to a JSONL job file and submit it as one batch.
+
+        Args:
+            backend: From get_backend()
+            requests: (custom_id, request body, payload kept for ingestion)
+            label: Short description stored with the job
+
+        Returns:
+            The new job record, or None if there was nothing to submit
+        """
+        requests = list(requests)
+        if not requests:
+            return None
+
+        job_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.input_dir.mkdir(parents=True, exist_ok=True)
+        input_path = self.input_dir / f"{job_id}.jsonl"
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for custom_id, body, _ in requests:
+                f.write(json.dumps(
+                    {'custom_id': custom_id, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body},
+                    ensure_ascii=False,
+                ) + '\n')
+
+        batch_id = backend.submit(input_path, {'job': job_id, 'label': label[:500]})
+        job = {
+            'id': job_id,
+            'label': label,
+            'backend': backend.name,
+            'batch_id': batch_id,
+            'status': 'submitted',
+            'submitted_at': datetime.now().isoformat(timespec='seconds'),
+            'items': {custom_id: payload for custom_id, _, payload in requests},
+            'results': None,
+        }
+        self.jobs.append(job)
+        self.save()
+        logger.info(f"Submitted batch {batch_id} ({backend.name}) with {len(requests)} requests as job {job_id}")
+        return job
+
+    def poll(self, backend_for: Callable[[str], Any]) -> List[Dict]:
+        """
+        Fetch results of submitted jobs that have finished remotely.
+
+        Args:
+            backend_for: Backend name -> backend instance
+
+        Returns:
+            Jobs whose results are available and not yet fully ingested
+        """
+        ready = []
+        for job in self.pending():
+            if job['results'] is None:
+                try:
+                    status, output = backend_for(job['backend']).poll(job['batch_id'])
+                except Exception as e:
+                    logger.warning(f"Could not poll batch {job['batch_id']}: {e}")
+                    continue
+                if status != 'completed':
+                    if status in FINISHED:
+                        job['status'] = 'failed'
+                        logger.error(f"Batch {job['batch_id']} (job {job['id']}) ended as {status}")
+                        self.save()
+                    else:
+                        logger.info(f"Batch {job['batch_id']} (job {job['id']}) is {status}")
+                    continue
+                job['results'] = parse_output(output or '')
+                job['status'] = 'completed'
+                job['completed_at'] = datetime.now().isoformat(timespec='seconds')
+                self.save()
+            ready.append(job)
+        return ready
+
+    def finish(self, job: Dict) -> None:
+        """Mark a job fully ingested and drop its local input file."""
+        job['status'] = 'ingested'
+        job['ingested_at'] = datetime.now().isoformat(timespec='seconds')
+        self.save()
+        (self.input_dir / f"{job['id']}.jsonl").unlink(missing_ok=True)
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the Al-Tijarah newspaper pipeline.
+
+Each subcommand times a pipeline component against the implementation it
+replaced (or against a synthetic workload) and prints a small report.
+
+Usage:
+    python3 scripts/benchmarks.py keywords --articles 2000 --extra-keywords 400
+    python3 scripts/benchmarks.py dedup --articles 3000
+    python3 scripts/benchmarks.py feeds --items 5000 [--fixtures DIR]
+    python3 scripts/benchmarks.py ranking --articles 3000 --catalogue 300
+    python3 scripts/benchmarks.py selection --articles 5000 --picks 10
+    python3 scripts/benchmarks.py related --articles 10000
+    python3 scripts/benchmarks.py startup [--check] [--repeat 5] [MODULE ...]
+    python3 scripts/benchmarks.py blog-items --files 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
+
+from config import (
+    CATEGORY_KEYWORDS, RELEVANCE_KEYWORDS, SOCIAL_PARSE_WORKERS, STARTUP_BUDGET_MS, STARTUP_BUDGETS_MS,
+    STARTUP_LAZY_IMPORTS
+)
+
+VOCABULARY = (
+    "bank market growth finance policy investment trade economy fund capital "
+    "global regional sector report quarter demand supply energy oil gold rate "
+    "inflation currency export import debt issuance bond equity index reform "
+    "development project infrastructure digital payments housing retail"
+).split()
+
+TRANSLITERATIONS = (
+    "mudarabah wakala salam tawarruq hibah sadaqah khums bayt al-mal hisbah "
+    "maqasid maslaha gharar maysir fatwa mufti dinar dirham nisab ushr kharaj"
+).split()
+
+
+def _timed(fn: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _report(label: str, baseline: float, candidate: float) -> None:
+    speedup = baseline / candidate if candidate else float('inf')
+    print(f"{label:<28} baseline {baseline * 1000:9.1f} ms   new {candidate * 1000:9.1f} ms   x{speedup:.1f}")
+
+
+def _synthetic_articles(count: int, keywords: List[str], rng: random.Random) -> List[Tuple[str, str]]:
+    articles = []
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, k=60) + rng.sample(keywords, k=min(4, len(keywords)))
+        rng.shuffle(words)
+        articles.append((" ".join(words[:12]).title(), " ".join(words[12:])))
+    return articles
+
+
+# ---------------------------------------------------------------------------
+# keywords: compiled matcher vs per-keyword substring loops
+# ---------------------------------------------------------------------------
+
+def _legacy_match(
+    title: str, summary: str, relevance: List[str], categories: Dict[str, List[str]]
+) -> Tuple[int, str]:
+    text = (title + " " + summary).lower()
+    score = sum(1 for keyword in relevance if keyword.lower() in text)
+    scores = {category: sum(1 for kw in kws if kw in text) for category, kws in categories.items()}
+    best = max(scores, key=scores.get)
+    return score, best if scores[best] > 0 else 'analysis'
+
+
+def bench_keywords(args: argparse.Namespace) -> None:
+    from keyword_matcher import KeywordMatcher
+
+    rng = random.Random(args.seed)
+    extra = [
+        f"{rng.choice(TRANSLITERATIONS)} {rng.choice(VOCABULARY)} {i}"
+        for i in range(args.extra_keywords)
+    ]
+    relevance = list(RELEVANCE_KEYWORDS) + extra
+    categories = {
+        category: keywords + extra[i::len(CATEGORY_KEYWORDS)]
+        for i, (category, keywords) in enumerate(CATEGORY_KEYWORDS.items())
+    }
+    total_terms = len(relevance) + sum(len(kws) for kws in categories.values())
+    articles = _synthetic_articles(args.articles, relevance, rng)
+
+    print(f"{len(articles)} articles, {total_terms} keyword terms")
+
+    build_time, matcher = _timed(lambda: KeywordMatcher(relevance, categories), repeat=1)
+    print(f"matcher compile              {build_time * 1000:9.1f} ms (once per process)")
+
+    legacy_time, legacy = _timed(
+        lambda: [_legacy_match(t, s, relevance, categories) for t, s in articles]
+    )
+    new_time, new = _timed(
+        lambda: [matcher.match(t + " " + s) for t, s in articles]
+    )
+    _report("relevance + category", legacy_time, new_time)
+
+    differing = sum(
+        1 for (score, category), match in zip(legacy, new)
+        if score != match.relevance_score or category != match.best_category()
+    )
+    print(f"results differing from substring loops: {differing} (word-boundary matching)")
+
+
+# ---------------------------------------------------------------------------
+# dedup: MinHash/LSH index vs pairwise title Jaccard
+# ---------------------------------------------------------------------------
+
+def _legacy_dedup(items: List[Tuple[str, str]], threshold: float = 0.85) -> int:
+    kept: List[set] = []
+    for title, _ in items:
+        words = set(title.lower().split())
+        if any(len(words & other) / len(words | other) >= threshold for other in kept):
+            continue
+        kept.append(words)
+    return len(kept)
+
+
+def _lsh_dedup(items: List[Tuple[str, str]]) -> int:
+    from dedup_index import DedupIndex
+
+    index = DedupIndex()
+    kept = 0
+    for i, (title, summary) in enumerate(items):
+        signature = index.signature(f"{title} {summary}")
+        if index.find_duplicate(signature) is None:
+            index.add(str(i), signature)
+            kept += 1
+    return kept
+
+
+def bench_dedup(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    items = _synthetic_articles(args.articles, list(RELEVANCE_KEYWORDS), rng)
+    # Re-publish a share of stories with a light edit, as wire copies do.
+    for title, summary in rng.sample(items, k=len(items) // 5):
+        words = summary.split()
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+        items.append((title, " ".join(words)))
+    rng.shuffle(items)
+
+    print(f"{len(items)} candidate items")
+    legacy_time, legacy_kept = _timed(lambda: _legacy_dedup(items), repeat=1)
+    new_time, new_kept = _timed(lambda: _lsh_dedup(items), repeat=1)
+    _report("dedup", legacy_time, new_time)
+    print(f"kept: pairwise titles {legacy_kept}, minhash/lsh {new_kept}")
+
+
+# ---------------------------------------------------------------------------
+# feeds: streaming capped parser vs feedparser on the whole document
+# ---------------------------------------------------------------------------
+
+def _synthetic_feed(kind: str, items: int, rng: random.Random) -> bytes:
+    entries = []
+    for i in range(items):
+        title = " ".join(rng.choices(VOCABULARY, k=8)).title()
+        body = " ".join(rng.choices(VOCABULARY + TRANSLITERATIONS, k=120))
+        if kind == "atom":
+            entries.append(
+                f"<entry><title>{title}</title><link href=\"https://example.org/{i}\"/>"
+                f"<id>urn:item:{i}</id><updated>2026-01-01T00:00:00Z</updated>"
+                f"<summary type=\"html\">&lt;p&gt;{body}&lt;/p&gt;</summary></entry>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{title}</title><link>https://example.org/{i}</link>"
+                f"<pubDate>Thu, 01 Jan 2026 00:00:00 +0000</pubDate>"
+                f"<description><![CDATA[<p>{body}</p>]]></description></item>"
+            )
+    if kind == "atom":
+        return ('<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                "<title>Synthetic</title>" + "".join(entries) + "</feed>").encode("utf-8")
+    return ('<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Synthetic</title>'
+            + "".join(entries) + "</channel></rss>").encode("utf-8")
+
+
+def _peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_feeds(args: argparse.Namespace) -> None:
+    import feedparser
+    from feed_parser import FeedParseError, parse_feed
+
+    if args.fixtures:
+        fixtures = [(path.name, path.read_bytes()) for path in sorted(Path(args.fixtures).glob("*.xml"))]
+    else:
+        rng = random.Random(args.seed)
+        fixtures = [(f"synthetic-{kind}.xml", _synthetic_feed(kind, args.items, rng)) for kind in ("rss", "atom")]
+
+    for name, content in fixtures:
+        print(f"{name}: {len(content) / 1e6:.1f} MB, cap {args.cap} entries")
+
+        def legacy():
+            return [e.get("title", "") for e in feedparser.parse(content).entries[:args.cap]]
+
+        def streaming():
+            return [e["title"] for e in parse_feed(content, args.cap)]
+
+        try:
+            streaming()
+        except FeedParseError as e:
+            print(f"  streaming parser rejected the feed ({e}); feedparser fallback applies")
+            continue
+
+        legacy_time, legacy_titles = _timed(legacy, repeat=1)
+        new_time, new_titles = _timed(streaming)
+        _report("  parse first N", legacy_time, new_time)
+        print(f"  peak memory: feedparser {_peak_memory(legacy) / 1e6:.1f} MB, "
+              f"streaming {_peak_memory(streaming) / 1e6:.2f} MB")
+        print(f"  titles identical: {legacy_titles == new_titles}")
+
+
+# ---------------------------------------------------------------------------
+# ranking: batch TF-IDF ranking of candidates
+# ---------------------------------------------------------------------------
+
+def bench_ranking(args: argparse.Namespace) -> None:
+    from keyword_matcher import match_article
+    from relevance_ranker import rank_articles
+
+    rng = random.Random(args.seed)
+    candidates = [
+        {"title": title, "summary": summary, "relevance_score": match_article(title, summary).relevance_score}
+        for title, summary in _synthetic_articles(args.articles, list(RELEVANCE_KEYWORDS), rng)
+    ]
+    catalogue = [
+        {"title": title, "excerpt": summary, "tags": rng.sample(RELEVANCE_KEYWORDS, k=3)}
+        for title, summary in _synthetic_articles(args.catalogue, list(RELEVANCE_KEYWORDS), rng)
+    ]
+
+    print(f"{len(candidates)} candidates, {len(catalogue)} catalogue articles")
+    elapsed, ranked = _timed(lambda: rank_articles(candidates, catalogue))
+    print(f"rank (tokenize + tf-idf + score) {elapsed * 1000:9.1f} ms")
+
+    keyword_levels = len({a["relevance_score"] for a in candidates})
+    tfidf_levels = len({a["rank_score"] for a in ranked})
+    print(f"distinct scores: keyword count {keyword_levels}, tf-idf {tfidf_levels}")
+
+
+# ---------------------------------------------------------------------------
+# selection: lazy-greedy MMR vs re-scoring every candidate on every pick
+# ---------------------------------------------------------------------------
+
+def _eager_mmr(articles: List[Dict], n: int) -> List[str]:
+    from config import SELECTION_LAMBDA as lam
+    from mmr_selector import _Candidate, similarity
+
+    top = max(a["rank_score"] for a in articles) or 1.0
+    remaining = [_Candidate(a, a["rank_score"] / top) for a in articles]
+    picked: List = []
+    while remaining and len(picked) < n:
+        best = max(
+            remaining,
+            key=lambda c: lam * c.relevance - (1 - lam) * max((similarity(c, p) for p in picked), default=0.0),
+        )
+        remaining.remove(best)
+        picked.append(best)
+    return [c.article["title"] for c in picked]
+
+
+def bench_selection(args: argparse.Namespace) -> None:
+    import logging
+    from mmr_selector import select_diverse
+
+    logging.getLogger("mmr_selector").setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+    categories = list(CATEGORY_KEYWORDS)
+    articles = [
+        {
+            "title": title,
+            "summary": summary,
+            "assigned_category": rng.choice(categories),
+            "source": f"feed-{rng.randrange(20)}",
+            "rank_score": rng.random(),
+        }
+        for title, summary in _synthetic_articles(args.articles, list(RELEVANCE_KEYWORDS), rng)
+    ]
+
+    print(f"{len(articles)} candidates, {args.picks} picks")
+    eager_time, eager = _timed(lambda: _eager_mmr(articles, args.picks), repeat=1)
+    lazy_time, lazy = _timed(lambda: [a["title"] for a in select_diverse(articles, args.picks)])
+    _report("mmr selection", eager_time, lazy_time)
+    print(f"same picks: {eager == lazy}")
+    picked = select_diverse(articles, args.picks)
+    print(f"categories covered: {len({a['assigned_category'] for a in picked})}/{len(categories)}")
+
+
+# ---------------------------------------------------------------------------
+# related: precomputed related-articles index vs scanning every article
+# ---------------------------------------------------------------------------
+
+def _synthetic_store(count: int, rng: random.Random) -> List[Dict]:
+    categories = list(CATEGORY_KEYWORDS)
+    # A long tail of named entities, so articles share more than the base vocabulary.
+    entities = [f"{rng.choice(TRANSLITERATIONS)}{i}" for i in range(max(1, count // 5))]
+    articles = []
+    for i, (title, body) in enumerate(_synthetic_articles(count, list(RELEVANCE_KEYWORDS), rng)):
+        names = [entities[min(int(rng.paretovariate(1.2)), len(entities)) - 1] for _ in range(6)]
+        articles.append({
+            "url": f"blog/article-{i}.html",
+            "slug": f"article-{i}",
+            "title": f"{title} {names[0]}",
+            "excerpt": body[:200],
+            "content_html": f"<p>{body} {' '.join(names)}</p>",
+            "tags": rng.sample(RELEVANCE_KEYWORDS, k=3),
+            "category": rng.choice(categories),
+        })
+    return articles
+
+
+def _scan_related(index, url: str) -> List[str]:
+    """What a page would cost without the index: score it against every article."""
+    doc = index.ids[url]
+    vector = index.vectors[doc]
+    scores = [
+        (sum(weight * other.get(term, 0.0) for term, weight in vector.items()), i)
+        for i, other in enumerate(index.vectors) if i != doc
+    ]
+    scores.sort(key=lambda item: (-item[0], item[1]))
+    return [index.urls[i] for _, i in scores[:index.k]]
+
+
+def bench_related(args: argparse.Namespace) -> None:
+    from related_index import RelatedIndex
+
+    rng = random.Random(args.seed)
+    articles = _synthetic_store(args.articles, rng)
+    print(f"{len(articles)} articles")
+
+    index = RelatedIndex()
+    elapsed, _ = _timed(lambda: index.rebuild(articles), repeat=1)
+    print(f"full rebuild                     {elapsed * 1000:9.1f} ms")
+
+    daily = 10
+    index.rebuild(articles[:-daily])
+    start = time.perf_counter()
+    changed = set()
+    for article in articles[-daily:]:
+        changed |= index.add(article)
+    elapsed = time.perf_counter() - start
+    print(f"incremental add (per article)    {elapsed / daily * 1000:9.2f} ms, {len(changed)} pages affected")
+
+    sample = [a["url"] for a in rng.sample(articles, k=min(50, len(articles)))]
+    scan_time, scanned = _timed(lambda: [_scan_related(index, url) for url in sample], repeat=1)
+    lookup_time, looked_up = _timed(lambda: [index.lookup(url) for url in sample])
+    _report(f"related links for {len(sample)} pages", scan_time, lookup_time)
+
+    index.rebuild(articles)
+    exact = sum(
+        [index.urls[other] for _, other in index.related[index.ids[url]]] == _scan_related(index, url)
+        for url in sample
+    )
+    print(f"indexed top-{index.k} matches exhaustive scan: {exact}/{len(sample)} pages")
+
+
+# ---------------------------------------------------------------------------
+# blog-items: cached discover_blog_items vs parsing every post
+# ---------------------------------------------------------------------------
+
+def bench_blog_items(args: argparse.Namespace) -> None:
+    from dataclasses import asdict
+
+    import generate_social_campaign as social
+
+    sources = sorted((SCRIPTS_DIR.parent / 'Website' / 'blog').glob('*.html'))
+    root = Path(tempfile.mkdtemp(prefix='blog-items-'))
+    try:
+        blog_dir = root / 'Website' / 'blog'
+        blog_dir.mkdir(parents=True)
+        for i in range(args.files):
+            source = sources[i % len(sources)]
+            shutil.copyfile(source, blog_dir / f"{source.stem}-{i:05d}.html")
+        print(f"{args.files} posts copied from {len(sources)} site pages")
+
+        def uncached():
+            """What discover_blog_items did before the cache: parse every post."""
+            paths = sorted(p for p in blog_dir.glob('*.html') if not social._is_blog_blacklisted(p))
+            items = [
+                social.resolve_blog_assets(root, social._parse_blog_html(p, p.read_bytes()), str(p.resolve()))
+                for p in paths
+            ]
+            return sorted(items, key=social.sort_key_for_item, reverse=True)
+
+        baseline, expected = _timed(uncached, repeat=1)
+        cold, _ = _timed(lambda: social.discover_blog_items(root, workers=args.workers), repeat=1)
+        warm, items = _timed(lambda: social.discover_blog_items(root, workers=args.workers))
+        _report(f"cold cache ({min(args.workers, os.cpu_count() or 1)} processes)", baseline, cold)
+        _report("warm cache", baseline, warm)
+
+        # A fresh checkout: same bytes, new mtimes.
+        def touched():
+            now = time.time()
+            for path in blog_dir.glob('*.html'):
+                os.utime(path, (now, now))
+            return social.discover_blog_items(root, workers=args.workers)
+
+        checkout, _ = _timed(touched, repeat=1)
+        _report("fresh checkout (hashes)", baseline, checkout)
+
+        edited = next(blog_dir.glob('*.html'))
+        edited.write_text(edited.read_text(encoding='utf-8').replace('</h1>', ' (updated)</h1>', 1), encoding='utf-8')
+        one, _ = _timed(lambda: social.discover_blog_items(root, workers=args.workers), repeat=1)
+        _report("one post edited", baseline, one)
+
+        same = sum(asdict(a) == asdict(b) for a, b in zip(expected, items))
+        print(f"cached items identical to a full parse: {same}/{len(expected)}")
+    finally:
+        shutil.rmtree(root)
+
+
+# ---------------------------------------------------------------------------
+# startup: import time of every entry point, from python -X importtime
+# ---------------------------------------------------------------------------
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# "import time: <self us> | <cumulative us> | <two spaces per nesting level><module>"
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def entry_points() -> List[str]:
+    """Modules under scripts/ that run as a script."""
+    return sorted(
+        path.stem for path in SCRIPTS_DIR.glob('*.py')
+        if re.search(r'^if __name__ == [\'"]__main__[\'"]:', path.read_text(encoding='utf-8'), re.M)
+    )
+
+
+def _importtime(module: str) -> Tuple[int, Dict[str, int], Set[str], str]:
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Returns:
+        (cumulative microseconds, {direct import: cumulative us},
+        every module loaded, error message or '')
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            records.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+
+    # Lines come in post-order, so the module's imports are the lines between
+    # the previous top-level import (site hooks, -c itself) and its own.
+    total, children, loaded = 0, {}, set()
+    for position, (cumulative, depth, name) in enumerate(records):
+        if depth == 0 and name == module:
+            total = cumulative
+            first = position
+            while first > 0 and records[first - 1][1] > 0:
+                first -= 1
+            for child_cumulative, child_depth, child in records[first:position + 1]:
+                loaded.add(child)
+                if child_depth == 1:
+                    children[child] = child_cumulative
+            break
+
+    messages = [line for line in (result.stdout + result.stderr).splitlines() if line and not IMPORTTIME_RE.match(line)]
+    error = '' if result.returncode == 0 else (messages or ['failed'])[0]
+    return total, children, loaded, error
+
+
+def bench_startup(args: argparse.Namespace) -> int:
+    modules = args.modules or entry_points()
+    failures = []
+    print(f"{'entry point':<26} {'import':>9} {'budget':>8}  heaviest imports")
+    for module in modules:
+        # The first import compiles bytecode; only warm imports are timed.
+        _importtime(module)
+        runs = [_importtime(module) for _ in range(args.repeat)]
+        total, children, loaded, error = min(runs, key=lambda run: run[0])
+        budget = STARTUP_BUDGETS_MS.get(module, STARTUP_BUDGET_MS)
+
+        if error:
+            # Usually an optional dependency missing here; nothing to measure.
+            print(f"{module:<26} {'-':>9} {budget:>6} ms  skipped, import failed: {error}")
+            continue
+
+        heaviest = sorted(children.items(), key=lambda item: -item[1])[:3]
+        print(
+            f"{module:<26} {total / 1000:>6.0f} ms {budget:>6} ms  "
+            + ', '.join(f"{name} {us / 1000:.0f}" for name, us in heaviest)
+        )
+        if total / 1000 > budget:
+            failures.append(f"{module}: {total / 1000:.0f} ms over its {budget} ms budget")
+        eager = [
+            name for name in STARTUP_LAZY_IMPORTS.get(module, ())
+            if any(loaded_name == name or loaded_name.startswith(name + '.') for loaded_name in loaded)
+        ]
+        if eager:
+            failures.append(f"{module}: imports {', '.join(eager)} at startup")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if args.check and failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark newspaper pipeline components.")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic data.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    keywords = subparsers.add_parser("keywords", help="Compiled keyword matcher vs substring loops.")
+    keywords.add_argument("--articles", type=int, default=2000)
+    keywords.add_argument("--extra-keywords", type=int, default=400)
+    keywords.set_defaults(func=bench_keywords)
+
+    dedup = subparsers.add_parser("dedup", help="MinHash/LSH dedup vs pairwise title Jaccard.")
+    dedup.add_argument("--articles", type=int, default=3000)
+    dedup.set_defaults(func=bench_dedup)
+
+    feeds = subparsers.add_parser("feeds", help="Streaming capped feed parser vs feedparser.")
+    feeds.add_argument("--items", type=int, default=5000, help="Entries per synthetic feed.")
+    feeds.add_argument("--cap", type=int, default=10, help="Entries kept per feed.")
+    feeds.add_argument("--fixtures", help="Directory of saved *.xml feeds to use instead.")
+    feeds.set_defaults(func=bench_feeds)
+
+    ranking = subparsers.add_parser("ranking", help="Batch TF-IDF candidate ranking.")
+    ranking.add_argument("--articles", type=int, default=3000)
+    ranking.add_argument("--catalogue", type=int, default=300)
+    ranking.set_defaults(func=bench_ranking)
+
+    selection = subparsers.add_parser("selection", help="Lazy-greedy MMR vs eager MMR selection.")
+    selection.add_argument("--articles", type=int, default=5000)
+    selection.add_argument("--picks", type=int, default=10)
+    selection.set_defaults(func=bench_selection)
+
+    related = subparsers.add_parser("related", help="Related-articles index vs per-page scan.")
+    related.add_argument("--articles", type=int, default=10000)
+    related.set_defaults(func=bench_related)
+
+    blog_items = subparsers.add_parser("blog-items", help="Cached blog post discovery vs parsing every post.")
+    blog_items.add_argument("--files", type=int, default=5000)
+    blog_items.add_argument("--workers", type=int, default=SOCIAL_PARSE_WORKERS, help="Processes for cold parsing.")
+    blog_items.set_defaults(func=bench_blog_items)
+
+    startup = subparsers.add_parser("startup", help="Import time of each entry point (python -X importtime).")
+    startup.add_argument("modules", nargs="*", help="Entry points to measure (default: all under scripts/).")
+    startup.add_argument("--repeat", type=int, default=5, help="Imports per module; the fastest counts.")
+    startup.add_argument(
+        "--check", action="store_true",
+        help="Exit 1 if an entry point exceeds its budget or eagerly loads a lazy dependency.",
+    )
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Incremental static-site build for islamiceconomics.github.io.
+
+The generated parts of the site are modelled as a small dependency graph of
+stages. Each stage declares the files it reads (the article store, templates,
+the podcast feed, ...) and the outputs it owns:
+
+    articles       data/articles.jsonl         -> Website/data/articles.json
+    related        data/articles.jsonl         -> related-articles index
+    article_pages  articles.json + template    -> Website/blog/*.html
+                   + related index
+    blog_index     articles.json + template    -> Website/blog.html
+    search         articles.json + archive     -> Website/data/search/*
+    sitemap        every page + feed.xml       -> Website/sitemap.xml
+
+The deploy stages rewrite pages in place and only run with --deploy, on the
+copy of the site being published (see .github/workflows/deploy-pages.yml):
+
+    images         images/, theory/fig*, ...   -> Website/img/*, <picture> tags
+    assets         css/, js/ + pages           -> Website/assets/*, page links
+
+Not every page is an output. podcast.html and podcast/feed.xml are edited by
+hand when an episode is published, since no script here generates them, so
+the graph only reads them: the feed dates podcast.html in the sitemap and a new
+episode makes the sitemap stage stale. The Foundations book is rendered by
+Quarto and its search index sharded by foundations_search.py, both in the
+deploy workflow; the sitemap lists the rendered pages.
+
+A stage only runs when the content hashes of its inputs differ from the last
+successful build, recorded in .cache/newspaper/build_manifest.json, or when one
+of its outputs is missing. Article pages are also tracked individually, so only
+changed pages are re-rendered, on a process pool once there are enough of them.
+A page's hash covers its related links, so older pages whose related articles
+changed when new ones were indexed are re-rendered too.
+
+Usage:
+    python scripts/build_site.py                 # rebuild stale outputs
+    python scripts/build_site.py sitemap         # one stage and its dependencies
+    python scripts/build_site.py --force         # rebuild everything
+    python scripts/build_site.py --list          # show stages and staleness
+    python scripts/build_site.py --deploy        # images and assets for publishing
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import assets
+import images
+import template_service
+from article_store import ArticleStore, date_key, write_json_atomic
+from config import (
+    BUILD_PARALLEL_MIN_PAGES, BUILD_WORKERS, CACHE_DIR, DATA_DIR, SITE_ORIGIN, SITEMAP_DEFAULTS,
+    SITEMAP_EXCLUDE
+)
+from related_index import RelatedIndex, open_related_index
+from search_index import SearchIndex, archive_dir, update_search_index
+from site_pages import blog_is_template_owned, og_image_url, rebuild_article_page, regenerate_blog_html
+from sitemap import read_sitemap, write_sitemap
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Stage inputs may be plain strings where a tree of many files is listed.
+PathLike = Union[Path, str]
+
+
+def get_project_root() -> Path:
+    return Path(__file__).resolve().parent.parent
+
+
+# -- build state -----------------------------------------------------------
+
+class BuildContext:
+    """Project paths plus the persisted manifest of input hashes."""
+
+    def __init__(self, project_root: Path, workers: int = BUILD_WORKERS, force: bool = False):
+        self.project_root = project_root
+        self.website = project_root / 'Website'
+        self.articles_file = self.website / 'data' / 'articles.json'
+        self.workers = workers
+        self.force = force
+        self.manifest_path = project_root / CACHE_DIR / 'build_manifest.json'
+        self.manifest = self._load_manifest()
+        self.dirty = False
+        self._prefix = f"{project_root}{os.sep}"
+        self._articles: Optional[List[Dict]] = None
+        self._related: Optional[RelatedIndex] = None
+        self._asset_map: Optional[Dict[str, str]] = None
+
+    def _load_manifest(self) -> Dict:
+        empty = {'version': MANIFEST_VERSION, 'files': {}, 'stages': {}, 'pages': {}, 'sitemap': {}}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if data.get('version') != MANIFEST_VERSION:
+            return empty
+        return {**empty, **data}
+
+    def save_manifest(self) -> None:
+        write_json_atomic(self.manifest_path, self.manifest, indent=None)
+        self.dirty = False
+
+    def rel(self, path: PathLike) -> str:
+        """Project-relative POSIX path, without pathlib's per-call parsing."""
+        text = str(path)
+        if text.startswith(self._prefix):
+            return text[len(self._prefix):].replace(os.sep, '/')
+        return Path(path).relative_to(self.project_root).as_posix()
+
+    def file_hash(self, path: PathLike) -> str:
+        """Content hash of a file, reusing the stored hash while mtime and size match."""
+        rel = self.rel(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if self.manifest['files'].pop(rel, None) is not None:
+                self.dirty = True
+            return 'missing'
+
+        cached = self.manifest['files'].get(rel)
+        if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            return cached['sha256']
+
+        sha = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+        self.manifest['files'][rel] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha}
+        self.dirty = True
+        return sha
+
+    def page_hash(self, path: PathLike) -> str:
+        """
+        Content hash of a page with its asset links unhashed, cached like file_hash().
+
+        A page without fingerprinted links hashes the same as its bytes.
+        """
+        if self.file_hash(path) == 'missing':
+            return 'missing'
+        cached = self.manifest['files'][self.rel(path)]
+        if 'page_sha256' not in cached:
+            if self._asset_map is None:
+                self._asset_map = assets.asset_map(assets.load_manifest(self.website))
+            page = self.rel(path)[len('Website/'):]
+            with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+                html = assets.strip_fingerprints(f.read(), page, self._asset_map)
+            cached['page_sha256'] = hashlib.sha256(html.encode('utf-8', 'surrogateescape')).hexdigest()
+            self.dirty = True
+        return cached['page_sha256']
+
+    def articles(self) -> List[Dict]:
+        """Current articles.json, read once per build after the articles stage."""
+        if self._articles is None:
+            try:
+                with open(self.articles_file, 'r', encoding='utf-8') as f:
+                    self._articles = json.load(f)
+            except (OSError, ValueError):
+                self._articles = []
+        return self._articles
+
+    def invalidate_articles(self) -> None:
+        self._articles = None
+
+    def related_index(self) -> RelatedIndex:
+        """Related-articles index, synced with the article log once per build."""
+        if self._related is None:
+            self._related = open_related_index(self.project_root)
+        return self._related
+
+    def template_paths(self, name: str) -> List[Path]:
+        """A template and every template it extends, includes or imports."""
+        return template_service.template_files(self.project_root, name)
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: Callable[[BuildContext], List[PathLike]]
+    outputs: Callable[[BuildContext], List[Path]]
+    build: Callable[[BuildContext], str]
+    deps: Tuple[str, ...] = ()
+    key: Callable[[BuildContext], str] = lambda ctx: ''
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # built / fresh / failed / skipped
+    elapsed: float = 0.0
+    detail: str = ''
+
+
+def fingerprint(stage: Stage, ctx: BuildContext) -> str:
+    digest = hashlib.sha256(stage.key(ctx).encode('utf-8'))
+    for path in sorted(stage.inputs(ctx), key=str):
+        digest.update(ctx.rel(path).encode('utf-8'))
+        digest.update(ctx.file_hash(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def is_stale(stage: Stage, ctx: BuildContext, stage_fingerprint: str) -> bool:
+    if ctx.force or ctx.manifest['stages'].get(stage.name) != stage_fingerprint:
+        return True
+    return any(not path.exists() for path in stage.outputs(ctx))
+
+
+# -- stages ----------------------------------------------------------------
+
+def build_articles(ctx: BuildContext) -> str:
+    current = ArticleStore.open(ctx.project_root).compact()
+    ctx.invalidate_articles()
+    return f"{len(current)} current articles"
+
+
+def build_related(ctx: BuildContext) -> str:
+    index = ctx.related_index()
+    index.save(RelatedIndex.default_path(ctx.project_root))
+    return f"{len(index)} articles indexed"
+
+
+def _page_hash(article: Dict, related: List[Dict], og_image: str, template_hash: str) -> str:
+    payload = json.dumps([article, related, og_image], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256((template_hash + payload).encode('utf-8')).hexdigest()
+
+
+def _rebuild_page(job: Tuple[str, Dict, List[Dict]]) -> Tuple[str, Optional[bool], str]:
+    """Process-pool worker: render one article page."""
+    project_root, article, related = job
+    try:
+        return article['url'], rebuild_article_page(article, Path(project_root), related), ''
+    except Exception as e:
+        return article['url'], None, str(e)
+
+
+def build_article_pages(ctx: BuildContext) -> str:
+    template_hash = ''.join(ctx.file_hash(path) for path in ctx.template_paths('article_template.html'))
+    pages = ctx.manifest['pages']
+    related_index = ctx.related_index()
+
+    stale = []
+    for article in ctx.articles():
+        url = article.get('url')
+        if not url:
+            continue
+        related = related_index.lookup(url)
+        page_hash = _page_hash(article, related, og_image_url(article, ctx.project_root), template_hash)
+        if ctx.force or pages.get(url) != page_hash or not (ctx.website / url).exists():
+            stale.append((article, related, page_hash))
+
+    jobs = [(str(ctx.project_root), article, related) for article, related, _ in stale]
+    if ctx.workers > 1 and len(jobs) >= BUILD_PARALLEL_MIN_PAGES:
+        chunksize = max(1, len(jobs) // (ctx.workers * 4))
+        with ProcessPoolExecutor(max_workers=ctx.workers) as executor:
+            results = list(executor.map(_rebuild_page, jobs, chunksize=chunksize))
+    else:
+        results = [_rebuild_page(job) for job in jobs]
+
+    written = failed = 0
+    for (_, _, page_hash), (url, changed, error) in zip(stale, results):
+        if changed is None:
+            failed += 1
+            logger.error(f"Error rendering {url}: {error}")
+            continue
+        pages[url] = page_hash
+        written += int(changed)
+
+    if failed:
+        raise RuntimeError(f"{failed} article pages failed to render")
+    return f"{len(stale)} stale of {len(ctx.articles())} pages, {written} written"
+
+
+def build_blog_index(ctx: BuildContext) -> str:
+    if not ctx.articles():
+        return "skipped: no articles"
+    if not blog_is_template_owned(ctx.website / 'blog.html'):
+        return "skipped: blog.html is hand-curated"
+    if regenerate_blog_html(ctx.articles(), ctx.project_root) is False:
+        raise RuntimeError("blog.html render failed")
+    return f"{len(ctx.articles())} articles"
+
+
+def build_search(ctx: BuildContext) -> str:
+    index = update_search_index(ctx.articles(), ctx.project_root)
+    return f"{len(index.docs)} articles, {len(index.shards)} shards"
+
+
+PUBDATE_RE = re.compile(r'<pubDate>([^<]+)</pubDate>')
+
+
+def _latest_podcast_date(feed_path: Path) -> Optional[str]:
+    try:
+        text = feed_path.read_text(encoding='utf-8')
+    except OSError:
+        return None
+    dates = []
+    for value in PUBDATE_RE.findall(text):
+        try:
+            dates.append(parsedate_to_datetime(value.strip()).strftime('%Y-%m-%d'))
+        except (TypeError, ValueError):
+            continue
+    return max(dates) if dates else None
+
+
+def build_images(ctx: BuildContext) -> str:
+    manifest, encoded = images.build_images(ctx.website, workers=ctx.workers, force=ctx.force)
+    pictures = images.rewrite_pages(ctx.website, assets.html_pages(ctx.website), manifest)
+    return f"{encoded} encoded, {pictures} pages rewritten; {images.summarize(manifest)}"
+
+
+def build_assets(ctx: BuildContext) -> str:
+    manifest, rebuilt = assets.build_assets(ctx.website, force=ctx.force)
+    pages = assets.html_pages(ctx.website)
+    rewritten = assets.rewrite_pages(ctx.website, pages, assets.asset_map(manifest))
+    return f"{rebuilt} rebuilt, {rewritten} pages relinked; {assets.summarize(manifest)}"
+
+
+def sitemap_pages(ctx: BuildContext) -> List[str]:
+    """Published HTML pages under Website/, minus SITEMAP_EXCLUDE, in path order."""
+    return assets.html_pages(ctx.website, SITEMAP_EXCLUDE)
+
+
+def _page_for_loc(ctx: BuildContext, loc: str) -> Optional[Path]:
+    if not loc.startswith(f"{SITE_ORIGIN}/"):
+        return None
+    rel = loc[len(SITE_ORIGIN) + 1:]
+    return ctx.website / (rel + 'index.html' if rel.endswith('/') or not rel else rel)
+
+
+def _section(loc: str) -> str:
+    rel = loc[len(SITE_ORIGIN) + 1:]
+    return rel.split('/', 1)[0] if '/' in rel else ''
+
+
+def build_sitemap(ctx: BuildContext) -> str:
+    """
+    Bring sitemap.xml in line with the pages on disk.
+
+    Each page's content hash is kept in the build manifest, and a page gets
+    today's date as its lastmod only when its hash changed. Fingerprinted
+    asset links are unhashed first, so asset edits alone leave lastmod as is. Pages seen for the
+    first time keep the lastmod already in the sitemap. New pages are added
+    after the existing entries of their directory (blog posts dated by their
+    article). Entries for deleted pages are dropped. Hand-maintained entries
+    keep their order, changefreq and priority.
+    """
+    sitemap_path = ctx.website / 'sitemap.xml'
+    entries: Dict[str, Dict] = {e['loc']: e for e in read_sitemap(sitemap_path)}
+    hashes = ctx.manifest['sitemap']
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    removed = 0
+    known: Dict[str, str] = {}
+    for loc in list(entries):
+        path = _page_for_loc(ctx, loc)
+        if path is None:
+            continue
+        if not path.exists():
+            del entries[loc]
+            hashes.pop(loc, None)
+            removed += 1
+        else:
+            known[str(path)] = loc
+
+    article_dates = {a['url']: date_key(a.get('date'))[:10] for a in ctx.articles() if a.get('url')}
+    new_entries: List[Dict] = []
+    updated = 0
+    for page in sitemap_pages(ctx):
+        rel = ctx.rel(page)[len('Website/'):]
+        loc = known.get(page, f"{SITE_ORIGIN}/{rel}")
+        page_hash = ctx.page_hash(page)
+        entry = entries.get(loc)
+        if entry is None:
+            changefreq, priority = SITEMAP_DEFAULTS.get(_section(loc), SITEMAP_DEFAULTS[''])
+            entry = {
+                'loc': loc,
+                'lastmod': article_dates.get(rel, today),
+                'changefreq': changefreq,
+                'priority': priority,
+            }
+            new_entries.append(entry)
+        elif hashes.get(loc) not in (None, page_hash):
+            entry['lastmod'] = today
+            updated += 1
+        hashes[loc] = page_hash
+
+    # Each new page goes after the last existing entry of its directory.
+    pending: Dict[str, List[Dict]] = {}
+    for entry in new_entries:
+        pending.setdefault(_section(entry['loc']), []).append(entry)
+    existing = list(entries.values())
+    last_of_section = {_section(e['loc']): i for i, e in enumerate(existing)}
+    ordered: List[Dict] = []
+    for i, entry in enumerate(existing):
+        ordered.append(entry)
+        section = _section(entry['loc'])
+        if last_of_section[section] == i:
+            ordered.extend(pending.pop(section, []))
+    for section_entries in pending.values():
+        ordered.extend(section_entries)
+
+    # podcast.html is static; its content changes when an episode is published.
+    latest = {
+        f"{SITE_ORIGIN}/blog.html": max(article_dates.values(), default=None),
+        f"{SITE_ORIGIN}/podcast.html": _latest_podcast_date(ctx.website / 'podcast' / 'feed.xml'),
+    }
+    for entry in ordered:
+        newest = latest.get(entry['loc'])
+        if newest and newest > entry['lastmod']:
+            entry['lastmod'] = newest
+
+    children, written = write_sitemap(sitemap_path, ordered, SITE_ORIGIN)
+
+    detail = f"{len(ordered)} urls, {len(new_entries)} added, {updated} updated, {removed} removed"
+    if children:
+        detail += f", index of {children} sitemaps"
+    return detail + ('' if written else ', unchanged')
+
+
+STAGES: Dict[str, Stage] = {stage.name: stage for stage in [
+    Stage(
+        name='articles',
+        inputs=lambda ctx: [ctx.project_root / DATA_DIR / 'articles.jsonl'],
+        outputs=lambda ctx: [ctx.articles_file],
+        build=build_articles,
+        # The current window moves with the calendar even when the log does not.
+        key=lambda ctx: datetime.now().strftime('%Y-%m-%d'),
+    ),
+    Stage(
+        name='related',
+        inputs=lambda ctx: [ctx.project_root / DATA_DIR / 'articles.jsonl'],
+        outputs=lambda ctx: [RelatedIndex.default_path(ctx.project_root)],
+        build=build_related,
+        deps=('articles',),
+    ),
+    Stage(
+        name='article_pages',
+        inputs=lambda ctx: [
+            ctx.articles_file,
+            *ctx.template_paths('article_template.html'),
+            RelatedIndex.default_path(ctx.project_root),
+        ],
+        outputs=lambda ctx: [ctx.website / a['url'] for a in ctx.articles() if a.get('url')],
+        build=build_article_pages,
+        deps=('articles', 'related'),
+    ),
+    Stage(
+        name='blog_index',
+        inputs=lambda ctx: [ctx.articles_file, *ctx.template_paths('blog_template.html')],
+        outputs=lambda ctx: [ctx.website / 'blog.html'],
+        build=build_blog_index,
+        deps=('articles',),
+        key=lambda ctx: datetime.now().strftime('%Y-%m-%d'),  # masthead date
+    ),
+    Stage(
+        name='search',
+        inputs=lambda ctx: [ctx.articles_file, archive_dir(ctx.project_root) / 'index.json'],
+        outputs=lambda ctx: [SearchIndex(ctx.project_root).manifest_path],
+        build=build_search,
+        deps=('articles',),
+    ),
+    Stage(
+        name='sitemap',
+        # Every page is an input, hashed only when its mtime or size changed,
+        # so an unchanged tree is confirmed fresh from stat() calls alone.
+        inputs=lambda ctx: [ctx.articles_file, ctx.website / 'podcast' / 'feed.xml'] + sitemap_pages(ctx),
+        outputs=lambda ctx: [ctx.website / 'sitemap.xml'],
+        build=build_sitemap,
+        deps=('article_pages', 'blog_index'),
+    ),
+]}
+
+# Stages that rewrite pages in place. They run only with --deploy, in the
+# deploy workflow on the checkout uploaded as the Pages artifact, so the
+# committed pages keep plain links to css/, js/ and their source images.
+DEPLOY_STAGES: Dict[str, Stage] = {stage.name: stage for stage in [
+    Stage(
+        name='images',
+        # Pages are inputs so newly written or hand-edited ones get <picture>.
+        inputs=lambda ctx: images.image_sources(ctx.website) + assets.html_pages(ctx.website),
+        outputs=lambda ctx: [images.manifest_path(ctx.website)],
+        build=build_images,
+    ),
+    Stage(
+        name='assets',
+        # Pages are inputs so newly written or hand-edited ones get their
+        # links rewritten.
+        inputs=lambda ctx: (
+            assets.asset_sources(ctx.website)
+            + assets.html_pages(ctx.website)
+        ),
+        outputs=lambda ctx: [assets.manifest_path(ctx.website)],
+        build=build_assets,
+    ),
+]}
+
+
+# -- driver ----------------------------------------------------------------
+
+def plan(targets: List[str], stages: Dict[str, Stage] = STAGES) -> List[str]:
+    """Stages needed for the targets (all stages if none), in dependency order."""
+    wanted = set()
+    pending = list(targets or stages)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(stages[name].deps)
+
+    graph = TopologicalSorter({name: stages[name].deps for name in wanted})
+    return list(graph.static_order())
+
+
+def run_build(ctx: BuildContext, targets: List[str], stages: Dict[str, Stage] = STAGES) -> List[StageResult]:
+    results: Dict[str, StageResult] = {}
+
+    for name in plan(targets, stages):
+        stage = stages[name]
+        start = time.perf_counter()
+
+        if any(results[dep].status in ('failed', 'skipped') for dep in stage.deps):
+            results[name] = StageResult(name, 'skipped', detail='dependency failed')
+            continue
+
+        try:
+            stage_fingerprint = fingerprint(stage, ctx)
+            if not is_stale(stage, ctx, stage_fingerprint):
+                results[name] = StageResult(name, 'fresh', time.perf_counter() - start)
+                continue
+
+            detail = stage.build(ctx)
+            # Hash after building: the articles stage seeds its own input (the
+            # log) on first run, which must not read as a change next time.
+            ctx.manifest['stages'][name] = fingerprint(stage, ctx)
+            results[name] = StageResult(name, 'built', time.perf_counter() - start, detail)
+        except Exception as e:
+            ctx.manifest['stages'].pop(name, None)
+            results[name] = StageResult(name, 'failed', time.perf_counter() - start, str(e))
+            logger.error(f"Stage {name} failed: {e}")
+
+    if ctx.dirty or any(r.status != 'fresh' for r in results.values()):
+        ctx.save_manifest()
+    return list(results.values())
+
+
+def log_build_stats(results: List[StageResult]) -> None:
+    """Log a per-stage timing table in build order."""
+    logger.info("Build stages:")
+    logger.info(f"  {'stage':<14} {'status':<8} {'time':>7}  detail")
+    for result in results:
+        logger.info(f"  {result.name:<14} {result.status:<8} {result.elapsed:>6.2f}s  {result.detail}")
+
+    built = sum(1 for r in results if r.status == 'built')
+    total = sum(r.elapsed for r in results)
+    logger.info(f"Built {built}/{len(results)} stages in {total:.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Rebuild stale generated pages of the site.')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help=f"Stages to build, with their dependencies: {', '.join(STAGES)} (default: all)")
+    parser.add_argument('--deploy', action='store_true',
+                        help=f"Build the deploy stages instead ({', '.join(DEPLOY_STAGES)}); "
+                             "they rewrite pages in place, so run them on the copy being published")
+    parser.add_argument('--force', action='store_true', help='Rebuild even if inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=BUILD_WORKERS, help='Page render processes')
+    parser.add_argument('--list', action='store_true', help='List stages and whether they are stale')
+    args = parser.parse_args()
+
+    stages = DEPLOY_STAGES if args.deploy else STAGES
+    unknown = [name for name in args.stages if name not in stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    ctx = BuildContext(get_project_root(), workers=args.workers, force=args.force)
+
+    if args.list:
+        for name in plan(args.stages, stages):
+            stage = stages[name]
+            state = 'stale' if is_stale(stage, ctx, fingerprint(stage, ctx)) else 'fresh'
+            deps = ', '.join(stage.deps) or '-'
+            print(f"{name:<14} {state:<6} deps: {deps}")
+        return 0
+
+    results = run_build(ctx, args.stages, stages)
+    log_build_stats(results)
+    return 1 if any(r.status == 'failed' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -26,6 +26,31 @@ RSS_FEEDS = {
     ]
 }
 
+# Feed fetching
+FEED_FETCH_WORKERS = 6
+FEED_TIMEOUT_SECONDS = 20
+FEED_FETCH_DEADLINE_SECONDS = 90
+MAX_ENTRIES_PER_FEED = 10
+FEED_USER_AGENT = 'Al-Tijarah/1.0 (+https://islamiceconomics.github.io)'
+FEED_CACHE_TTL_DAYS = 14  # keep entries for feeds removed from RSS_FEEDS this long
+
+# Near-duplicate detection (MinHash/LSH over title + summary word shingles).
+# DEDUP_NUM_PERM / DEDUP_BANDS rows per band; with 64/16 the LSH candidate
+# threshold is about (1/16) ** (1/4) = 0.5, matching DEDUP_THRESHOLD.
+DEDUP_THRESHOLD = 0.5
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16
+DEDUP_SHINGLE_SIZE = 2
+DEDUP_HISTORY_DAYS = 30  # how long covered stories keep suppressing repeats
+
+# Local caches (restored between workflow runs by actions/cache, not committed)
+CACHE_DIR = '.cache/newspaper'
+
+# LLM response cache shared by the newspaper, social campaign and reply scripts
+LLM_CACHE_DIR = '.cache/llm'
+LLM_CACHE_MAX_MB = 200
+LLM_CACHE_TTL_HOURS = 72
+
 # Category display names
 CATEGORIES = {
     'markets': 'Markets & Commodities',
@@ -65,10 +90,42 @@ RELEVANCE_KEYWORDS = [
     'Islamic fintech'
 ]
 
+# Keywords used to assign a newspaper category to a relevant news item
+CATEGORY_KEYWORDS = {
+    'markets': ['sukuk', 'market', 'commodity', 'price', 'trading', 'financial market', 'stock', 'bond'],
+    'policy': ['central bank', 'regulation', 'policy', 'imf', 'world bank', 'government', 'regulatory'],
+    'analysis': ['analysis', 'economic', 'trend', 'outlook', 'forecast', 'research', 'study'],
+    'scripture': ['quranic', 'hadith', 'islamic principle', 'scripture', 'theology', 'shariah principle'],
+    'opinion': ['opinion', 'commentary', 'column', 'perspective', 'view', 'editorial'],
+    'oic': ['oic', 'muslim-majority', 'gulf', 'arab', 'southeast asia', 'south asia', 'regional']
+}
+
+# TF-IDF relevance ranking of candidates (numpy/scipy; falls back to keyword counts).
+# The topic profile mixes the keyword lists above with the centroid of the
+# published back catalogue; weights are relative shares of that profile.
+RANKING_RELEVANCE_WEIGHT = 1.0
+RANKING_CATEGORY_WEIGHT = 0.4
+RANKING_CATALOGUE_WEIGHT = 0.6
+
+# Diverse selection of the day's stories (maximal marginal relevance).
+# Each pick maximizes LAMBDA * relevance - (1 - LAMBDA) * similarity to the
+# stories already picked; similarity mixes the weights below (summing to 1).
+SELECTION_LAMBDA = 0.6
+SELECTION_CATEGORY_WEIGHT = 0.5
+SELECTION_SOURCE_WEIGHT = 0.2
+SELECTION_TOPIC_WEIGHT = 0.3
+
 # OpenAI API Configuration
 OPENAI_MODEL = 'gpt-5-mini'
 OPENAI_MAX_OUTPUT_TOKENS = 4000
 OPENAI_REASONING_EFFORT = 'low'
+OPENAI_TIMEOUT_SECONDS = 180  # per request attempt
+OPENAI_MAX_RETRIES = 4  # for rate limits, timeouts and 5xx responses
+OPENAI_STREAM = True  # stream and validate output as it arrives (env OPENAI_STREAM=0 disables)
+
+# Article generation scheduling
+GENERATION_WORKERS = 3  # concurrent article requests
+GENERATION_ITEM_TIMEOUT_SECONDS = 600  # total budget per article, retries included
 
 # Article Configuration
 ARTICLES_PER_DAY = 3
@@ -77,9 +134,77 @@ ARTICLE_WORD_COUNT_TARGET = (800, 1000)
 
 # Website Configuration
 SITE_URL = 'https://islamiceconomics.github.io/IslamicEconomics'
+SITE_ORIGIN = 'https://islamiceconomics.github.io'  # origin used in sitemap.xml
+
+# Related-articles index (scripts/related_index.py)
+RELATED_ARTICLES_COUNT = 3  # links shown under each article
+RELATED_MAX_TERMS = 40  # strongest terms kept per article vector
+
+# Blog search index (scripts/search_index.py)
+SEARCH_SHARD_PREFIX_LENGTH = 1  # leading term characters that pick a shard
+
+# Batch generation (scripts/batch_jobs.py, generate_newspaper.py run --batch)
+BATCH_BACKEND = 'openai'  # openai, or local to run the requests in-process when polled
+BATCH_ENDPOINT = '/v1/responses'
+BATCH_COMPLETION_WINDOW = '24h'
+BATCH_KEEP_JOBS = 30  # finished jobs kept in data/batch_jobs.json
+
+# Site build (scripts/build_site.py)
+BUILD_WORKERS = 4  # render processes
+BUILD_PARALLEL_MIN_PAGES = 8  # below this, render in-process
+
+# Sitemap (scripts/build_site.py, scripts/sitemap.py)
+SITEMAP_MAX_URLS = 50000  # protocol limit per sitemap file
+SITEMAP_EXCLUDE = ('media/', 'social/', 'foundations/site_libs/')  # path prefixes left out
+# changefreq / priority for pages not yet in the sitemap, by top-level directory
+SITEMAP_DEFAULTS = {
+    'blog': ('monthly', '0.7'),
+    'foundations': ('monthly', '0.6'),
+    'theory': ('monthly', '0.6'),
+    '': ('monthly', '0.5'),
+}
+
+# Static assets (scripts/assets.py)
+ASSET_DIRS = ('css', 'js')  # Website/ directories whose files are fingerprinted
+ASSET_OUTPUT_DIR = 'assets'  # hashed, minified, precompressed copies
+ASSET_HASH_LENGTH = 10  # hex digits of the content hash in each file name
+ASSET_REWRITE_EXCLUDE = ('media/', 'social/', 'foundations/')  # pages whose links are left alone
+
+# Responsive images (scripts/images.py)
+IMAGE_SOURCES = ('images/*', 'theory/fig*.png', 'podcast/cover-art-*')  # globs under Website/
+IMAGE_OUTPUT_DIR = 'img'  # derived variants, mirroring the source directories
+IMAGE_WIDTHS = (480, 800, 1200, 1600)  # derived widths; wider sources are capped at the last
+IMAGE_QUALITY = {'avif': 50, 'webp': 80, 'jpeg': 82}
+IMAGE_SIZES = '(max-width: 900px) 100vw, 900px'  # sizes attribute of rewritten <img> tags
+OG_IMAGE_WIDTH = 1200  # og:image / social card width
+DEFAULT_OG_IMAGE = 'images/islamiceconomy.jpeg'  # for articles without an image of their own
+
+# Run tracing (scripts/tracing.py)
+TRACE_DIR = '.cache/newspaper/traces'  # one JSON trace per run
+TRACE_KEEP = 30  # newest traces kept per script
+
+# Social campaign blog parsing (scripts/generate_social_campaign.py)
+SOCIAL_BLOG_CACHE = '.cache/social/blog_items.json'
+SOCIAL_PARSE_WORKERS = 4  # processes for cold parsing
+SOCIAL_PARSE_POOL_MIN = 64  # fewer posts to parse than this are parsed in-process
+
+# Startup benchmark (scripts/benchmarks.py startup)
+STARTUP_BUDGET_MS = 500  # import time allowed for an entry point not listed below
+STARTUP_BUDGETS_MS = {
+    'generate_newspaper': 400,
+    'discover_replies': 2000,  # loads the OpenAI SDK at import
+    'generate_social_campaign': 4000,  # loads the OpenAI and Anthropic SDKs at import
+}
+# Modules an entry point must not load at import; they are imported where used.
+STARTUP_LAZY_IMPORTS = {
+    'generate_newspaper': ('openai', 'feedparser', 'requests', 'numpy', 'scipy', 'PIL'),
+    'build_site': ('openai', 'feedparser', 'numpy', 'scipy', 'PIL'),
+    'related_index': ('numpy', 'scipy'),
+    'search_index': ('numpy', 'scipy'),
+}
 
 # Directory Paths (relative to project root)
-DATA_DIR = 'data'
+DATA_DIR = 'data'  # pipeline state committed alongside the site
 BLOG_DIR = 'blog'
 TEMPLATE_DIR = 'templates'
 
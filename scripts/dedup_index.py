@@ -0,0 +1,184 @@
+"""
+MinHash / LSH near-duplicate index for newspaper candidates.
+
+Each news item is reduced to a MinHash signature over word shingles of its
+title and summary. Signatures are split into LSH bands, so a lookup only
+compares against items that share at least one band bucket. This keeps
+deduplication near-linear instead of comparing every pair of titles.
+
+Signatures of items we have already written articles from are persisted, so
+stories covered on previous days are suppressed too without rescanning
+articles.json.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import (
+    DEDUP_BANDS, DEDUP_HISTORY_DAYS, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+)
+from keyword_matcher import tokenize
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+MAX_HASH = (1 << 32) - 1
+
+Signature = Tuple[int, ...]
+
+
+def _shingles(text: str, size: int) -> Set[str]:
+    tokens = [token for token in tokenize(re.sub(r'<[^>]+>', ' ', text)) if token.isalnum()]
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class DedupIndex:
+    """LSH index of MinHash signatures keyed by item (link or title)."""
+
+    def __init__(
+        self,
+        threshold: float = DEDUP_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERM,
+        bands: int = DEDUP_BANDS,
+        shingle_size: int = DEDUP_SHINGLE_SIZE,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"DEDUP_NUM_PERM ({num_perm}) must be divisible by DEDUP_BANDS ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        self._hash_format = f'<{num_perm}I'
+
+        self._signatures: Dict[str, Signature] = {}
+        self._buckets: Dict[Tuple[int, Signature], Set[str]] = {}
+        self.history: Dict[str, Dict] = {}  # persisted entries: key -> {title, date}
+
+    # -- signatures --------------------------------------------------------
+
+    def signature(self, text: str) -> Signature:
+        """
+        MinHash signature of the text's word shingles.
+
+        The num_perm hash functions are the 32-bit words of one SHAKE-128
+        digest per shingle, which is stable across processes (unlike hash())
+        and lets the per-function minimum run in C over strided slices.
+        """
+        shingles = _shingles(text, self.shingle_size)
+        if not shingles:
+            return tuple([MAX_HASH] * self.num_perm)
+        digest_size = 4 * self.num_perm
+        packed = b''.join(
+            hashlib.shake_128(shingle.encode('utf-8')).digest(digest_size) for shingle in shingles
+        )
+        values = memoryview(packed).cast('I')
+        return tuple(min(values[i::self.num_perm]) for i in range(self.num_perm))
+
+    def similarity(self, sig1: Signature, sig2: Signature) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets."""
+        return sum(1 for x, y in zip(sig1, sig2) if x == y) / self.num_perm
+
+    def _band_keys(self, signature: Signature) -> List[Tuple[int, Signature]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    # -- lookups -----------------------------------------------------------
+
+    def find_duplicate(self, signature: Signature) -> Optional[str]:
+        """Return the key of an indexed near-duplicate, if any."""
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(signature):
+            candidates |= self._buckets.get(band_key, set())
+
+        for key in candidates:
+            if self.similarity(signature, self._signatures[key]) >= self.threshold:
+                return key
+        return None
+
+    def add(self, key: str, signature: Signature) -> None:
+        self._signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def record(self, key: str, title: str = '', date: Optional[str] = None) -> None:
+        """Mark an indexed item as written so it is persisted for future runs."""
+        if key in self._signatures:
+            self.history[key] = {'title': title, 'date': date or datetime.now().isoformat()}
+
+    # -- persistence -------------------------------------------------------
+
+    def _params(self) -> Dict:
+        return {
+            'num_perm': self.num_perm,
+            'shingle_size': self.shingle_size,
+            'hash': 'shake_128',
+        }
+
+    @classmethod
+    def load(cls, path: Path, history_days: int = DEDUP_HISTORY_DAYS) -> 'DedupIndex':
+        """Load persisted signatures, dropping ones older than history_days."""
+        index = cls()
+        path = Path(path)
+        if not path.exists():
+            return index
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dedup index {path}: {e}")
+            return index
+
+        if data.get('version') != INDEX_VERSION or data.get('params') != index._params():
+            logger.info("Dedup index parameters changed; starting a fresh history")
+            return index
+
+        cutoff = datetime.now() - timedelta(days=history_days)
+        for key, entry in data.get('entries', {}).items():
+            try:
+                if datetime.fromisoformat(entry.get('date', '')) < cutoff:
+                    continue
+            except (ValueError, TypeError):
+                continue
+            packed = base64.b64decode(entry['signature'])
+            index.add(key, struct.unpack(index._hash_format, packed))
+            index.history[key] = {'title': entry.get('title', ''), 'date': entry['date']}
+
+        logger.info(f"Loaded {len(index.history)} previously covered stories from {path}")
+        return index
+
+    def save(self, path: Path) -> None:
+        """Persist recorded signatures atomically (temp file + rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entries = {
+            key: {
+                **meta,
+                'signature': base64.b64encode(
+                    struct.pack(self._hash_format, *self._signatures[key])
+                ).decode('ascii'),
+            }
+            for key, meta in sorted(self.history.items(), key=lambda kv: kv[1]['date'], reverse=True)
+        }
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'version': INDEX_VERSION, 'params': self._params(), 'entries': entries},
+                f, indent=1, ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
@@ -27,6 +27,8 @@ try:
 except ImportError:
     OpenAI = None
 
+from llm_cache import get_llm_cache
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -187,7 +189,7 @@ def generate_reply(tweet: Dict[str, Any]) -> str:
         f"Do not be promotional. End with a period."
     )
 
-    try:
+    def call() -> str:
         client = OpenAI(api_key=OPENAI_API_KEY)
         response = client.responses.create(
             model=OPENAI_MODEL,
@@ -198,7 +200,20 @@ def generate_reply(tweet: Dict[str, Any]) -> str:
                 {"role": "user", "content": user_prompt},
             ],
         )
-        reply_text = (getattr(response, "output_text", "") or "").strip()
+        return getattr(response, "output_text", "") or ""
+
+    try:
+        reply_text = get_llm_cache().cached_call(
+            {
+                "provider": "openai",
+                "model": OPENAI_MODEL,
+                "reasoning_effort": "low",
+                "max_output_tokens": 200,
+                "system": REPLY_SYSTEM_PROMPT,
+                "user": user_prompt,
+            },
+            call,
+        ).strip()
         # Strip any accidental @mentions at the start
         reply_text = re.sub(r"^@\w+\s*", "", reply_text).strip()
         # Strip quotes the AI might wrap around the reply
@@ -298,6 +313,8 @@ def main() -> int:
         reply = generate_reply(tweet)
         replies.append(reply)
 
+    get_llm_cache().log_stats()
+
     # Write digest
     now = datetime.now(timezone.utc)
     digest_path = digest_dir / f"{now.strftime('%Y-%m-%d')}-replies.md"
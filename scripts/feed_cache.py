@@ -0,0 +1,112 @@
+"""
+Persistent conditional-GET cache for RSS feeds.
+
+Stores the ETag / Last-Modified validators and the last parsed entries for
+each feed URL, so unchanged feeds can be answered with a 304 and skip both the
+download and the parse. Feeds that disappear from config are evicted once they
+have been unseen for FEED_CACHE_TTL_DAYS.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import FEED_CACHE_TTL_DAYS
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+class FeedCache:
+    """On-disk feed cache keyed by feed URL."""
+
+    def __init__(self, path: Path, ttl_days: int = FEED_CACHE_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = timedelta(days=ttl_days)
+        self.feeds: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @classmethod
+    def load(cls, path: Path, ttl_days: int = FEED_CACHE_TTL_DAYS) -> 'FeedCache':
+        cache = cls(path, ttl_days)
+        if cache.path.exists():
+            try:
+                with open(cache.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    cache.feeds = data.get('feeds', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable feed cache {cache.path}: {e}")
+        return cache
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        entry = self.feeds.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def entries(self, url: str) -> Optional[List[Dict]]:
+        """Return cached entries for a 304 response, counting it as a hit."""
+        entry = self.feeds.get(url)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry['last_seen'] = datetime.now().isoformat()
+        return entry.get('entries', [])
+
+    def store(self, url: str, headers: Dict[str, str], entries: List[Dict]) -> None:
+        """Record a full (200) response, counting it as a miss."""
+        self.misses += 1
+        now = datetime.now().isoformat()
+        self.feeds[url] = {
+            'etag': headers.get('etag', ''),
+            'last_modified': headers.get('last-modified', ''),
+            'entries': entries,
+            'fetched_at': now,
+            'last_seen': now,
+        }
+
+    def evict(self, configured_urls: List[str]) -> None:
+        """Drop feeds that are no longer configured and have outlived the TTL."""
+        configured = set(configured_urls)
+        cutoff = datetime.now() - self.ttl
+
+        for url in list(self.feeds):
+            if url in configured:
+                continue
+            try:
+                last_seen = datetime.fromisoformat(self.feeds[url].get('last_seen', ''))
+            except (ValueError, TypeError):
+                last_seen = datetime.min
+            if last_seen < cutoff:
+                del self.feeds[url]
+                self.evicted += 1
+
+    def save(self) -> None:
+        """Write the cache atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'feeds': self.feeds}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"Feed cache: {self.hits} hits (304), {self.misses} misses, "
+            f"{self.evicted} evicted, {len(self.feeds)} feeds cached"
+        )
@@ -0,0 +1,238 @@
+"""
+Concurrent feed downloader for the Al-Tijarah newspaper pipeline.
+
+Feeds are downloaded on a bounded thread pool with a per-feed timeout and a
+global deadline for the whole stage, so a single hanging endpoint cannot stall
+the daily run. Callers may pass a streaming parser factory (see feed_parser);
+each body is then parsed as it arrives and the download stops as soon as the
+parser has all the entries it needs.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from config import (
+    FEED_FETCH_DEADLINE_SECONDS, FEED_FETCH_WORKERS, FEED_TIMEOUT_SECONDS, FEED_USER_AGENT
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FeedTimeout(Exception):
+    """Raised when a feed exceeds its own timeout or the stage deadline."""
+
+
+@dataclass
+class FeedResult:
+    url: str
+    category: str
+    status: str = 'pending'  # ok, not_modified, http_error, timeout, deadline, error
+    http_status: Optional[int] = None
+    content: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)  # lower-cased names
+    bytes_read: int = 0
+    elapsed: float = 0.0
+    entries: int = 0
+    error: str = ''
+    parsed: Optional[List[Dict]] = None  # entries from the streaming parser
+    truncated: bool = False  # rest of the body skipped once the entry cap was reached
+    parse_error: str = ''  # streaming parse failure; content holds the full body
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+_thread_state = threading.local()
+
+
+def _session() -> requests.Session:
+    """One pooled session per worker thread."""
+    session = getattr(_thread_state, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = FEED_USER_AGENT
+        _thread_state.session = session
+    return session
+
+
+def _download(
+    url: str,
+    category: str,
+    timeout: float,
+    deadline: float,
+    cancelled: threading.Event,
+    request_headers: Optional[Dict[str, str]] = None,
+    stream_parser: Optional[Callable[[], Any]] = None,
+) -> FeedResult:
+    result = FeedResult(url=url, category=category)
+    start = time.monotonic()
+    limit = min(start + timeout, deadline)
+
+    try:
+        remaining = limit - start
+        if remaining <= 0 or cancelled.is_set():
+            raise FeedTimeout('deadline reached before download started')
+
+        with _session().get(
+            url, headers=request_headers, timeout=(remaining, remaining), stream=True
+        ) as response:
+            result.http_status = response.status_code
+            result.headers = {k.lower(): v for k, v in response.headers.items()}
+
+            if response.status_code == 304:
+                result.status = 'not_modified'
+                result.elapsed = time.monotonic() - start
+                return result
+
+            parser = stream_parser() if stream_parser and response.ok else None
+            chunks: List[bytes] = []
+            for chunk in response.iter_content(CHUNK_SIZE):
+                chunks.append(chunk)
+                result.bytes_read += len(chunk)
+                if parser is not None:
+                    try:
+                        parser.feed(chunk)
+                    except Exception as e:
+                        # Keep downloading so the caller can fall back on the full body.
+                        result.parse_error = str(e)
+                        parser = None
+                    else:
+                        if parser.done:
+                            result.truncated = True
+                            break
+                if cancelled.is_set() or time.monotonic() > limit:
+                    raise FeedTimeout(f'exceeded {timeout:.0f}s feed timeout')
+
+            if parser is not None and not result.truncated:
+                try:
+                    parser.close()
+                except Exception as e:
+                    result.parse_error = str(e)
+                    parser = None
+
+            if not response.ok:
+                result.status = 'http_error'
+                result.error = f'HTTP {response.status_code}'
+            else:
+                result.content = b''.join(chunks)
+                result.status = 'ok'
+                if parser is not None:
+                    result.parsed = parser.entries
+
+    except (FeedTimeout, requests.Timeout) as e:
+        result.status = 'deadline' if time.monotonic() >= deadline else 'timeout'
+        result.error = str(e)
+    except Exception as e:
+        result.status = 'error'
+        result.error = str(e)
+
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def iter_feeds(
+    feeds: Dict[str, List[str]],
+    max_workers: int = FEED_FETCH_WORKERS,
+    timeout: float = FEED_TIMEOUT_SECONDS,
+    deadline_seconds: float = FEED_FETCH_DEADLINE_SECONDS,
+    request_headers: Optional[Dict[str, Dict[str, str]]] = None,
+    stream_parser: Optional[Callable[[], Any]] = None,
+) -> Iterator[FeedResult]:
+    """
+    Download every feed concurrently, yielding results as they complete.
+
+    Args:
+        feeds: Mapping of category to feed URLs (same shape as RSS_FEEDS)
+        max_workers: Maximum number of concurrent downloads
+        timeout: Per-feed wall-clock budget in seconds
+        deadline_seconds: Budget for the whole stage in seconds
+        request_headers: Optional extra headers per URL (e.g. conditional-GET validators)
+        stream_parser: Optional factory for an incremental parser with feed(),
+            close() and done; bodies are parsed while downloading
+
+    Yields:
+        FeedResult for every configured feed, including ones that timed out
+    """
+    jobs: List[Tuple[str, str]] = [
+        (category, url) for category, urls in feeds.items() for url in urls
+    ]
+    if not jobs:
+        return
+
+    deadline = time.monotonic() + deadline_seconds
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(jobs))),
+        thread_name_prefix='feed-fetch',
+    )
+    futures = {
+        executor.submit(
+            _download, url, category, timeout, deadline, cancelled,
+            (request_headers or {}).get(url), stream_parser,
+        ): (category, url)
+        for category, url in jobs
+    }
+
+    yielded = set()
+    try:
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            yielded.add(future)
+            yield future.result()
+    except FuturesTimeoutError:
+        cancelled.set()
+        for future, (category, url) in futures.items():
+            if future in yielded:
+                continue
+            # Downloads that finished as the deadline passed still count.
+            if future.done() and not future.cancelled():
+                yield future.result()
+            else:
+                future.cancel()
+                yield FeedResult(
+                    url=url,
+                    category=category,
+                    status='deadline',
+                    elapsed=deadline_seconds,
+                    error=f'stage deadline of {deadline_seconds:.0f}s reached',
+                )
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def log_feed_stats(results: List[FeedResult]) -> None:
+    """Log a per-feed timing table, slowest first."""
+    if not results:
+        return
+
+    logger.info("Feed fetch timings:")
+    logger.info(f"  {'status':<12} {'time':>7} {'bytes':>9} {'items':>5}  feed")
+    for result in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        if result.error:
+            detail = f" ({result.error})"
+        elif result.parse_error:
+            detail = f" (feedparser fallback: {result.parse_error})"
+        elif result.truncated:
+            detail = " (capped)"
+        else:
+            detail = ''
+        logger.info(
+            f"  {result.status:<12} {result.elapsed:>6.2f}s {result.bytes_read:>9} "
+            f"{result.entries:>5}  {result.url}{detail}"
+        )
+
+    ok = sum(1 for r in results if r.ok)
+    unchanged = sum(1 for r in results if r.status == 'not_modified')
+    total_bytes = sum(r.bytes_read for r in results)
+    logger.info(
+        f"Fetched {ok}/{len(results)} feeds ({unchanged} not modified), {total_bytes} bytes"
+    )
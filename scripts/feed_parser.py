@@ -0,0 +1,168 @@
+"""
+Streaming RSS / Atom entry reader for the Al-Tijarah newspaper pipeline.
+
+Feed bodies are parsed incrementally as chunks arrive, and each entry is
+normalized as soon as its closing tag is seen. Once the per-feed cap is reached
+the caller can stop reading the body, so a multi-megabyte feed costs only the
+bytes up to its Nth item. Consumed elements are detached from the tree, so
+memory stays flat however long the feed is.
+
+Only well-formed RSS 2.0, RSS 1.0 (RDF) and Atom documents are handled here.
+Anything the XML parser rejects (HTML entities, broken markup, unsupported
+encodings) raises FeedParseError, and the caller falls back to feedparser on
+the full body.
+"""
+
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+from config import MAX_ENTRIES_PER_FEED
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+DC_DATE = '{http://purl.org/dc/elements/1.1/}date'
+
+ROOT_TAGS = {'rss', RDF + 'RDF', ATOM + 'feed'}
+ENTRY_TAGS = {'item', RSS1 + 'item', ATOM + 'entry'}
+
+
+class FeedParseError(Exception):
+    """Raised when a feed cannot be read by the streaming parser."""
+
+
+def _child_text(elem: ElementTree.Element, *tags: str) -> str:
+    """Text of the first listed child that has any, including nested markup text."""
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None:
+            text = ''.join(child.itertext()).strip()
+            if text:
+                return text
+    return ''
+
+
+def _atom_link(entry: ElementTree.Element) -> str:
+    fallback = ''
+    for link in entry.findall(ATOM + 'link'):
+        href = link.get('href', '')
+        if link.get('rel', 'alternate') == 'alternate' and href:
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def normalize_entry(elem: ElementTree.Element) -> Dict[str, str]:
+    """Reduce an <item> or <entry> element to the fields the pipeline uses."""
+    if elem.tag == ATOM + 'entry':
+        return {
+            'title': _child_text(elem, ATOM + 'title'),
+            'link': _atom_link(elem),
+            'summary': _child_text(elem, ATOM + 'summary', ATOM + 'content'),
+            'published': _child_text(elem, ATOM + 'published'),
+        }
+
+    ns = RSS1 if elem.tag == RSS1 + 'item' else ''
+    link = _child_text(elem, ns + 'link')
+    if not link:
+        guid = elem.find('guid')
+        if guid is not None and guid.get('isPermaLink', 'true') == 'true':
+            link = (guid.text or '').strip()
+    return {
+        'title': _child_text(elem, ns + 'title'),
+        'link': link or elem.get(RDF + 'about', ''),
+        'summary': _child_text(elem, ns + 'description', CONTENT_ENCODED),
+        # RSS 1.0 has no pubDate; its items are dated with Dublin Core.
+        'published': _child_text(elem, 'pubDate', DC_DATE),
+    }
+
+
+class StreamingFeedParser:
+    """
+    Incremental feed parser that stops accepting input after max_entries.
+
+    Usage:
+        parser = StreamingFeedParser(10)
+        for chunk in body:
+            parser.feed(chunk)
+            if parser.done:
+                break
+        else:
+            parser.close()
+        entries = parser.entries
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES_PER_FEED):
+        self.max_entries = max_entries
+        self.entries: List[Dict[str, str]] = []
+        self._parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        self._stack: List[ElementTree.Element] = []
+        self._root: Optional[ElementTree.Element] = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.entries) >= self.max_entries
+
+    def feed(self, data: bytes) -> List[Dict[str, str]]:
+        """Parse another chunk of the body and return the entries it completed."""
+        if self.done:
+            return []
+        try:
+            self._parser.feed(data)
+        except ElementTree.ParseError as e:
+            raise FeedParseError(str(e)) from e
+        return self._drain()
+
+    def close(self) -> List[Dict[str, str]]:
+        """Signal the end of the body; raises FeedParseError if it was truncated."""
+        if self.done:
+            return []
+        try:
+            self._parser.close()
+        except ElementTree.ParseError as e:
+            raise FeedParseError(str(e)) from e
+        return self._drain()
+
+    def _drain(self) -> List[Dict[str, str]]:
+        completed = []
+        try:
+            events = list(self._parser.read_events())
+        except ElementTree.ParseError as e:
+            raise FeedParseError(str(e)) from e
+
+        for event, elem in events:
+            if event == 'start':
+                if self._root is None:
+                    if elem.tag not in ROOT_TAGS:
+                        raise FeedParseError(f'not an RSS or Atom document: <{elem.tag}>')
+                    self._root = elem
+                self._stack.append(elem)
+                continue
+
+            self._stack.pop()
+            if elem.tag not in ENTRY_TAGS:
+                continue
+
+            entry = normalize_entry(elem)
+            if self._stack:
+                self._stack[-1].remove(elem)
+            elem.clear()
+
+            self.entries.append(entry)
+            completed.append(entry)
+            if self.done:
+                break
+        return completed
+
+
+def parse_feed(content: bytes, max_entries: int = MAX_ENTRIES_PER_FEED) -> List[Dict[str, str]]:
+    """Parse a complete feed body, reading only as far as the entry cap."""
+    parser = StreamingFeedParser(max_entries)
+    view = memoryview(content)
+    for offset in range(0, len(content), 64 * 1024):
+        parser.feed(view[offset:offset + 64 * 1024].tobytes())
+        if parser.done:
+            return parser.entries
+    parser.close()
+    return parser.entries
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Sharded, precompressed search index for the Foundations book.
+
+Quarto writes Website/foundations/search.json: every section of the book,
+with its full text, in one file. Each search page downloads all of it and
+builds a Fuse index over it before the first result can appear. Run this after
+`quarto render` in foundations-book/ to convert it into:
+
+    search/v<FORMAT_VERSION>/index.json        manifest: shard and docs file names
+    search/v<FORMAT_VERSION>/docs.<hash>.json  section metadata and a text snippet
+    search/v<FORMAT_VERSION>/shards/<key>.<hash>.bin  postings by term prefix
+
+Shards use the blog search encoding (see search_index): terms sorted,
+delta-encoded section ids and field weights as LEB128 varints. Every file
+gets .gz and .br siblings (.br only if the brotli package is installed) for
+hosts that serve precompressed assets.
+
+The manifest is a few hundred bytes. A query then loads, in parallel, the
+section metadata and the shard of each query word. Every completion of a
+word shares the word's prefix and so its shard: prefixes expand and document
+frequencies (postings list lengths) come from the shard itself, so no term
+dictionary has to be downloaded up front.
+Content-hashed file names keep cached copies valid until the index changes;
+the format version in the path retires old clients' caches when the layout
+changes.
+
+quarto-search.js is patched to read this index and falls back to Fuse over
+search.json if the index cannot be loaded. Re-running is idempotent.
+
+Usage:
+    python scripts/foundations_search.py [--site-dir Website/foundations]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from assets import write_precompressed
+from config import SEARCH_SHARD_PREFIX_LENGTH
+from keyword_matcher import tokenize
+from related_index import STOPWORDS, TAG_RE
+from search_index import MAX_WEIGHT, Postings, encode_shard, shard_key
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+SNIPPET_CHARS = 240
+
+# Quarto's Fuse keys weight title and section twice as much as text.
+FIELD_WEIGHTS = {'title': 2, 'section': 2, 'text': 1}
+
+PATCH_MARKER = '/* foundations-sharded-search */'
+READ_SEARCH_DATA = 'async function readSearchData() {\n'
+
+
+def section_terms(doc: Dict) -> Dict[str, int]:
+    """Indexed terms of a search.json entry with field-weighted counts."""
+    counts: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(TAG_RE.sub(' ', doc.get(field) or '')):
+            if len(token) > 1 and token.isalnum() and token not in STOPWORDS:
+                counts[token] += weight
+    return {term: min(count, MAX_WEIGHT) for term, count in counts.items()}
+
+
+def snippet(text: str, limit: int = SNIPPET_CHARS) -> str:
+    text = ' '.join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0] + '…'
+
+
+def build_index(search_docs: List[Dict]) -> Tuple[List[List], Dict[str, Postings], Dict[str, int]]:
+    """
+    Returns:
+        (section metadata rows, postings by shard key, document frequency by term)
+    """
+    rows: List[List] = []
+    shards: Dict[str, Postings] = {}
+    df: Dict[str, int] = {}
+    for doc_id, doc in enumerate(search_docs):
+        rows.append([
+            doc.get('href', ''),
+            doc.get('title', ''),
+            doc.get('section', ''),
+            doc.get('crumbs') or [],
+            snippet(doc.get('text') or ''),
+        ])
+        for term, weight in section_terms(doc).items():
+            shards.setdefault(shard_key(term), {}).setdefault(term, []).append((doc_id, weight))
+            df[term] = df.get(term, 0) + 1
+    return rows, shards, df
+
+
+def _hashed_name(stem: str, data: bytes, suffix: str) -> str:
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{suffix}"
+
+
+def write_index(site_dir: Path) -> Optional[Dict]:
+    """Convert site_dir/search.json into the sharded index; returns size stats."""
+    source = site_dir / 'search.json'
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            search_docs = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot read {source}: {e}")
+        return None
+
+    rows, shards, df = build_index(search_docs)
+
+    search_root = site_dir / 'search'
+    out_dir = search_root / f"v{FORMAT_VERSION}"
+    # Older formats and superseded hashed files are removed; nothing links to them.
+    if search_root.exists():
+        shutil.rmtree(search_root)
+
+    stats = {'files': 0, 'raw': 0, 'gzip': 0}
+
+    def emit(relative: str, data: bytes) -> int:
+        compressed = write_precompressed(out_dir / relative, data)
+        stats['gzip'] += compressed
+        stats['raw'] += len(data)
+        stats['files'] += 1
+        return compressed
+
+    docs_data = json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    docs_file = _hashed_name('docs', docs_data, '.json')
+    docs_gzip = emit(docs_file, docs_data)
+
+    shard_files = {}
+    largest_shard_gzip = 0
+    for key, postings in sorted(shards.items()):
+        data = encode_shard(postings)
+        name = _hashed_name(key, data, '.bin')
+        largest_shard_gzip = max(largest_shard_gzip, emit(f"shards/{name}", data))
+        shard_files[key] = name
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'prefix_length': SEARCH_SHARD_PREFIX_LENGTH,
+        'doc_count': len(rows),
+        'stopwords': sorted(STOPWORDS),
+        'docs': docs_file,
+        'shards': shard_files,
+    }
+    manifest_gzip = emit('index.json', json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    stats['source_raw'] = source.stat().st_size
+    stats['source_gzip'] = len(gzip.compress(source.read_bytes(), compresslevel=9, mtime=0))
+    stats['shards'] = len(shard_files)
+    # A one-word query downloads the manifest, the docs and one shard.
+    stats['first_query_gzip'] = manifest_gzip + docs_gzip + largest_shard_gzip
+    stats['terms'] = len(df)
+    return stats
+
+
+# -- quarto-search.js patch ------------------------------------------------
+
+LOADER_JS = PATCH_MARKER + r"""
+// Added by scripts/foundations_search.py: query the sharded index in
+// search/v%(version)d/ instead of building a Fuse index over search.json.
+// readSearchData() returns an object with Fuse's search(query, options).
+const kShardedSearchVersion = %(version)d;
+let shardedSearchPromise = undefined;
+
+// Resolves to null when the index is unavailable, so callers fall back to Fuse.
+function readShardedSearchData() {
+  if (shardedSearchPromise === undefined) {
+    const base = new URL(offsetURL(`search/v${kShardedSearchVersion}/`), window.location.href);
+    shardedSearchPromise = fetch(new URL("index.json", base), { cache: "no-cache" })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((manifest) =>
+        manifest && manifest.version === kShardedSearchVersion ? createShardedSearch(base, manifest) : null
+      )
+      .catch(() => null);
+  }
+  return shardedSearchPromise;
+}
+
+function createShardedSearch(base, manifest) {
+  const stopwords = new Set(manifest.stopwords);
+  const shardCache = new Map();
+  let docsPromise = undefined;
+
+  const fold = (token) =>
+    token.length > 3 && token.endsWith("s") && !"sui".includes(token[token.length - 2])
+      ? token.slice(0, -1)
+      : token;
+  const tokenize = (text) =>
+    (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [])
+      .map(fold)
+      .filter((token) => [...token].length > 1 && !token.includes("_") && !stopwords.has(token));
+  const shardKey = (term) => {
+    const prefix = [...term].slice(0, manifest.prefix_length).join("");
+    if (/^[a-z0-9_]+$/.test(prefix)) return prefix;
+    return "u" + Array.from(new TextEncoder().encode(prefix), (b) => b.toString(16).padStart(2, "0")).join("");
+  };
+
+  const decodeShard = (buffer) => {
+    const bytes = new Uint8Array(buffer);
+    const decoder = new TextDecoder();
+    let pos = 0;
+    const varint = () => {
+      let value = 0;
+      let scale = 1;
+      let byte;
+      do {
+        byte = bytes[pos++];
+        value += (byte & 0x7f) * scale;
+        scale *= 128;
+      } while (byte >= 0x80);
+      return value;
+    };
+    const postings = new Map();
+    const count = varint();
+    for (let i = 0; i < count; i++) {
+      const length = varint();
+      const term = decoder.decode(bytes.subarray(pos, pos + length));
+      pos += length;
+      const entries = varint();
+      const list = new Array(entries);
+      let doc = 0;
+      for (let j = 0; j < entries; j++) {
+        doc += varint();
+        list[j] = [doc, varint()];
+      }
+      postings.set(term, list);
+    }
+    return postings;
+  };
+
+  const shard = (key) => {
+    if (!shardCache.has(key)) {
+      const file = manifest.shards[key];
+      shardCache.set(
+        key,
+        file
+          ? fetch(new URL(`shards/${file}`, base)).then((r) => r.arrayBuffer()).then(decodeShard)
+          : Promise.resolve(new Map())
+      );
+    }
+    return shardCache.get(key);
+  };
+  const docs = () =>
+    docsPromise || (docsPromise = fetch(new URL(manifest.docs, base)).then((r) => r.json()));
+
+  // Indexed terms a query word matches: itself, and for the word being
+  // typed (the last one) up to 20 of the most frequent completions. Words
+  // are longer than the shard prefix, so completions share the word's shard.
+  const expand = async (word, isLast) => {
+    const postings = await shard(shardKey(word));
+    const matches = postings.has(word) ? [word] : [];
+    if (isLast) {
+      const completions = [...postings.keys()].filter((term) => term !== word && term.startsWith(word));
+      completions.sort((a, b) => postings.get(b).length - postings.get(a).length);
+      matches.push(...completions.slice(0, 20));
+    }
+    return matches;
+  };
+
+  return {
+    async search(query, options) {
+      const words = [...new Set(tokenize(query))];
+      if (!words.length) return [];
+      const table = docs();
+      const groups = await Promise.all(words.map((word, i) => expand(word, i === words.length - 1)));
+      if (groups.some((group) => !group.length)) return [];
+
+      let scores = null;
+      for (const [i, group] of groups.entries()) {
+        const postings = await shard(shardKey(words[i]));
+        const groupScores = new Map();
+        for (const term of group) {
+          const list = postings.get(term);
+          const idf = Math.log(1 + manifest.doc_count / list.length);
+          for (const [doc, weight] of list) {
+            groupScores.set(doc, Math.max(groupScores.get(doc) || 0, (1 + Math.log(weight)) * idf));
+          }
+        }
+        if (scores === null) {
+          scores = groupScores;
+        } else {
+          for (const [doc, score] of scores) {
+            if (groupScores.has(doc)) scores.set(doc, score + groupScores.get(doc));
+            else scores.delete(doc);
+          }
+        }
+      }
+
+      const rows = await table;
+      return [...scores]
+        .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+        .slice(0, (options && options.limit) || 20)
+        .map(([doc, score]) => {
+          const [href, title, section, crumbs, text] = rows[doc];
+          return { item: { href, title, section, crumbs, text }, score };
+        });
+    },
+  };
+}
+"""
+
+READ_SEARCH_DATA_PATCH = READ_SEARCH_DATA + """  const sharded = await readShardedSearchData();
+  if (sharded) return sharded;
+"""
+
+
+def patch_quarto_search(site_dir: Path) -> bool:
+    """Make quarto-search.js use the sharded index; True if the file is patched."""
+    script = site_dir / 'site_libs' / 'quarto-search' / 'quarto-search.js'
+    try:
+        source = script.read_text(encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"Cannot read {script}: {e}")
+        return False
+
+    if PATCH_MARKER in source:
+        return True
+    if source.count(READ_SEARCH_DATA) != 1:
+        logger.warning(f"readSearchData() not found in {script}; search keeps using search.json")
+        return False
+
+    source = source.replace(READ_SEARCH_DATA, READ_SEARCH_DATA_PATCH)
+    source = source.rstrip('\n') + '\n\n' + LOADER_JS % {'version': FORMAT_VERSION}
+    script.write_text(source, encoding='utf-8')
+    return True
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Shard and precompress the Foundations search index.')
+    parser.add_argument(
+        '--site-dir',
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / 'Website' / 'foundations',
+        help='Rendered book directory containing search.json',
+    )
+    args = parser.parse_args()
+
+    stats = write_index(args.site_dir)
+    if stats is None:
+        return 1
+    if brotli is None:
+        logger.info("brotli not installed; wrote .gz siblings only")
+
+    logger.info(
+        f"Foundations search: {stats['terms']} terms in {stats['shards']} shards, {stats['files']} files, "
+        f"{stats['raw'] / 1024:.1f} KB ({stats['gzip'] / 1024:.1f} KB gzip) "
+        f"vs search.json {stats['source_raw'] / 1024:.1f} KB ({stats['source_gzip'] / 1024:.1f} KB gzip); "
+        f"a one-word query fetches at most {stats['first_query_gzip'] / 1024:.1f} KB gzip"
+    )
+    return 0 if patch_quarto_search(args.site_dir) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
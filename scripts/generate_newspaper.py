@@ -4,6 +4,20 @@ Islamic Economics Automated Newspaper Generator
 
 Fetches news from RSS feeds, filters for Islamic economics relevance,
 generates original articles using the OpenAI API, and publishes to static website.
+
+Each run is traced (see tracing): the tiers and their steps are timed spans
+with counters for feeds, bytes, tokens and cache hits. A summary table is
+logged at the end, and the JSON trace goes to TRACE_DIR (or --trace PATH).
+
+Subcommands:
+    run      the daily pipeline (the default when none is given)
+    rebuild  regenerate blog.html from articles.json; loads neither the
+             OpenAI SDK nor the feed and ranking stack
+    resume   publish the results of finished offline batches
+
+With `run --batch` the selected items are submitted as one offline batch
+(see batch_jobs) instead of being generated in real time; that run and any
+later `run --batch` or `resume` publish the results of finished batches.
 """
 
 import os
@@ -11,26 +25,47 @@ import sys
 import json
 import logging
 import argparse
-import re
-from datetime import datetime, timedelta
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 import math
 
 try:
-    import feedparser
-    from jinja2 import Environment, FileSystemLoader
-    from openai import OpenAI
+    from site_pages import assign_slug, regenerate_blog_html, write_articles_html
 except ImportError as e:
-    print(f"Error: Missing required package. Please install: feedparser, jinja2, openai")
+    print(f"Error: Missing required package. Please install: jinja2")
     print(f"Details: {e}")
     sys.exit(1)
 
 from config import (
-    RSS_FEEDS, RELEVANCE_KEYWORDS, CATEGORIES, OPENAI_MODEL, OPENAI_MAX_OUTPUT_TOKENS,
-    OPENAI_REASONING_EFFORT, ARTICLES_PER_DAY, MAX_ARTICLE_AGE_DAYS,
-    ARTICLE_WORD_COUNT_TARGET, SYSTEM_PROMPTS, TEMPLATE_DIR
+    RSS_FEEDS, CATEGORIES, OPENAI_MODEL, OPENAI_MAX_OUTPUT_TOKENS,
+    OPENAI_REASONING_EFFORT, ARTICLES_PER_DAY,
+    ARTICLE_WORD_COUNT_TARGET, SYSTEM_PROMPTS, MAX_ENTRIES_PER_FEED,
+    CACHE_DIR, DATA_DIR, GENERATION_WORKERS, GENERATION_ITEM_TIMEOUT_SECONDS,
+    OPENAI_TIMEOUT_SECONDS, OPENAI_MAX_RETRIES, OPENAI_STREAM, TRACE_DIR
 )
+from article_store import ArticleStore
+from batch_jobs import BatchQueue, get_backend
+from dedup_index import DedupIndex
+from json_stream import SchemaDivergence, StreamValidator, validate_text
+from keyword_matcher import match_article
+from related_index import RelatedIndex, open_related_index
+from search_index import update_search_index
+from llm_cache import disable_llm_cache, get_llm_cache
+from tracing import get_tracer, start_trace
+
+# openai, feedparser, the feed fetching modules and the NumPy/SciPy-backed
+# ranking modules take most of this module's import time and are only needed
+# to fetch, rank and generate, so they are imported where used. `rebuild`
+# never loads them.
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from feed_fetcher import FeedResult
 
 logging.basicConfig(
     level=logging.INFO,
@@ -66,42 +101,93 @@ def get_project_root() -> Path:
     script_dir = Path(__file__).resolve().parent
     return script_dir.parent
 
-def fetch_rss_feeds() -> List[Dict]:
+def fetch_rss_feeds() -> Tuple[List[Dict], List['FeedResult']]:
     """
     Fetch articles from configured RSS feeds.
 
+    Feeds are downloaded concurrently (see feed_fetcher) with conditional-GET
+    validators from the on-disk feed cache. Unchanged feeds (304) reuse their
+    cached entries without parsing. The rest are parsed while they download
+    (see feed_parser), stopping after MAX_ENTRIES_PER_FEED entries; feeds the
+    streaming parser rejects are handed to feedparser as raw bytes instead.
+    Articles keep the configured feed order.
+
     Returns:
-        List of dicts with: title, link, summary, published, source, category
+        Tuple of (articles, per-feed results). Articles are dicts with:
+        title, link, summary, published, source, category
     """
-    articles = []
-    project_root = get_project_root()
+    import feedparser
+    from feed_cache import FeedCache
+    from feed_fetcher import iter_feeds, log_feed_stats
+    from feed_parser import StreamingFeedParser
+
+    configured_urls = [url for feed_urls in RSS_FEEDS.values() for url in feed_urls]
+    cache = FeedCache.load(get_project_root() / CACHE_DIR / 'feed_cache.json')
+    validators = {url: cache.conditional_headers(url) for url in configured_urls}
+
+    parsed: Dict[str, List[Dict]] = {}
+    results: List['FeedResult'] = []
+
+    for result in iter_feeds(
+        RSS_FEEDS,
+        request_headers=validators,
+        stream_parser=lambda: StreamingFeedParser(MAX_ENTRIES_PER_FEED),
+    ):
+        results.append(result)
+
+        if result.status == 'not_modified':
+            cached_entries = cache.entries(result.url)
+            if cached_entries is not None:
+                parsed[result.url] = cached_entries
+                result.entries = len(cached_entries)
+            continue
+
+        if not result.ok:
+            logger.error(f"Error fetching RSS feed {result.url}: {result.error}")
+            continue
 
-    for category, feed_urls in RSS_FEEDS.items():
-        for feed_url in feed_urls:
-            try:
-                logger.info(f"Fetching RSS feed: {feed_url}")
-                feed = feedparser.parse(feed_url)
+        try:
+            entries = result.parsed
+            if not entries:
+                feed = feedparser.parse(result.content, response_headers=result.headers)
 
                 if feed.bozo:
-                    logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
-
-                for entry in feed.entries[:10]:
-                    article = {
-                        'title': entry.get('title', 'Untitled'),
-                        'link': entry.get('link', ''),
-                        'summary': entry.get('summary', ''),
-                        'published': entry.get('published', ''),
-                        'source': feed_url,
-                        'category': category
-                    }
-                    articles.append(article)
-
-            except Exception as e:
-                logger.error(f"Error fetching RSS feed {feed_url}: {e}")
-                continue
+                    logger.warning(f"Feed parsing warning for {result.url}: {feed.bozo_exception}")
+                entries = feed.entries[:MAX_ENTRIES_PER_FEED]
+
+            parsed[result.url] = [
+                {
+                    'title': entry.get('title') or 'Untitled',
+                    'link': entry.get('link', ''),
+                    'summary': entry.get('summary', ''),
+                    'published': entry.get('published', ''),
+                    'source': result.url,
+                    'category': result.category
+                }
+                for entry in entries
+            ]
+            result.entries = len(parsed[result.url])
+            cache.store(result.url, result.headers, parsed[result.url])
+
+        except Exception as e:
+            logger.error(f"Error parsing RSS feed {result.url}: {e}")
+            continue
+
+    log_feed_stats(results)
+
+    cache.evict(configured_urls)
+    cache.log_stats()
+    try:
+        cache.save()
+    except OSError as e:
+        logger.warning(f"Could not save feed cache: {e}")
+
+    articles = []
+    for feed_url in configured_urls:
+        articles.extend(parsed.get(feed_url, []))
 
     logger.info(f"Fetched {len(articles)} articles from RSS feeds")
-    return articles
+    return articles, results
 
 def _score_article_relevance(title: str, summary: str) -> int:
     """
@@ -112,74 +198,67 @@ def _score_article_relevance(title: str, summary: str) -> int:
         summary: Article summary
 
     Returns:
-        Integer score (number of keyword matches)
+        Integer score (number of distinct keywords matched)
     """
-    text = (title + " " + summary).lower()
-    score = 0
-
-    for keyword in RELEVANCE_KEYWORDS:
-        if keyword.lower() in text:
-            score += 1
-
-    return score
+    return match_article(title, summary).relevance_score
 
-def _titles_similar(title1: str, title2: str, threshold: float = 0.85) -> bool:
+def filter_relevant_articles(
+    articles: List[Dict],
+    index: Optional[DedupIndex] = None,
+    catalogue: Optional[List[Dict]] = None,
+) -> List[Dict]:
     """
-    Check if two titles are similar (simple deduplication).
+    Rank articles, filter them by relevance score and drop near-duplicates.
 
-    Args:
-        title1: First title
-        title2: Second title
-        threshold: Similarity threshold (default 0.85 = 85% words match)
-
-    Returns:
-        True if titles are similar, False otherwise
-    """
-    def normalize(text):
-        return set(text.lower().split())
-
-    words1 = normalize(title1)
-    words2 = normalize(title2)
-
-    if not words1 or not words2:
-        return title1.lower() == title2.lower()
-
-    intersection = len(words1 & words2)
-    union = len(words1 | words2)
-    similarity = intersection / union if union > 0 else 0
-
-    return similarity >= threshold
-
-def filter_relevant_articles(articles: List[Dict]) -> List[Dict]:
-    """
-    Filter articles by relevance score and deduplicate by title.
+    Every candidate gets a TF-IDF rank_score against the topic profile (see
+    relevance_ranker); the keyword count still gates which ones are relevant.
+    Candidates are deduplicated best first, so the better-ranked copy of a
+    story is the one kept.
 
     Args:
         articles: List of article dicts
+        index: Dedup index holding stories covered on previous days. A fresh
+            in-memory index is used when omitted.
+        catalogue: Published articles that shape the topic profile
 
     Returns:
-        Filtered list of relevant, unique articles
+        Filtered list of relevant, unique articles, best ranked first
     """
-    relevant = []
+    from relevance_ranker import rank_articles
 
+    # Keyword scores are set before ranking: without NumPy the ranker orders
+    # candidates by relevance_score.
     for article in articles:
-        score = _score_article_relevance(article['title'], article['summary'])
-        if score >= 2:
-            article['relevance_score'] = score
-            relevant.append(article)
+        match = match_article(article['title'], article['summary'])
+        article['relevance_score'] = match.relevance_score
+        if match.relevance_score >= 2:
+            article['assigned_category'] = match.best_category()
+
+    relevant = [
+        article for article in rank_articles(articles, catalogue or [])
+        if article['relevance_score'] >= 2
+    ]
 
     logger.info(f"Filtered to {len(relevant)} relevant articles (score >= 2)")
 
+    if index is None:
+        index = DedupIndex()
+
     deduped = []
     for article in relevant:
-        is_duplicate = False
-        for existing in deduped:
-            if _titles_similar(article['title'], existing['title']):
-                is_duplicate = True
-                break
+        key = article.get('link') or article['title']
+        signature = index.signature(f"{article['title']} {article['summary']}")
+
+        duplicate_of = index.find_duplicate(signature)
+        if duplicate_of is not None:
+            covered = index.history.get(duplicate_of)
+            if covered:
+                logger.info(f"Skipping already covered story: {article['title']} (~ {covered['title']})")
+            continue
 
-        if not is_duplicate:
-            deduped.append(article)
+        index.add(key, signature)
+        article['dedup_key'] = key
+        deduped.append(article)
 
     logger.info(f"Deduplicated to {len(deduped)} unique articles")
     return deduped
@@ -195,83 +274,115 @@ def _categorize_article(title: str, summary: str) -> str:
     Returns:
         Category name
     """
-    text = (title + " " + summary).lower()
-
-    category_keywords = {
-        'markets': ['sukuk', 'market', 'commodity', 'price', 'trading', 'financial market', 'stock', 'bond'],
-        'policy': ['central bank', 'regulation', 'policy', 'imf', 'world bank', 'government', 'regulatory'],
-        'analysis': ['analysis', 'economic', 'trend', 'outlook', 'forecast', 'research', 'study'],
-        'scripture': ['quranic', 'hadith', 'islamic principle', 'scripture', 'theology', 'shariah principle'],
-        'opinion': ['opinion', 'commentary', 'column', 'perspective', 'view', 'editorial'],
-        'oic': ['oic', 'muslim-majority', 'gulf', 'arab', 'southeast asia', 'south asia', 'regional']
-    }
-
-    scores = {}
-    for category, keywords in category_keywords.items():
-        score = sum(1 for kw in keywords if kw in text)
-        scores[category] = score
-
-    best_category = max(scores, key=scores.get)
-    return best_category if scores[best_category] > 0 else 'analysis'
+    return match_article(title, summary).best_category()
 
 def select_top_articles(articles: List[Dict], n: int = 3) -> List[Dict]:
     """
-    Select top N articles spread across different categories.
+    Select top N articles, balancing relevance against category, source and
+    topic overlap (see mmr_selector).
 
     Args:
         articles: List of article dicts
         n: Number of articles to select
 
     Returns:
-        List of selected articles with category assignment
+        List of selected articles with category assignment and per-pick
+        scores under 'selection'
     """
-    for article in articles:
-        article['assigned_category'] = _categorize_article(
-            article['title'],
-            article['summary']
-        )
-
-    sorted_articles = sorted(
-        articles,
-        key=lambda a: (a['assigned_category'], -a.get('relevance_score', 0))
-    )
+    from mmr_selector import select_diverse
 
-    selected = []
-    categories_used = set()
-
-    for article in sorted_articles:
-        if len(selected) >= n:
-            break
+    for article in articles:
+        if 'assigned_category' not in article:
+            article['assigned_category'] = _categorize_article(
+                article['title'],
+                article['summary']
+            )
 
-        if article['assigned_category'] not in categories_used or len(selected) < n:
-            selected.append(article)
-            categories_used.add(article['assigned_category'])
+    selected = select_diverse(articles, n)
 
-    logger.info(f"Selected {len(selected)} top articles for processing")
+    categories = len({article['assigned_category'] for article in selected})
+    logger.info(f"Selected {len(selected)} top articles for processing across {categories} categories")
     return selected
 
-def generate_article(news_item: Dict, category: str) -> Optional[Dict]:
+class RateLimitGate:
     """
-    Generate original article using OpenAI.
+    Shared pause for all generation workers.
 
-    Args:
-        news_item: Dict with title, summary, source
-        category: Article category for system prompt
+    When any request is rate limited, every worker waits until the
+    server-advertised (or backoff) delay has passed before its next call,
+    instead of each worker hammering the API independently.
+    """
 
-    Returns:
-        Dict with generated article data or None if generation fails
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+_openai_client: Optional['OpenAI'] = None
+_openai_client_lock = threading.Lock()
+_rate_limit_gate = RateLimitGate()
+
+
+def get_openai_client() -> Optional['OpenAI']:
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+
+    The client keeps one pooled HTTP connection set for every article and is
+    safe to share between threads. Retries are handled by generate_article,
+    so the SDK's own retries are disabled. OPENAI_BASE_URL is honoured by the
+    SDK, which lets the pipeline run against a local stand-in endpoint.
     """
+    global _openai_client
+
     api_key = os.environ.get('OPENAI_API_KEY')
     if not api_key:
         logger.error("OPENAI_API_KEY environment variable not set")
         return None
 
+    with _openai_client_lock:
+        if _openai_client is None:
+            from openai import OpenAI
+            _openai_client = OpenAI(
+                api_key=api_key,
+                max_retries=0,
+                timeout=OPENAI_TIMEOUT_SECONDS,
+            )
+        return _openai_client
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Backoff for a retryable error, preferring the server's Retry-After."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
     try:
-        client = OpenAI(api_key=api_key)
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return min(60.0, 2 ** attempt) + random.uniform(0, 1)
+
+
+def article_request(news_item: Dict, category: str) -> Dict:
+    """
+    Keyword arguments of the Responses API call for one article.
 
-        system_prompt = SYSTEM_PROMPTS.get(category, SYSTEM_PROMPTS['analysis'])
+    Used as-is for real-time requests and as the body of a batch request line.
+    """
+    system_prompt = SYSTEM_PROMPTS.get(category, SYSTEM_PROMPTS['analysis'])
 
-        user_message = f"""Based on the following news item, write an original 800-1000 word article:
+    user_message = f"""Based on the following news item, write an original 800-1000 word article:
 
 Title: {news_item['title']}
 Summary: {news_item['summary']}
@@ -293,321 +404,484 @@ Format your response as JSON with the following structure:
 
 Do not include any markdown formatting, only HTML."""
 
-        logger.info(f"Calling OpenAI API to generate article for: {news_item['title']}")
-
-        response = client.responses.create(
-            model=os.environ.get('OPENAI_MODEL', OPENAI_MODEL),
-            reasoning={"effort": os.environ.get('OPENAI_REASONING_EFFORT', OPENAI_REASONING_EFFORT)},
-            max_output_tokens=OPENAI_MAX_OUTPUT_TOKENS,
-            input=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": article_schema()["name"],
-                    "schema": article_schema()["schema"],
-                    "strict": True,
-                }
-            },
-        )
-        response_text = getattr(response, 'output_text', '') or ''
-        if not response_text:
-            logger.error("Could not extract JSON from OpenAI response")
-            return None
-
-        article_data = json.loads(response_text)
-
-        article_data['author'] = 'Al-Tijarah Analysis Desk'
-        article_data['category'] = CATEGORIES.get(category, category)
-        article_data['date'] = datetime.now().isoformat()
-        article_data['date_formatted'] = datetime.now().strftime('%B %d, %Y')
-        article_data['source'] = news_item['source']
-        article_data['source_title'] = news_item['title']
+    return {
+        "model": os.environ.get('OPENAI_MODEL', OPENAI_MODEL),
+        "reasoning": {"effort": os.environ.get('OPENAI_REASONING_EFFORT', OPENAI_REASONING_EFFORT)},
+        "max_output_tokens": OPENAI_MAX_OUTPUT_TOKENS,
+        "input": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ],
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": article_schema()["name"],
+                "schema": article_schema()["schema"],
+                "strict": True,
+            }
+        },
+    }
 
-        word_count = len(article_data.get('content_html', '').split())
-        article_data['reading_time'] = max(1, round(word_count / 200))
 
-        logger.info(f"Generated article: {article_data['title']}")
-        return article_data
+class IncompleteResponse(ValueError):
+    """The model stopped before finishing, e.g. at max_output_tokens."""
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse OpenAI response as JSON: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error generating article: {e}")
-        return None
 
-def generate_slug(title: str, date_prefix: bool = True) -> str:
+def _stream_article(client: 'OpenAI', request: Dict, title: str, deadline: Optional[float] = None) -> str:
+    """
+    Stream one article request, validating the JSON as tokens arrive.
+
+    Raises SchemaDivergence as soon as the text can no longer match
+    article_schema(), closing the stream so no further output is paid for.
+    Raises IncompleteResponse when the response ends incomplete (e.g. at the
+    token limit). Raises
+    TimeoutError once time.monotonic() passes `deadline`: the client timeout
+    only bounds each read, not a stream that keeps producing. Time to first
+    token and output tokens/sec are attached to the current span.
     """
-    Create URL-friendly slug from title.
+    tracer = get_tracer()
+    validator = StreamValidator(article_schema()['schema'])
+    parts = []
+    response = None
+    started = time.perf_counter()
+    first_token = None
+
+    with client.responses.create(**request, stream=True) as stream:
+        for event in stream:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Stream still running after the per-item budget, {validator.offset} characters in")
+            if event.type == 'response.output_text.delta':
+                if first_token is None:
+                    first_token = time.perf_counter()
+                validator.feed(event.delta)
+                parts.append(event.delta)
+            elif event.type in ('response.completed', 'response.incomplete'):
+                response = event.response
+            elif event.type == 'response.failed':
+                raise ValueError(f"Response failed: {event.response.error}")
+            elif event.type == 'error':
+                raise ValueError(f"Response stream error: {event.message}")
+    finished = time.perf_counter()
+
+    if response is not None and response.status == 'incomplete':
+        reason = getattr(response.incomplete_details, 'reason', None) or 'unknown reason'
+        raise IncompleteResponse(f"Incomplete response ({reason}) after {validator.offset} characters")
+    try:
+        validator.close()
+    except SchemaDivergence as e:
+        # Ran to the end without finishing the value: as costly as incomplete.
+        raise IncompleteResponse(str(e)) from e
+
+    usage = getattr(response, 'usage', None)
+    output_tokens = getattr(usage, 'output_tokens', 0) or 0
+    if usage is not None:
+        tracer.count('tokens_input', getattr(usage, 'input_tokens', 0) or 0)
+        tracer.count('tokens_output', output_tokens)
+    if first_token is not None:
+        # Reasoning tokens are produced before the first visible one.
+        details = getattr(usage, 'output_tokens_details', None)
+        visible_tokens = output_tokens - (getattr(details, 'reasoning_tokens', 0) or 0)
+        ttft = first_token - started
+        rate = visible_tokens / max(finished - first_token, 1e-6)
+        tracer.set(ttft_s=round(ttft, 3), tokens_per_s=round(rate, 1))
+        logger.info(f"Streamed article for {title}: first token after {ttft:.2f}s, {rate:.0f} tokens/s")
+
+    return ''.join(parts)
+
+
+def _article_text_ok(text: str) -> bool:
+    """Whether a response is one complete article_schema() instance; only those are cached."""
+    try:
+        validate_text(text, article_schema()['schema'])
+    except SchemaDivergence:
+        return False
+    return True
 
-    Args:
-        title: Article title
-        date_prefix: Whether to prepend date (default True)
 
-    Returns:
-        URL-friendly slug
-    """
-    slug = re.sub(r'[^a-zA-Z0-9\s-]', '', title)
-    slug = re.sub(r'\s+', '-', slug.strip())
-    slug = slug.lower()
-    slug = slug[:60]
+def _request_article(client: 'OpenAI', news_item: Dict, category: str,
+                     deadline: Optional[float] = None) -> Dict:
+    """Make one article request and return the parsed JSON payload."""
+    request = article_request(news_item, category)
+    stream = os.environ.get('OPENAI_STREAM', str(OPENAI_STREAM)).lower() not in ('0', 'false', 'no')
 
-    if date_prefix:
-        date_str = datetime.now().strftime('%Y%m%d')
-        slug = f"{date_str}-{slug}"
+    def call() -> str:
+        logger.info(f"Calling OpenAI API to generate article for: {news_item['title']}")
+        if stream:
+            return _stream_article(client, request, news_item['title'], deadline)
+        response = client.responses.create(**request)
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            get_tracer().count('tokens_input', getattr(usage, 'input_tokens', 0) or 0)
+            get_tracer().count('tokens_output', getattr(usage, 'output_tokens', 0) or 0)
+        return getattr(response, 'output_text', '') or ''
+
+    response_text = get_llm_cache().cached_call(
+        {
+            'provider': 'openai',
+            'model': request['model'],
+            'reasoning_effort': request['reasoning']['effort'],
+            'max_output_tokens': request['max_output_tokens'],
+            'system': request['input'][0]['content'],
+            'user': request['input'][1]['content'],
+            'schema': article_schema(),
+        },
+        call,
+        validate=_article_text_ok,
+    )
+    if not response_text:
+        raise ValueError("Could not extract JSON from OpenAI response")
 
-    return slug
+    return json.loads(response_text)
 
-def write_article_html(article_data: Dict, project_root: Path) -> Optional[str]:
+
+def generate_article(news_item: Dict, category: str) -> Optional[Dict]:
     """
-    Render article template and write to file.
+    Generate original article using OpenAI.
+
+    Rate limits, timeouts and transient server errors are retried with
+    exponential backoff (honouring Retry-After) until OPENAI_MAX_RETRIES or
+    the per-item GENERATION_ITEM_TIMEOUT_SECONDS budget runs out. Each attempt's
+    timeout is clamped to what is left of that budget, and a streamed response
+    is cut off when it runs out. Streamed output that stops matching the
+    schema is aborted and retried at once; an incomplete response is not
+    retried, since the same request would stop at the same limit.
 
     Args:
-        article_data: Dict with article metadata and content
-        project_root: Path to project root
+        news_item: Dict with title, summary, source
+        category: Article category for system prompt
 
     Returns:
-        Path to written file or None if error
+        Dict with generated article data or None if generation fails
     """
-    try:
-        template_dir = project_root / TEMPLATE_DIR
-        env = Environment(loader=FileSystemLoader(str(template_dir)))
-        template = env.get_template('article_template.html')
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
 
-        article_data['related_articles'] = []
+    client = get_openai_client()
+    if client is None:
+        return None
 
-        html_content = template.render(**article_data)
+    deadline = time.monotonic() + GENERATION_ITEM_TIMEOUT_SECONDS
 
-        blog_dir = project_root / 'Website' / 'blog'
-        blog_dir.mkdir(parents=True, exist_ok=True)
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        _rate_limit_gate.wait()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.error(f"Giving up on article for {news_item['title']}: per-item time budget spent")
+            return None
+        try:
+            attempt_client = client.with_options(timeout=max(1, min(OPENAI_TIMEOUT_SECONDS, remaining)))
+            article_data = _request_article(attempt_client, news_item, category, deadline)
+            break
 
-        slug = generate_slug(article_data['title'])
-        article_path = blog_dir / f"{slug}.html"
+        except TimeoutError as e:
+            logger.error(f"Giving up on article for {news_item['title']}: {e}")
+            return None
 
-        with open(article_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        except IncompleteResponse as e:
+            # The full output budget was spent; retrying would spend it again.
+            get_tracer().count('llm_incomplete')
+            logger.error(f"Giving up on article for {news_item['title']}: {e}")
+            return None
 
-        article_data['url'] = f"blog/{slug}.html"
-        article_data['slug'] = slug
+        except (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError) as e:
+            delay = _retry_delay(e, attempt)
+            if isinstance(e, RateLimitError):
+                _rate_limit_gate.pause(delay)
+            if attempt >= OPENAI_MAX_RETRIES or time.monotonic() + delay > deadline:
+                logger.error(f"Giving up on article for {news_item['title']}: {e}")
+                return None
+            get_tracer().count('llm_retries')
+            logger.warning(
+                f"Retrying article for {news_item['title']} in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{OPENAI_MAX_RETRIES}): {e}"
+            )
+            time.sleep(delay)
+
+        except SchemaDivergence as e:
+            # Aborted mid-stream, so a retry costs little; no backoff needed.
+            get_tracer().count('llm_schema_aborts')
+            if attempt >= OPENAI_MAX_RETRIES or time.monotonic() > deadline:
+                logger.error(f"Giving up on article for {news_item['title']}: {e}")
+                return None
+            get_tracer().count('llm_retries')
+            logger.warning(
+                f"Retrying article for {news_item['title']} "
+                f"(attempt {attempt + 1}/{OPENAI_MAX_RETRIES}): {e}"
+            )
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse OpenAI response as JSON: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error generating article: {e}")
+            return None
 
-        logger.info(f"Wrote article to {article_path}")
-        return str(article_path)
+    finish_article(article_data, news_item, category)
+    logger.info(f"Generated article: {article_data['title']}")
+    return article_data
 
-    except Exception as e:
-        logger.error(f"Error writing article HTML: {e}")
-        return None
 
-def update_articles_json(new_articles: List[Dict], project_root: Path) -> List[Dict]:
+def finish_article(article_data: Dict, news_item: Dict, category: str) -> Dict:
+    """Add byline, category, date, source and reading time to a model payload."""
+    article_data['author'] = 'Al-Tijarah Analysis Desk'
+    article_data['category'] = CATEGORIES.get(category, category)
+    article_data['date'] = datetime.now().isoformat()
+    article_data['date_formatted'] = datetime.now().strftime('%B %d, %Y')
+    article_data['source'] = news_item['source']
+    article_data['source_title'] = news_item['title']
+
+    word_count = len(article_data.get('content_html', '').split())
+    article_data['reading_time'] = max(1, round(word_count / 200))
+    return article_data
+
+
+def generate_articles(
+    news_items: List[Dict],
+    max_workers: int = GENERATION_WORKERS,
+) -> List[Tuple[Dict, Dict]]:
     """
-    Update articles.json with new articles, trim by age, archive old articles.
+    Generate articles for several news items concurrently.
+
+    Items are processed on a bounded thread pool sharing one OpenAI client.
+    Failed items are logged and dropped, so partial successes still flow on.
 
     Args:
-        new_articles: List of new article dicts
-        project_root: Path to project root
+        news_items: Selected news items (with assigned_category)
+        max_workers: Maximum number of concurrent API calls
 
     Returns:
-        Updated list of all articles
+        List of (news_item, generated_article) pairs in selection order
     """
-    data_dir = project_root / 'Website' / 'data'
-    data_dir.mkdir(parents=True, exist_ok=True)
+    if not news_items:
+        return []
 
-    articles_file = data_dir / 'articles.json'
-    archive_dir = data_dir / 'archive'
-    archive_dir.mkdir(parents=True, exist_ok=True)
+    tracer = get_tracer()
+    parent = tracer.current()
 
-    if articles_file.exists():
-        with open(articles_file, 'r', encoding='utf-8') as f:
-            all_articles = json.load(f)
-    else:
-        all_articles = []
+    def run(item: Dict) -> Optional[Dict]:
+        with tracer.span('generate_article', parent=parent, title=item['title'][:80]):
+            article = generate_article(item, item.get('assigned_category', 'analysis'))
+            if article is None:
+                tracer.count('articles_failed')
+            return article
 
-    all_articles = new_articles + all_articles
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(news_items))),
+        thread_name_prefix='generate',
+    ) as executor:
+        futures = [executor.submit(run, item) for item in news_items]
+        results = [future.result() for future in futures]
 
-    cutoff_date = datetime.now() - timedelta(days=MAX_ARTICLE_AGE_DAYS)
-    current_articles = []
-    archived_articles = []
+    generated = [(item, article) for item, article in zip(news_items, results) if article]
+    logger.info(f"Generated {len(generated)}/{len(news_items)} articles")
+    return generated
 
-    for article in all_articles:
-        article_date_str = article.get('date', '')
-        try:
-            article_date = datetime.fromisoformat(article_date_str)
-        except (ValueError, TypeError):
-            article_date = datetime.now()
-
-        if article_date >= cutoff_date:
-            current_articles.append(article)
-        else:
-            archived_articles.append(article)
-
-    with open(articles_file, 'w', encoding='utf-8') as f:
-        json.dump(current_articles, f, indent=2, ensure_ascii=False)
 
-    if archived_articles:
-        archive_date = datetime.now().strftime('%Y-%m')
-        archive_file = archive_dir / f"{archive_date}.json"
+def submit_article_batch(news_items: List[Dict], project_root: Path) -> Optional[Dict]:
+    """
+    Submit article requests for news items as one offline batch (see batch_jobs).
 
-        existing_archive = []
-        if archive_file.exists():
-            with open(archive_file, 'r', encoding='utf-8') as f:
-                existing_archive = json.load(f)
+    The request bodies are exactly what generate_article would send. Each
+    custom_id is derived from the item's dedup key; the job keeps the fields
+    of the news item needed to finish the article when results come back.
 
-        all_archived = archived_articles + existing_archive
+    Returns:
+        The job record, or None if no client is configured
+    """
+    client = get_openai_client()
+    if client is None:
+        return None
 
-        with open(archive_file, 'w', encoding='utf-8') as f:
-            json.dump(all_archived, f, indent=2, ensure_ascii=False)
+    requests = []
+    for item in news_items:
+        category = item.get('assigned_category', 'analysis')
+        custom_id = hashlib.sha256(item['dedup_key'].encode('utf-8')).hexdigest()[:24]
+        payload = {
+            'news_item': {key: item.get(key, '') for key in ('title', 'summary', 'source', 'link')},
+            'category': category,
+        }
+        requests.append((custom_id, article_request(item, category), payload))
 
-        logger.info(f"Archived {len(archived_articles)} old articles to {archive_file}")
+    queue = BatchQueue.load(project_root)
+    label = f"{len(requests)} articles, {datetime.now().strftime('%Y-%m-%d')}"
+    return queue.submit(get_backend(client, project_root), requests, label)
 
-    logger.info(f"Updated articles.json with {len(current_articles)} current articles")
-    return current_articles
 
-def regenerate_blog_html(articles_db: List[Dict], project_root: Path) -> bool:
+def ingest_article_batches(project_root: Path) -> List[Dict]:
     """
-    Regenerate blog.html from articles database.
+    Publish the articles of every batch job whose results have arrived.
 
-    Args:
-        articles_db: List of all article dicts
-        project_root: Path to project root
+    Each step is saved to data/batch_jobs.json before the next one starts, so
+    a run killed part-way resumes without losing or duplicating articles:
+
+    1. Results are finished into article records (date, slug, URL) once and
+       stored on the job; a resumed run reuses them instead of re-deriving.
+    2. The article log's size is stored on the job before appending. On
+       resume, articles already in the log past that offset are not appended
+       again.
+    3. Pages are (re)written, which is idempotent, and the job is marked
+       ingested.
 
     Returns:
-        True if successful, False otherwise
+        Articles published from the ingested jobs
     """
-    try:
-        template_dir = project_root / TEMPLATE_DIR
-        env = Environment(loader=FileSystemLoader(str(template_dir)))
-        template = env.get_template('blog_template.html')
-
-        sorted_articles = sorted(
-            articles_db,
-            key=lambda a: a.get('date', ''),
-            reverse=True
-        )
-
-        lead_article = None
-        secondary_leads = []
-
-        for article in sorted_articles:
-            if lead_article is None:
-                lead_article = article
-            elif len(secondary_leads) < 3:
-                secondary_leads.append(article)
-            else:
-                break
-
-        analysis_articles = [
-            a for a in sorted_articles
-            if a.get('category', '').lower() in ['analysis', 'economic analysis', 'markets & commodities']
-        ][:3]
-
-        oic_articles = [
-            a for a in sorted_articles
-            if a.get('category', '').lower() in ['oic economies', 'oic']
-        ][:4]
-
-        opinion_articles = [
-            a for a in sorted_articles
-            if a.get('category', '').lower() in ['opinion & commentary', 'opinion']
-        ][:5]
-
-        scripture_articles = [
-            a for a in sorted_articles
-            if a.get('category', '').lower() in ['islamic principles', 'scripture']
-        ][:3]
-
-        ticker_items = [
-            {'label': 'Brent Crude', 'value': '$75.20', 'change': '-0.8%', 'direction': 'down'},
-            {'label': 'Gold', 'value': '$2,842', 'change': '+0.3%', 'direction': 'up'},
-            {'label': 'Islamic Finance AUM', 'value': '$4.5T', 'change': '+11.3%', 'direction': 'up'},
-        ]
-
-        context = {
-            'current_date': datetime.now().strftime('%A, %B %d, %Y'),
-            'lead_article': lead_article,
-            'secondary_leads': secondary_leads,
-            'analysis_articles': analysis_articles,
-            'oic_articles': oic_articles,
-            'opinion_articles': opinion_articles,
-            'scripture_articles': scripture_articles,
-            'ticker_items': ticker_items,
-        }
+    tracer = get_tracer()
+    queue = BatchQueue.load(project_root)
+    if not queue.pending():
+        return []
+
+    client = get_openai_client()
+    if client is None:
+        return []
+    backends = {}
+
+    def backend_for(name: str):
+        if name not in backends:
+            backends[name] = get_backend(client, project_root, name)
+        return backends[name]
+
+    published = []
+    for job in queue.poll(backend_for):
+        if job.get('articles') is None:
+            articles = {}
+            for custom_id, result in job['results'].items():
+                payload = job['items'].get(custom_id)
+                if payload is None:
+                    continue
+                usage = result.get('usage') or {}
+                tracer.count('tokens_input', usage.get('input_tokens', 0) or 0)
+                tracer.count('tokens_output', usage.get('output_tokens', 0) or 0)
+                try:
+                    if result['error']:
+                        raise ValueError(result['error'])
+                    article = json.loads(result['text'])
+                except ValueError as e:
+                    logger.error(f"Batch article for {payload['news_item']['title']} failed: {e}")
+                    tracer.count('articles_failed')
+                    continue
+                finish_article(article, payload['news_item'], payload['category'])
+                assign_slug(article)
+                articles[custom_id] = article
+            missing = len(job['items']) - len(articles)
+            if missing:
+                logger.warning(f"Batch job {job['id']}: {missing} of {len(job['items'])} articles missing")
+            job['articles'] = articles
+            queue.save()
+
+        articles = list(job['articles'].values())
+        store = ArticleStore.open(project_root)
+        if job.get('log_offset') is None:
+            job['log_offset'] = store.log_size
+            queue.save()
+        logged = {record.get('url') for record in store.records_since(job['log_offset'])}
+        new_articles = [article for article in articles if article['url'] not in logged]
+        if new_articles:
+            update_articles_json(new_articles, project_root)
+
+        related_index = open_related_index(project_root)
+        write_articles_html(articles, project_root, related_index)
+        related_index.save(RelatedIndex.default_path(project_root))
+
+        queue.finish(job)
+        tracer.count('articles_ingested', len(articles))
+        logger.info(f"Ingested batch job {job['id']}: {len(articles)} articles")
+        published.extend(articles)
+
+    return published
 
-        html_content = template.render(**context)
 
-        blog_file = project_root / 'Website' / 'blog.html'
-        blog_file.parent.mkdir(parents=True, exist_ok=True)
+def update_articles_json(new_articles: List[Dict], project_root: Path) -> List[Dict]:
+    """
+    Append new articles to the article log and materialize articles.json.
 
-        with open(blog_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+    Articles are appended to the append-only store (see article_store); the
+    compaction step then writes the current window to articles.json and
+    archives articles that have aged out, each via an atomic rename. The blog
+    search index is then brought in line with the new window, rewriting only
+    the shards the added and archived articles touch (see search_index).
 
-        logger.info(f"Regenerated blog.html with {len(sorted_articles)} articles")
-        return True
+    Args:
+        new_articles: List of new article dicts
+        project_root: Path to project root
 
+    Returns:
+        Updated list of all articles
+    """
+    store = ArticleStore.open(project_root)
+    store.append(new_articles)
+    current_articles = store.compact()
+
+    try:
+        update_search_index(current_articles, project_root)
     except Exception as e:
-        logger.error(f"Error regenerating blog.html: {e}")
-        return False
+        # The site build retries this; a stale search index must not fail the run.
+        logger.error(f"Error updating search index: {e}")
 
-def main():
-    """Main orchestration function."""
-    parser = argparse.ArgumentParser(
-        description='Generate Islamic Economics newspaper from RSS feeds'
-    )
-    parser.add_argument(
-        '--dry-run',
-        action='store_true',
-        help='Skip API calls and file writes'
-    )
-    parser.add_argument(
-        '--force',
-        action='store_true',
-        help='Regenerate blog.html from existing articles.json without fetching new content'
-    )
+    return current_articles
 
-    args = parser.parse_args()
-    project_root = get_project_root()
 
-    logger.info("Starting Islamic Economics newspaper generation")
+def run_tier1(args: argparse.Namespace, project_root: Path) -> int:
+    """
+    Tier 1: fetch, filter, select, generate and publish today's articles.
 
-    if args.force:
-        logger.info("Using --force flag: regenerating from existing articles")
+    Each step is a span of the run trace (see tracing); any failure raises so
+    main() can fall back to Tier 2.
+    """
+    tracer = get_tracer()
+
+    with tracer.span('fetch'):
+        rss_articles, feed_results = fetch_rss_feeds()
+        tracer.count('feeds', len(feed_results))
+        tracer.count('feeds_ok', sum(1 for r in feed_results if r.ok))
+        tracer.count('feeds_not_modified', sum(1 for r in feed_results if r.status == 'not_modified'))
+        tracer.count('feed_bytes', sum(r.bytes_read for r in feed_results))
+        tracer.count('feed_entries', len(rss_articles))
+    if not rss_articles:
+        raise Exception("No articles fetched from RSS feeds")
+
+    with tracer.span('filter'):
+        dedup_path = project_root / DATA_DIR / 'dedup_signatures.json'
+        dedup_index = DedupIndex.load(dedup_path)
+
+        catalogue = []
         articles_file = project_root / 'Website' / 'data' / 'articles.json'
-
         if articles_file.exists():
             with open(articles_file, 'r', encoding='utf-8') as f:
-                articles_db = json.load(f)
-
-            if regenerate_blog_html(articles_db, project_root):
-                logger.info("Successfully regenerated blog.html")
-                return 0
-            else:
-                logger.error("Failed to regenerate blog.html")
-                return 1
-        else:
-            logger.error(f"Articles file not found: {articles_file}")
-            return 1
-
-    try:
-        logger.info("Tier 1: Fetching RSS feeds and generating articles...")
-
-        rss_articles = fetch_rss_feeds()
-        if not rss_articles:
-            raise Exception("No articles fetched from RSS feeds")
+                catalogue = json.load(f)
 
-        relevant_articles = filter_relevant_articles(rss_articles)
-        if not relevant_articles:
-            raise Exception("No relevant articles after filtering")
+        relevant_articles = filter_relevant_articles(rss_articles, dedup_index, catalogue)
+        tracer.count('relevant', len(relevant_articles))
+    if not relevant_articles:
+        raise Exception("No relevant articles after filtering")
 
+    with tracer.span('select'):
         selected_articles = select_top_articles(relevant_articles, n=ARTICLES_PER_DAY)
-        if not selected_articles:
-            raise Exception("No articles selected for generation")
-
-        generated_articles = []
-        for article in selected_articles:
-            category = article.get('assigned_category', 'analysis')
+        tracer.count('selected', len(selected_articles))
+    if not selected_articles:
+        raise Exception("No articles selected for generation")
 
+    if args.batch:
+        with tracer.span('submit_batch', dry_run=args.dry_run):
             if args.dry_run:
+                for article in selected_articles:
+                    logger.info(f"[DRY RUN] Would submit batch request for: {article['title']}")
+            else:
+                job = submit_article_batch(selected_articles, project_root)
+                if job is None:
+                    raise Exception("Could not submit article batch")
+                # Recorded now so tomorrow's run does not pick the same items
+                # while the batch is still pending.
+                for article in selected_articles:
+                    dedup_index.record(article['dedup_key'], article['title'])
+                dedup_index.save(dedup_path)
+            tracer.count('articles_submitted', len(selected_articles))
+        logger.info(f"Tier 1 complete: Submitted {len(selected_articles)} articles as a batch")
+        return 0
+
+    generated_articles = []
+    with tracer.span('generate', dry_run=args.dry_run):
+        if args.dry_run:
+            for article in selected_articles:
+                category = article.get('assigned_category', 'analysis')
                 logger.info(f"[DRY RUN] Would generate article from: {article['title']}")
                 generated_articles.append({
                     'title': f"Generated: {article['title'][:50]}",
@@ -624,58 +898,243 @@ def main():
                     'slug': f"placeholder-{len(generated_articles)}",
                     'reading_time': 5,
                 })
-            else:
-                generated = generate_article(article, category)
-                if generated:
-                    write_article_html(generated, project_root)
-                    generated_articles.append(generated)
+        else:
+            cache = get_llm_cache()
+            hits, misses = cache.hits, cache.misses
+            results = generate_articles(selected_articles)
+            for article, generated in results:
+                assign_slug(generated)
+                generated_articles.append(generated)
+                dedup_index.record(article['dedup_key'], article['title'])
+            cache.log_stats()
+            tracer.count('llm_cache_hits', cache.hits - hits)
+            tracer.count('llm_cache_misses', cache.misses - misses)
+        tracer.count('articles_generated', len(generated_articles))
+
+    if not generated_articles:
+        raise Exception("No articles were successfully generated")
+
+    if not args.dry_run:
+        dedup_index.save(dedup_path)
+
+    logger.info(f"Generated {len(generated_articles)} articles")
+
+    if not args.dry_run:
+        with tracer.span('update_json'):
+            articles_db = update_articles_json(generated_articles, project_root)
+            tracer.count('articles_current', len(articles_db))
+        with tracer.span('write_html'):
+            # Index the new articles first so their pages get related links.
+            related_index = open_related_index(project_root)
+            paths = write_articles_html(generated_articles, project_root, related_index)
+            related_index.save(RelatedIndex.default_path(project_root))
+            tracer.count('pages_written', sum(1 for path in paths if path))
+    else:
+        articles_file = project_root / 'Website' / 'data' / 'articles.json'
+        if articles_file.exists():
+            with open(articles_file, 'r', encoding='utf-8') as f:
+                articles_db = json.load(f)
+        else:
+            articles_db = generated_articles
 
-        if not generated_articles:
-            raise Exception("No articles were successfully generated")
+    with tracer.span('blog_html'):
+        regenerated = regenerate_blog_html(articles_db, project_root)
+    if regenerated is False:
+        raise Exception("Failed to regenerate blog.html")
 
-        logger.info(f"Generated {len(generated_articles)} articles")
+    if regenerated:
+        logger.info("Successfully regenerated blog.html")
+    logger.info(f"Tier 1 complete: Generated {len(generated_articles)} fresh articles")
+    return 0
 
-        if not args.dry_run:
-            articles_db = update_articles_json(generated_articles, project_root)
-        else:
-            articles_file = project_root / 'Website' / 'data' / 'articles.json'
-            if articles_file.exists():
-                with open(articles_file, 'r', encoding='utf-8') as f:
-                    articles_db = json.load(f)
-            else:
-                articles_db = generated_articles
 
-        if regenerate_blog_html(articles_db, project_root):
-            logger.info("Successfully regenerated blog.html")
-            logger.info(f"Tier 1 complete: Generated {len(generated_articles)} fresh articles")
-            return 0
-        else:
-            raise Exception("Failed to regenerate blog.html")
+def run_tier2(project_root: Path) -> int:
+    """Tier 2: rebuild blog.html from the existing articles.json."""
+    articles_file = project_root / 'Website' / 'data' / 'articles.json'
+    if not articles_file.exists():
+        raise Exception("No articles.json found for Tier 2 fallback")
+
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles_db = json.load(f)
+
+    regenerated = regenerate_blog_html(articles_db, project_root)
+    if regenerated is False:
+        raise Exception("Failed to regenerate blog.html in Tier 2")
+    if regenerated:
+        logger.info("Tier 2 complete: Regenerated blog.html from existing articles")
+    else:
+        logger.info("Tier 2 complete: blog.html left as it is")
+    return 1
+
+
+def rebuild_blog(project_root: Path, dry_run: bool = False) -> int:
+    """`rebuild`: regenerate blog.html from the existing articles.json."""
+    articles_file = project_root / 'Website' / 'data' / 'articles.json'
+    if not articles_file.exists():
+        logger.error(f"Articles file not found: {articles_file}")
+        return 1
+
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles_db = json.load(f)
+
+    if dry_run:
+        logger.info("Dry run: blog.html not regenerated")
+        return 0
+
+    regenerated = regenerate_blog_html(articles_db, project_root)
+    if regenerated is False:
+        logger.error("Failed to regenerate blog.html")
+        return 1
+    if regenerated:
+        logger.info("Successfully regenerated blog.html")
+    return 0
+
+
+def publish_batches(project_root: Path) -> Tuple[int, bool]:
+    """
+    Publish finished batch jobs and, if any articles came in, blog.html.
+
+    Returns:
+        (articles published, whether anything failed)
+    """
+    tracer = get_tracer()
+    with tracer.span('ingest_batches'):
+        try:
+            published = ingest_article_batches(project_root)
+        except Exception as e:
+            # Job state is saved step by step; the next run picks up from here.
+            logger.error(f"Ingesting batch results failed: {e}")
+            return 0, True
+
+    if published:
+        with tracer.span('blog_html'):
+            if rebuild_blog(project_root) != 0:
+                return len(published), True
+    return len(published), False
+
+
+def run_newspaper(args: argparse.Namespace, project_root: Path) -> int:
+    """`run`: the daily pipeline, falling back through the tiers on failure."""
+    tracer = get_tracer()
+    logger.info("Starting Islamic Economics newspaper generation")
+
+    if args.batch and not args.dry_run:
+        # Tier 1 below may only submit a new batch, so publish earlier ones first.
+        publish_batches(project_root)
+
+    try:
+        logger.info("Tier 1: Fetching RSS feeds and generating articles...")
+        with tracer.span('tier1'):
+            return run_tier1(args, project_root)
 
     except Exception as e:
         logger.error(f"Tier 1 failed: {e}")
         logger.info("Tier 2: Attempting to regenerate blog from existing articles...")
 
         try:
-            articles_file = project_root / 'Website' / 'data' / 'articles.json'
-
-            if articles_file.exists():
-                with open(articles_file, 'r', encoding='utf-8') as f:
-                    articles_db = json.load(f)
-
-                if regenerate_blog_html(articles_db, project_root):
-                    logger.info("Tier 2 complete: Regenerated blog.html from existing articles")
-                    return 1
-                else:
-                    raise Exception("Failed to regenerate blog.html in Tier 2")
-            else:
-                raise Exception("No articles.json found for Tier 2 fallback")
+            with tracer.span('tier2'):
+                return run_tier2(project_root)
 
         except Exception as e2:
             logger.error(f"Tier 2 failed: {e2}")
             logger.info("Tier 3: Keeping existing blog.html unchanged")
             logger.error("Newspaper generation failed at all tiers")
-            return 2
+            with tracer.span('tier3'):
+                return 2
+
+
+def run_rebuild(args: argparse.Namespace, project_root: Path) -> int:
+    logger.info("Regenerating blog.html from existing articles")
+    with get_tracer().span('rebuild'):
+        return rebuild_blog(project_root, dry_run=args.dry_run)
+
+
+def run_resume(args: argparse.Namespace, project_root: Path) -> int:
+    if args.dry_run:
+        logger.info("Dry run: finished batch jobs not published")
+        return 0
+    _, failed = publish_batches(project_root)
+    return 1 if failed else 0
+
+
+COMMANDS = {'run': run_newspaper, 'rebuild': run_rebuild, 'resume': run_resume}
+
+# Flags that selected a mode before the subcommands existed.
+LEGACY_FLAGS = {'--force': 'rebuild', '--resume': 'resume'}
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse the command line; without a subcommand, `run` is assumed.
+
+    The old spellings keep working: no arguments runs the pipeline,
+    --force is `rebuild` and --resume is `resume`.
+    """
+    argv = list(argv)
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ('-h', '--help'):
+        legacy = [flag for flag in LEGACY_FLAGS if flag in argv]
+        for flag in legacy:
+            argv.remove(flag)
+        argv.insert(0, LEGACY_FLAGS[legacy[0]] if legacy else 'run')
+
+    parser = argparse.ArgumentParser(
+        description='Generate Islamic Economics newspaper from RSS feeds'
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        '--trace',
+        type=Path,
+        metavar='PATH',
+        help=f'Write the JSON run trace here instead of a timestamped file under {TRACE_DIR}/'
+    )
+    common.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Skip API calls and file writes'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser(
+        'run', parents=[common], help='Fetch, select and generate today\'s articles (the default)'
+    )
+    run.add_argument(
+        '--no-llm-cache',
+        action='store_true',
+        help='Always call the model, ignoring cached responses'
+    )
+    run.add_argument(
+        '--batch',
+        action='store_true',
+        help='Publish finished batch jobs, then submit today\'s articles as an offline batch'
+    )
+    subparsers.add_parser(
+        'rebuild', parents=[common],
+        help='Regenerate blog.html from existing articles.json without fetching new content'
+    )
+    subparsers.add_parser(
+        'resume', parents=[common], help='Only publish the results of finished batch jobs'
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main orchestration function."""
+    args = parse_args(sys.argv[1:])
+    if getattr(args, 'no_llm_cache', False):
+        disable_llm_cache()
+    project_root = get_project_root()
+
+    tracer = start_trace('newspaper')
+    try:
+        return COMMANDS[args.command](args, project_root)
+    finally:
+        tracer.finish()
+        tracer.log_summary()
+        try:
+            trace_path = tracer.write(project_root, args.trace)
+            logger.info(f"Run trace written to {trace_path}")
+        except OSError as e:
+            logger.warning(f"Could not write run trace: {e}")
 
 if __name__ == '__main__':
     sys.exit(main())
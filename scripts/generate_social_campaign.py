@@ -16,6 +16,7 @@ import os
 import random
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
@@ -43,6 +44,11 @@ except ImportError as exc:
     )
     sys.exit(1)
 
+from article_store import write_json_atomic
+from config import OG_IMAGE_WIDTH, SOCIAL_BLOG_CACHE, SOCIAL_PARSE_POOL_MIN, SOCIAL_PARSE_WORKERS
+from images import pick_variant
+from llm_cache import disable_llm_cache, get_llm_cache
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -53,6 +59,10 @@ logger = logging.getLogger(__name__)
 BASE_URL = "https://islamiceconomics.github.io"
 DEFAULT_IMAGE_URL = f"{BASE_URL}/images/islamiceconomy.jpeg"
 PODCAST_COVER_URL = f"{BASE_URL}/podcast/cover-art-series1.jpg"
+# Written by the deploy workflow (build_site.py --deploy); Website/img/ is
+# not committed, so this is the only copy the social workflow can see.
+PUBLISHED_IMAGE_MANIFEST_URL = f"{BASE_URL}/img/manifest.json"
+IMAGE_MANIFEST_TIMEOUT_SECONDS = 20
 BUFFER_GRAPHQL_ENDPOINT = "https://api.buffer.com"
 DEFAULT_RECYCLE_AFTER_DAYS = 45
 X_POST_LIMIT = 250
@@ -70,6 +80,7 @@ ANTHROPIC_MODEL = os.environ.get("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 ANTHROPIC_MAX_OUTPUT_TOKENS = 2200
 AI_PROVIDER = os.environ.get("AI_PROVIDER", "auto")  # auto, anthropic, openai, none
 BODY_EXCERPT_MAX_CHARS = 800  # Truncate body text sent to AI to force synthesis
+BLOG_ITEM_CACHE_VERSION = 1  # bump when _parse_blog_html's output changes
 
 # Episodes/series excluded from social automation (war/conflict content that
 # could be misread in the context of active geopolitical events).
@@ -350,6 +361,40 @@ def resolve_local_asset_path(project_root: Path, asset_url: str) -> str:
     return str(candidate.resolve()) if candidate.exists() else ""
 
 
+_published_image_manifest: Optional[Dict[str, Any]] = None
+
+
+def published_image_manifest() -> Dict[str, Any]:
+    """
+    The image variants manifest of the deployed site, fetched once per run.
+
+    Social posts link to the live site, so variants are picked from what the
+    last deploy actually published. Returns {} when it cannot be fetched;
+    posts then link to the source images, which are always deployed.
+    """
+    global _published_image_manifest
+    if _published_image_manifest is None:
+        try:
+            response = requests.get(PUBLISHED_IMAGE_MANIFEST_URL, timeout=IMAGE_MANIFEST_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            manifest = response.json()
+            _published_image_manifest = manifest if isinstance(manifest, dict) else {}
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("Published image manifest unavailable, using source images: %s", exc)
+            _published_image_manifest = {}
+    return _published_image_manifest
+
+
+def social_image_url(asset_url: str) -> str:
+    """Swap a site image URL for its social-card sized variant when the deployed site has one."""
+    asset_url = normalize_whitespace(asset_url)
+    if not asset_url.startswith(BASE_URL):
+        return asset_url
+
+    source = asset_url.removeprefix(BASE_URL).lstrip("/")
+    return f"{BASE_URL}/{pick_variant(published_image_manifest(), source, OG_IMAGE_WIDTH)}"
+
+
 def load_state(path: Path) -> Dict[str, Any]:
     ensure_json_file(path, {"items": {}})
     return json.loads(path.read_text(encoding="utf-8"))
@@ -387,7 +432,15 @@ def iter_ld_json(raw_text: str) -> Iterable[Dict[str, Any]]:
 
 
 def parse_blog_article(path: Path) -> ContentItem:
-    document = lxml_html.fromstring(path.read_text(encoding="utf-8"))
+    return resolve_blog_assets(get_project_root(), _parse_blog_html(path, path.read_bytes()), str(path.resolve()))
+
+
+def _parse_blog_html(path: Path, data: bytes) -> ContentItem:
+    """
+    Everything that depends only on the post's HTML. asset_url holds the raw
+    og:image URL; resolve_blog_assets() maps it to the current image variant.
+    """
+    document = lxml_html.fromstring(data.decode("utf-8"))
     meta_map: Dict[str, str] = {}
 
     for node in document.xpath("//meta[@content]"):
@@ -439,8 +492,6 @@ def parse_blog_article(path: Path) -> ContentItem:
     ]
     body_text = " ".join([paragraph for paragraph in paragraphs if paragraph][:8])
 
-    asset_url = meta_map.get("og:image") or DEFAULT_IMAGE_URL
-
     return ContentItem(
         content_id=f"blog-{path.stem}",
         kind="blog",
@@ -452,13 +503,35 @@ def parse_blog_article(path: Path) -> ContentItem:
         category=category,
         tags=tags[:8],
         body_text=truncate_text(body_text, 2400),
-        asset_url=asset_url,
-        local_asset_path=resolve_local_asset_path(get_project_root(), asset_url)
-        or str((get_project_root() / "Website" / "images" / "islamiceconomy.jpeg").resolve()),
-        local_path=str(path.resolve()),
+        asset_url=meta_map.get("og:image") or DEFAULT_IMAGE_URL,
     )
 
 
+def resolve_blog_assets(
+    project_root: Path,
+    item: ContentItem,
+    local_path: str,
+    resolved: Optional[Dict[str, Tuple[str, str]]] = None,
+) -> ContentItem:
+    """
+    Fill in the fields of a parsed post that depend on the checkout, not the
+    HTML. `resolved` memoizes image lookups across posts sharing an image.
+    """
+    resolved = {} if resolved is None else resolved
+    if item.asset_url not in resolved:
+        asset_url = social_image_url(item.asset_url)
+        # Variants only exist on the deployed site; cards are drawn from the source.
+        resolved[item.asset_url] = (
+            asset_url,
+            resolve_local_asset_path(project_root, asset_url)
+            or resolve_local_asset_path(project_root, item.asset_url)
+            or str((project_root / "Website" / "images" / "islamiceconomy.jpeg").resolve()),
+        )
+    item.asset_url, item.local_asset_path = resolved[item.asset_url]
+    item.local_path = local_path
+    return item
+
+
 def _is_blog_blacklisted(path: Path) -> bool:
     """Check if a blog post matches blacklisted slugs or sensitive keywords."""
     name_lower = path.stem.lower()
@@ -469,16 +542,84 @@ def _is_blog_blacklisted(path: Path) -> bool:
     return False
 
 
-def discover_blog_items(project_root: Path) -> List[ContentItem]:
+def _parse_blog_file(path: Path) -> Tuple[str, Dict[str, Any]]:
+    """Process-pool worker: (content sha256, parsed ContentItem fields) of one post."""
+    data = path.read_bytes()
+    return hashlib.sha256(data).hexdigest(), asdict(_parse_blog_html(path, data))
+
+
+def load_blog_item_cache(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != BLOG_ITEM_CACHE_VERSION:
+        return {}
+    return data.get("posts", {})
+
+
+def discover_blog_items(project_root: Path, workers: int = SOCIAL_PARSE_WORKERS) -> List[ContentItem]:
+    """
+    Parsed blog posts, newest first.
+
+    Parsing is cached in SOCIAL_BLOG_CACHE per file name. An entry is reused
+    when the file's mtime and size match. A fresh checkout resets every
+    mtime, so when only the mtime differs the content hash decides instead,
+    which costs a read but no parse. Posts that do need parsing are spread
+    over a process pool (capped at the CPU count) once there are at least
+    SOCIAL_PARSE_POOL_MIN of them.
+    """
     blog_dir = project_root / "Website" / "blog"
-    items = []
+    cache_path = project_root / SOCIAL_BLOG_CACHE
+    cache = load_blog_item_cache(cache_path)
+
+    posts: Dict[str, Dict[str, Any]] = {}
+    paths: List[Path] = []
+    stale: List[Path] = []
+    rehashed = 0
     for path in sorted(blog_dir.glob("*.html")):
         if path.name.startswith("."):
             continue
         if _is_blog_blacklisted(path):
             logger.info("Skipping blacklisted blog: %s", path.name)
             continue
-        items.append(parse_blog_article(path))
+        paths.append(path)
+        stat = path.stat()
+        entry = cache.get(path.name)
+        if entry and entry["size"] == stat.st_size:
+            if entry["mtime_ns"] == stat.st_mtime_ns:
+                posts[path.name] = entry
+                continue
+            if hashlib.sha256(path.read_bytes()).hexdigest() == entry["sha256"]:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                posts[path.name] = entry
+                rehashed += 1
+                continue
+        stale.append(path)
+
+    workers = min(workers, os.cpu_count() or 1)
+    if len(stale) >= SOCIAL_PARSE_POOL_MIN and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(_parse_blog_file, stale, chunksize=16))
+    else:
+        parsed = [_parse_blog_file(path) for path in stale]
+    for path, (sha256, fields) in zip(stale, parsed):
+        stat = path.stat()
+        posts[path.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256, "item": fields}
+
+    if stale or rehashed or len(posts) != len(cache):
+        write_json_atomic(cache_path, {"version": BLOG_ITEM_CACHE_VERSION, "posts": posts}, indent=None)
+    logger.info(
+        "Blog posts: %d parsed, %d unchanged, %d confirmed by content hash",
+        len(stale), len(paths) - len(stale) - rehashed, rehashed,
+    )
+
+    local_dir = blog_dir.resolve()
+    resolved: Dict[str, Tuple[str, str]] = {}
+    items = [
+        resolve_blog_assets(project_root, ContentItem(**posts[path.name]["item"]), str(local_dir / path.name), resolved)
+        for path in paths
+    ]
     return sorted(items, key=sort_key_for_item, reverse=True)
 
 
@@ -1266,7 +1407,7 @@ Content item:
 {json.dumps(prompt_item, ensure_ascii=True, indent=2)}
 """.strip()
 
-    try:
+    def call() -> str:
         client = OpenAI(api_key=api_key)
         response = client.responses.create(
             model=OPENAI_MODEL,
@@ -1285,7 +1426,22 @@ Content item:
                 }
             },
         )
-        response_text = getattr(response, "output_text", "") or ""
+        return getattr(response, "output_text", "") or ""
+
+    try:
+        response_text = get_llm_cache().cached_call(
+            {
+                "provider": "openai",
+                "model": OPENAI_MODEL,
+                "reasoning_effort": OPENAI_REASONING_EFFORT,
+                "max_output_tokens": OPENAI_MAX_OUTPUT_TOKENS,
+                "system": system_prompt,
+                "user": user_prompt,
+                "schema": social_campaign_schema(),
+            },
+            call,
+            validate=lambda text: _campaign_reply_ok(text, item),
+        )
         result = json.loads(response_text) if response_text else None
         if result:
             # Quality gate: reject X posts that look like raw excerpts or contain fabrications
@@ -1302,6 +1458,26 @@ Content item:
         return None
 
 
+def _campaign_reply_ok(response_text: str, item: ContentItem) -> bool:
+    """Whether a model reply parses and its X post passes the quality gate; only such replies are cached."""
+    try:
+        result = json.loads(_strip_json_fences(response_text))
+    except ValueError:
+        return False
+    if not isinstance(result, dict):
+        return False
+    x_post = (result.get("x") or {}).get("single_post", "")
+    return not _looks_like_excerpt(x_post, item) and not _contains_fabricated_specifics(x_post, item)
+
+
+def _strip_json_fences(response_text: str) -> str:
+    """Strip markdown fences if present."""
+    if response_text.startswith("```"):
+        response_text = re.sub(r"^```(?:json)?\s*", "", response_text)
+        response_text = re.sub(r"\s*```\s*$", "", response_text)
+    return response_text
+
+
 def generate_channels_with_anthropic(item: ContentItem, voice_pattern: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     """Generate social campaign channels using Anthropic Claude API."""
     api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -1448,7 +1624,7 @@ Content item:
 {json.dumps(prompt_item, ensure_ascii=True, indent=2)}
 """.strip()
 
-    try:
+    def call() -> str:
         client = anthropic_sdk.Anthropic(api_key=api_key)
         response = client.messages.create(
             model=ANTHROPIC_MODEL,
@@ -1456,11 +1632,21 @@ Content item:
             system=system_prompt,
             messages=[{"role": "user", "content": user_prompt}],
         )
-        response_text = response.content[0].text if response.content else ""
-        # Strip markdown fences if present
-        if response_text.startswith("```"):
-            response_text = re.sub(r"^```(?:json)?\s*", "", response_text)
-            response_text = re.sub(r"\s*```\s*$", "", response_text)
+        return response.content[0].text if response.content else ""
+
+    try:
+        response_text = get_llm_cache().cached_call(
+            {
+                "provider": "anthropic",
+                "model": ANTHROPIC_MODEL,
+                "max_output_tokens": ANTHROPIC_MAX_OUTPUT_TOKENS,
+                "system": system_prompt,
+                "user": user_prompt,
+            },
+            call,
+            validate=lambda text: _campaign_reply_ok(text, item),
+        )
+        response_text = _strip_json_fences(response_text)
         result = json.loads(response_text) if response_text else None
         if result:
             x_post = (result.get("x") or {}).get("single_post", "")
@@ -2171,6 +2357,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use deterministic templates instead of OpenAI generation.",
     )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the model, ignoring cached responses.",
+    )
     parser.add_argument(
         "--list-buffer-profiles",
         action="store_true",
@@ -2184,6 +2375,8 @@ def main() -> int:
     _stagger_index = 0  # Reset stagger for each run
 
     args = parse_args()
+    if args.no_llm_cache:
+        disable_llm_cache()
     if args.list_buffer_profiles:
         list_buffer_profiles()
         return 0
@@ -2231,6 +2424,7 @@ def main() -> int:
         logger.info("Wrote %s and %s", json_path, markdown_path)
 
     save_state(state_path, state)
+    get_llm_cache().log_stats()
     if publish_failed:
         logger.error("Campaign generation completed, but at least one Buffer publish attempt failed.")
         return 1
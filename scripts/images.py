@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Responsive image derivatives for the site's photos, thumbnails and figures.
+
+Every source matched by IMAGE_SOURCES is resized to each of IMAGE_WIDTHS that
+is narrower than the source, plus its full width capped at the largest of
+them. Each size is written as AVIF (when Pillow has AVIF support), as WebP and
+in the source's own format, under Website/img/ beside the source's
+directory:
+
+    img/theory/fig3_1_marshallian_demand.480.3c9e0f12ab.webp
+
+The hash in a derived file's name covers the source bytes and the encoder
+settings. Derivatives are therefore content-addressed and safe to cache
+indefinitely. Website/img/manifest.json lists each source's hash, size and
+variants. A source whose hash is unchanged is skipped, and only new or edited
+sources are encoded, on a process pool. Variants that no source references
+any more are deleted. build_site's images stage only runs when a source's
+stat() changes, so an unchanged tree costs nothing.
+
+Pages pick variants through the manifest:
+    pick_variant()  one file near a target width, e.g. the 1200px JPEG for
+                    a social card (generate_social_campaign)
+    rewrite_html()  wraps <img> tags pointing at a source in a <picture> with
+                    AVIF/WebP <source> sets and a srcset on the fallback <img>,
+                    and points og:image / twitter:image at the card-sized JPEG
+
+Variants are not committed: Website/img/ is gitignored. The deploy workflow
+derives them and rewrites the pages of the checkout it uploads as the Pages
+artifact (build_site.py --deploy), so the committed pages keep plain <img>
+tags and source image URLs. The manifest is published with them at
+img/manifest.json; generate_social_campaign reads that copy to link social
+cards to variants that are actually live.
+
+Usage:
+    python scripts/images.py            # encode new or changed sources
+    python scripts/images.py --force    # re-encode everything
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from article_store import write_json_atomic
+from assets import html_pages
+from config import (
+    BUILD_WORKERS, IMAGE_OUTPUT_DIR, IMAGE_QUALITY, IMAGE_SIZES, IMAGE_SOURCES, IMAGE_WIDTHS,
+    OG_IMAGE_WIDTH, SITE_ORIGIN
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+SOURCE_FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg'}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'png': 'png', 'jpeg': 'jpg'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# libavif speed 0-10: 8 encodes about 2.5x faster than the default for ~5% more bytes.
+AVIF_SPEED = 8
+
+IMG_RE = re.compile(r'<img\b[^>]*>', re.I)
+PICTURE_RE = re.compile(r'<picture data-derived>.*?</picture>', re.S)
+SRC_RE = re.compile(r'''\bsrc=(["'])([^"']+)\1''')
+# Attributes rewrite_html adds; stripped before an <img> is wrapped again.
+ADDED_ATTR_RE = re.compile(r'''\s(?:srcset|sizes|loading|decoding)=(["'])[^"']*\1''')
+# Social card tags naming an image on this site, by source or derived file.
+CARD_IMAGE_RE = re.compile(
+    r'''(<meta\s+(?:property|name)=["'](?:og|twitter):image["']\s+content=["'])'''
+    + re.escape(SITE_ORIGIN) + r'''/([^"']+)(["'])'''
+)
+DERIVED_NAME_RE = re.compile(rf'^{IMAGE_OUTPUT_DIR}/(?P<stem>.+)\.\d+\.[0-9a-f]{{10}}\.\w+$')
+
+
+def modern_formats() -> Tuple[str, ...]:
+    """Formats served through <source>, best first, limited to what Pillow can encode."""
+    # Pillow is imported where images are encoded, so pages can be rewritten
+    # from the manifest without loading it.
+    from PIL import features
+
+    return tuple(fmt for fmt in ('avif', 'webp') if features.check(fmt))
+
+
+def encoder_params() -> Dict:
+    """Settings that shape the derived bytes; part of every derived file's hash."""
+    return {
+        'widths': list(IMAGE_WIDTHS),
+        'formats': list(modern_formats()),
+        'quality': IMAGE_QUALITY,
+        'avif_speed': AVIF_SPEED,
+    }
+
+
+# -- encoding --------------------------------------------------------------
+
+def target_widths(width: int) -> List[int]:
+    """Widths to derive for a source: each of IMAGE_WIDTHS below it, then its own (capped)."""
+    widths = [w for w in IMAGE_WIDTHS if w < width]
+    widths.append(min(width, max(IMAGE_WIDTHS)))
+    return sorted(set(widths))
+
+
+def _save(image: 'Image.Image', path: Path, fmt: str) -> int:
+    if fmt == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    options: Dict = {'quality': IMAGE_QUALITY[fmt]} if fmt in IMAGE_QUALITY else {}
+    if fmt == 'avif':
+        options['speed'] = AVIF_SPEED
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    image.save(tmp_path, format=fmt.upper(), **options)
+    tmp_path.replace(path)
+    return path.stat().st_size
+
+
+def _derive(job: Tuple[str, str, str, str, Tuple[str, ...]]) -> Tuple[str, Optional[Dict], str]:
+    """
+    Process-pool worker: encode every variant of one source.
+
+    Returns:
+        (source, manifest entry or None on failure, error message)
+    """
+    from PIL import Image
+
+    website, source, sha, tag, formats = job
+    try:
+        out_dir = Path(website) / IMAGE_OUTPUT_DIR / posixpath.dirname(source)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem, suffix = posixpath.splitext(posixpath.basename(source))
+        own_format = SOURCE_FORMATS[suffix.lower()]
+
+        with Image.open(Path(website) / source) as original:
+            original.load()
+            width, height = original.size
+            variants = []
+            for target in target_widths(width):
+                if target == width:
+                    resized = original
+                else:
+                    resized = original.resize((target, round(height * target / width)), Image.LANCZOS)
+                for fmt in formats + (own_format,):
+                    if fmt == own_format and target == width:
+                        continue  # the source itself is the full-width fallback
+                    name = f"{stem}.{target}.{tag}.{EXTENSIONS[fmt]}"
+                    size = _save(resized, out_dir / name, fmt)
+                    variants.append({
+                        'file': posixpath.join(IMAGE_OUTPUT_DIR, posixpath.dirname(source), name),
+                        'format': fmt,
+                        'width': target,
+                        'bytes': size,
+                    })
+
+        entry = {
+            'sha256': sha,
+            'format': own_format,
+            'width': width,
+            'height': height,
+            'bytes': (Path(website) / source).stat().st_size,
+            'variants': variants,
+        }
+        return source, entry, ''
+    except Exception as e:
+        return source, None, str(e)
+
+
+# -- manifest --------------------------------------------------------------
+
+def image_sources(website: Path) -> List[Path]:
+    """Source images matched by IMAGE_SOURCES, in path order."""
+    sources = set()
+    for pattern in IMAGE_SOURCES:
+        sources.update(
+            path for path in website.glob(pattern)
+            if path.suffix.lower() in SOURCE_FORMATS and path.is_file()
+        )
+    return sorted(sources)
+
+
+def manifest_path(website: Path) -> Path:
+    return website / IMAGE_OUTPUT_DIR / MANIFEST_NAME
+
+
+def load_manifest(website: Path) -> Dict:
+    empty = {'version': MANIFEST_VERSION, 'params': encoder_params(), 'images': {}}
+    try:
+        with open(manifest_path(website), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if data.get('version') != MANIFEST_VERSION or data.get('params') != encoder_params():
+        return empty
+    return data
+
+
+def build_images(website: Path, workers: int = BUILD_WORKERS, force: bool = False) -> Tuple[Dict, int]:
+    """
+    Encode the variants of every new or changed source image.
+
+    Args:
+        website: The Website/ directory
+        workers: Encoder processes
+        force: Re-encode sources whose hash is unchanged too
+
+    Returns:
+        (the updated manifest, number of sources encoded)
+    """
+    params = encoder_params()
+    previous = {} if force else load_manifest(website)['images']
+    tag_seed = json.dumps(params, sort_keys=True)
+    formats = modern_formats()
+
+    images: Dict[str, Dict] = {}
+    jobs = []
+    for path in image_sources(website):
+        source = path.relative_to(website).as_posix()
+        sha = hashlib.sha256(path.read_bytes()).hexdigest()
+        entry = previous.get(source)
+        if entry and entry['sha256'] == sha and all(
+            (website / variant['file']).exists() for variant in entry['variants']
+        ):
+            images[source] = entry
+            continue
+        tag = hashlib.sha256(f"{sha}{tag_seed}".encode('utf-8')).hexdigest()[:10]
+        jobs.append((str(website), source, sha, tag, formats))
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_derive, jobs))
+    else:
+        results = [_derive(job) for job in jobs]
+
+    failed = 0
+    for source, entry, error in results:
+        if entry is None:
+            failed += 1
+            logger.error(f"Error deriving images for {source}: {error}")
+            continue
+        images[source] = entry
+
+    manifest = {'version': MANIFEST_VERSION, 'params': params, 'images': dict(sorted(images.items()))}
+    _remove_unreferenced(website, manifest)
+    if jobs or previous.keys() != images.keys():
+        write_json_atomic(manifest_path(website), manifest)
+    if failed:
+        raise RuntimeError(f"{failed} source images failed to encode")
+    return manifest, len(jobs)
+
+
+def _remove_unreferenced(website: Path, manifest: Dict) -> None:
+    keep = {variant['file'] for entry in manifest['images'].values() for variant in entry['variants']}
+    keep.add(f"{IMAGE_OUTPUT_DIR}/{MANIFEST_NAME}")
+    root = website / IMAGE_OUTPUT_DIR
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.relpath(path, website).replace(os.sep, '/') not in keep:
+                os.remove(path)
+
+
+# -- picking variants ------------------------------------------------------
+
+def _candidates(entry: Dict, source: str, fmt: str) -> List[Tuple[int, str]]:
+    """(width, site-relative file) of one format, the source included, narrowest first."""
+    files = [(v['width'], v['file']) for v in entry['variants'] if v['format'] == fmt]
+    if fmt == entry['format']:
+        files.append((entry['width'], source))
+    return sorted(files)
+
+
+def pick_variant(manifest: Dict, source: str, width: int,
+                 formats: Sequence[str] = ('jpeg', 'png')) -> str:
+    """
+    Site-relative file to serve for a source at a target width.
+
+    Takes the narrowest variant at least `width` wide, or the widest one, in
+    the first of `formats` the source has. Sources without derivatives are
+    returned unchanged.
+    """
+    entry = manifest.get('images', {}).get(source)
+    if entry is None:
+        return source
+    for fmt in formats:
+        files = _candidates(entry, source, fmt)
+        if files:
+            return next((file for w, file in files if w >= width), files[-1][1])
+    return source
+
+
+def srcset(manifest: Dict, source: str, fmt: str, page_dir: str = '') -> str:
+    """srcset attribute value for one format of a source, relative to page_dir."""
+    entry = manifest.get('images', {}).get(source)
+    if entry is None:
+        return ''
+    return ', '.join(
+        f"{posixpath.relpath(file, page_dir or '.')} {w}w"
+        for w, file in _candidates(entry, source, fmt)
+    )
+
+
+def _card_source(images: Dict, file: str) -> Optional[str]:
+    """Source of a site file that is either a source image or one of its variants."""
+    if file in images:
+        return file
+    match = DERIVED_NAME_RE.match(file)
+    if match is None:
+        return None
+    return next((source for source in images if posixpath.splitext(source)[0] == match.group('stem')), None)
+
+
+def rewrite_html(html: str, page: str, manifest: Dict) -> str:
+    """
+    Serve derived variants for every <img> whose src is a known source.
+
+    Each such <img> is wrapped in <picture data-derived> with a <source> per
+    modern format. The <img> keeps its src and gains a srcset in the source's
+    own format, plus lazy loading. og:image and twitter:image tags naming a
+    source get its OG_IMAGE_WIDTH variant. Existing wrappers and card URLs are
+    rebuilt from their source, so the rewrite can be repeated whenever sources
+    change.
+
+    Args:
+        html: Page source
+        page: Site-relative path of the page, e.g. 'theory/dsge_uae.html'
+        manifest: Result of load_manifest() or build_images()
+    """
+    images = manifest.get('images')
+    if not images:
+        return html
+    page_dir = posixpath.dirname(page)
+    formats = manifest['params']['formats']
+
+    def wrap(img: str) -> Optional[str]:
+        match = SRC_RE.search(img)
+        if match is None or '//' in match.group(2) or match.group(2).startswith('/'):
+            return None
+        source = posixpath.normpath(posixpath.join(page_dir, match.group(2)))
+        entry = images.get(source)
+        if entry is None:
+            return None
+        img = ADDED_ATTR_RE.sub('', img)
+        attrs = (
+            f' srcset="{srcset(manifest, source, entry["format"], page_dir)}" sizes="{IMAGE_SIZES}"'
+            ' loading="lazy" decoding="async"'
+        )
+        tail = '/>' if img.endswith('/>') else '>'
+        img = img[:-len(tail)].rstrip() + attrs + tail
+        sources = ''.join(
+            f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(manifest, source, fmt, page_dir)}" sizes="{IMAGE_SIZES}">'
+            for fmt in formats
+        )
+        return f'<picture data-derived>{sources}{img}</picture>'
+
+    def replace_picture(match: re.Match) -> str:
+        img = IMG_RE.search(match.group(0))
+        wrapped = wrap(img.group(0)) if img else None
+        # A source that has gone away leaves the plain <img> behind.
+        return wrapped or (ADDED_ATTR_RE.sub('', img.group(0)) if img else match.group(0))
+
+    def replace_img(match: re.Match) -> str:
+        return wrap(match.group(0)) or match.group(0)
+
+    def replace_card(match: re.Match) -> str:
+        source = _card_source(images, match.group(2))
+        if source is None:
+            return match.group(0)
+        variant = pick_variant(manifest, source, OG_IMAGE_WIDTH)
+        return f"{match.group(1)}{SITE_ORIGIN}/{variant}{match.group(3)}"
+
+    # Bare <img> tags only: those inside a wrapper were handled with it.
+    parts = []
+    last = 0
+    for match in PICTURE_RE.finditer(html):
+        parts.append(IMG_RE.sub(replace_img, html[last:match.start()]))
+        parts.append(replace_picture(match))
+        last = match.end()
+    parts.append(IMG_RE.sub(replace_img, html[last:]))
+    return CARD_IMAGE_RE.sub(replace_card, ''.join(parts))
+
+
+def rewrite_pages(website: Path, pages: Iterable[str], manifest: Dict) -> int:
+    """Rewrite <img> and social card tags in the given pages; returns how many changed."""
+    root = str(website)
+    changed = 0
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            html = f.read()
+        if '<img' not in html and ':image' not in html:
+            continue
+        rel = os.path.relpath(page, root).replace(os.sep, '/')
+        rewritten = rewrite_html(html, rel, manifest)
+        if rewritten != html:
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(rewritten)
+            changed += 1
+    return changed
+
+
+def summarize(manifest: Dict) -> str:
+    images = manifest['images'].values()
+    variants = sum(len(entry['variants']) for entry in images)
+    original = sum(entry['bytes'] for entry in images)
+    # What a browser with the best format fetches at the widest derived size.
+    best_format = (manifest['params']['formats'] or [None])[0]
+    best = 0
+    for entry in images:
+        widest = [v for v in entry['variants'] if v['format'] == best_format]
+        best += max(widest, key=lambda v: v['width'])['bytes'] if widest else entry['bytes']
+    return (
+        f"{len(manifest['images'])} images, {variants} variants; "
+        f"{original / 1024 / 1024:.1f} MB originals -> {best / 1024 / 1024:.1f} MB as {best_format or 'source'}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Derive resized WebP/AVIF images and rewrite <img> tags.')
+    parser.add_argument('--force', action='store_true', help='Re-encode every source')
+    parser.add_argument('--workers', type=int, default=BUILD_WORKERS, help='Encoder processes')
+    args = parser.parse_args(argv)
+
+    website = Path(__file__).resolve().parent.parent / 'Website'
+    manifest, encoded = build_images(website, workers=args.workers, force=args.force)
+    changed = rewrite_pages(website, html_pages(website), manifest)
+    logger.info(f"Images: {encoded} encoded, {changed} pages rewritten; {summarize(manifest)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
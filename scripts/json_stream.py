@@ -0,0 +1,280 @@
+"""
+Incremental JSON validation against a JSON Schema, for streamed model output.
+
+StreamValidator is fed text as it arrives and raises SchemaDivergence at the
+first character after which the text can no longer become a valid instance:
+a syntax error, a value of the wrong type, an unknown or repeated property
+(with additionalProperties false), more array items than maxItems, an object
+closed without its required properties, or text after the top-level value.
+close() then checks that the value is actually complete, which catches
+output truncated by the token limit.
+
+Only the schema keywords used by structured-output schemas are understood:
+type, properties, required, additionalProperties, items, minItems, maxItems
+and enum (for strings). Anything else is accepted unchecked.
+
+    validator = StreamValidator(article_schema()['schema'])
+    for delta in deltas:
+        validator.feed(delta)   # raises SchemaDivergence early
+    validator.close()           # raises SchemaDivergence if truncated
+"""
+
+from typing import Any, Dict, List, Optional
+
+WHITESPACE = ' \t\r\n'
+NUMBER_CHARS = set('0123456789+-.eE')
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+LITERALS = {'t': ('true', 'boolean'), 'f': ('false', 'boolean'), 'n': ('null', 'null')}
+
+
+class SchemaDivergence(ValueError):
+    """The streamed text can no longer match the schema."""
+
+
+class _Frame:
+    """One open value on the parser stack."""
+
+    def __init__(self, kind: str, schema: Dict, path: str):
+        self.kind = kind  # object / array / string / literal / number
+        self.schema = schema
+        self.path = path
+        self.state = ''
+        self.key: Optional[str] = None
+        self.seen: set = set()
+        self.count = 0
+        self.chars: List[str] = []  # string or literal text so far
+        self.collect = False  # keep string characters (keys, enums)
+        self.escape: Optional[str] = None  # pending escape: '' after '\\', hex digits after '\\u'
+        self.literal = ''
+
+
+class StreamValidator:
+    """Push-down validator fed one chunk of text at a time."""
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self.stack: List[_Frame] = []
+        self.started = False
+        self.done = False
+        self.offset = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.done
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            self._char(char)
+            self.offset += 1
+
+    def close(self) -> None:
+        """Check the fed text is one complete value."""
+        if self.stack and self.stack[-1].kind == 'number':
+            self._end_number(self.stack.pop())
+        if not self.done:
+            where = self.stack[-1].path if self.stack else '$'
+            raise SchemaDivergence(f"Truncated output: {where} is incomplete after {self.offset} characters")
+
+    # -- parsing -----------------------------------------------------------
+
+    def _fail(self, message: str) -> None:
+        raise SchemaDivergence(f"{message} (at character {self.offset})")
+
+    def _char(self, char: str) -> None:
+        if not self.stack:
+            if char in WHITESPACE:
+                return
+            if self.started:
+                self._fail(f"Unexpected {char!r} after the top-level value")
+            self.started = True
+            self._start_value(char, self.schema, '$')
+            return
+
+        frame = self.stack[-1]
+        if frame.kind == 'string':
+            self._string_char(frame, char)
+        elif frame.kind == 'literal':
+            frame.chars.append(char)
+            text = ''.join(frame.chars)
+            if not frame.literal.startswith(text):
+                self._fail(f"{frame.path}: invalid literal {text!r}")
+            if text == frame.literal:
+                self._pop()
+        elif frame.kind == 'number':
+            if char in NUMBER_CHARS:
+                frame.chars.append(char)
+            else:
+                self._end_number(self.stack.pop())
+                self._value_done()
+                self._char(char)
+        elif frame.kind == 'object':
+            self._object_char(frame, char)
+        else:
+            self._array_char(frame, char)
+
+    def _start_value(self, char: str, schema: Dict, path: str) -> None:
+        if char == '{':
+            kind, json_type = 'object', 'object'
+        elif char == '[':
+            kind, json_type = 'array', 'array'
+        elif char == '"':
+            kind, json_type = 'string', 'string'
+        elif char in LITERALS:
+            kind, json_type = 'literal', LITERALS[char][1]
+        elif char == '-' or char.isdigit():
+            kind, json_type = 'number', 'number'
+        else:
+            self._fail(f"{path}: unexpected {char!r} where a value should start")
+
+        expected = schema.get('type')
+        allowed = expected if isinstance(expected, list) else [expected] if expected else None
+        if allowed is not None and json_type not in allowed and not (json_type == 'number' and 'integer' in allowed):
+            self._fail(f"{path}: expected {expected}, got {json_type}")
+
+        frame = _Frame(kind, schema, path)
+        if kind == 'object':
+            frame.state = 'key_or_end'
+        elif kind == 'array':
+            frame.state = 'value_or_end'
+        elif kind == 'string':
+            frame.collect = 'enum' in schema
+        elif kind == 'literal':
+            frame.literal = LITERALS[char][0]
+            frame.chars.append(char)
+        else:
+            frame.chars.append(char)
+        self.stack.append(frame)
+
+    def _pop(self) -> None:
+        self.stack.pop()
+        self._value_done()
+
+    def _value_done(self) -> None:
+        """A value just ended; advance whatever contains it."""
+        if not self.stack:
+            self.done = True
+            return
+        parent = self.stack[-1]
+        if parent.kind == 'object':
+            parent.seen.add(parent.key)
+        else:
+            parent.count += 1
+        parent.state = 'comma_or_end'
+
+    def _end_number(self, frame: _Frame) -> None:
+        text = ''.join(frame.chars)
+        try:
+            value = float(text)
+        except ValueError:
+            self._fail(f"{frame.path}: invalid number {text!r}")
+        if frame.schema.get('type') == 'integer' and not value.is_integer():
+            self._fail(f"{frame.path}: expected integer, got {text}")
+
+    def _string_char(self, frame: _Frame, char: str) -> None:
+        if frame.escape is not None:
+            if frame.escape == '':
+                if char == 'u':
+                    frame.escape = 'u'
+                    return
+                if char not in ESCAPES:
+                    self._fail(f"{frame.path}: invalid escape \\{char}")
+                frame.escape = None
+                self._string_add(frame, ESCAPES[char])
+                return
+            if char not in '0123456789abcdefABCDEF':
+                self._fail(f"{frame.path}: invalid \\u escape")
+            frame.escape += char
+            if len(frame.escape) == 5:
+                self._string_add(frame, chr(int(frame.escape[1:], 16)))
+                frame.escape = None
+            return
+
+        if char == '\\':
+            frame.escape = ''
+        elif char == '"':
+            self._end_string(frame)
+        elif char < ' ':
+            self._fail(f"{frame.path}: unescaped control character in string")
+        else:
+            self._string_add(frame, char)
+
+    def _string_add(self, frame: _Frame, char: str) -> None:
+        if not frame.collect:
+            return
+        frame.chars.append(char)
+        prefix = ''.join(frame.chars)
+        options = frame.schema['enum'] if frame.state != 'key' else self._allowed_keys(self.stack[-2])
+        if options is not None and not any(isinstance(o, str) and o.startswith(prefix) for o in options):
+            what = 'property' if frame.state == 'key' else 'value'
+            self._fail(f"{frame.path}: unexpected {what} {prefix!r}")
+
+    def _end_string(self, frame: _Frame) -> None:
+        text = ''.join(frame.chars)
+        if frame.state == 'key':
+            parent = self.stack[-2]
+            allowed = self._allowed_keys(parent)
+            if allowed is not None and text not in allowed:
+                self._fail(f"{parent.path}: unexpected property {text!r}")
+            if text in parent.seen:
+                self._fail(f"{parent.path}: repeated property {text!r}")
+            self.stack.pop()
+            parent.key = text
+            parent.state = 'colon'
+            return
+        if frame.collect and text not in frame.schema['enum']:
+            self._fail(f"{frame.path}: {text!r} is not one of {frame.schema['enum']}")
+        self._pop()
+
+    @staticmethod
+    def _allowed_keys(frame: _Frame) -> Optional[List[str]]:
+        if frame.schema.get('additionalProperties', True) is False:
+            return list(frame.schema.get('properties', {}))
+        return None
+
+    def _object_char(self, frame: _Frame, char: str) -> None:
+        if char in WHITESPACE:
+            return
+        state = frame.state
+        if state in ('key_or_end', 'key') and char == '"':
+            key = _Frame('string', frame.schema, frame.path)
+            key.state = 'key'
+            key.collect = True
+            self.stack.append(key)
+        elif state in ('key_or_end', 'comma_or_end') and char == '}':
+            missing = [k for k in frame.schema.get('required', []) if k not in frame.seen]
+            if missing:
+                self._fail(f"{frame.path}: missing required {', '.join(missing)}")
+            self._pop()
+        elif state == 'colon' and char == ':':
+            frame.state = 'value'
+        elif state == 'value':
+            schema = frame.schema.get('properties', {}).get(frame.key, {})
+            self._start_value(char, schema, f"{frame.path}.{frame.key}")
+        elif state == 'comma_or_end' and char == ',':
+            frame.state = 'key'
+        else:
+            self._fail(f"{frame.path}: unexpected {char!r} in object")
+
+    def _array_char(self, frame: _Frame, char: str) -> None:
+        if char in WHITESPACE:
+            return
+        state = frame.state
+        if state in ('value_or_end', 'comma_or_end') and char == ']':
+            if frame.count < frame.schema.get('minItems', 0):
+                self._fail(f"{frame.path}: {frame.count} items, fewer than {frame.schema['minItems']}")
+            self._pop()
+        elif state in ('value_or_end', 'value'):
+            if 'maxItems' in frame.schema and frame.count >= frame.schema['maxItems']:
+                self._fail(f"{frame.path}: more than {frame.schema['maxItems']} items")
+            self._start_value(char, frame.schema.get('items', {}), f"{frame.path}[{frame.count}]")
+        elif state == 'comma_or_end' and char == ',':
+            frame.state = 'value'
+        else:
+            self._fail(f"{frame.path}: unexpected {char!r} in array")
+
+
+def validate_text(text: str, schema: Dict[str, Any]) -> None:
+    """Validate a complete JSON text against a schema in one go."""
+    validator = StreamValidator(schema)
+    validator.feed(text)
+    validator.close()
@@ -0,0 +1,116 @@
+"""
+Single-pass keyword matcher for newspaper relevance scoring and categorisation.
+
+All RELEVANCE_KEYWORDS and CATEGORY_KEYWORDS are compiled once at import time
+into a trie over word tokens. An article is tokenised once and walked once,
+yielding both the relevance hits and the per-category scores, instead of one
+substring scan of the whole text per keyword.
+
+Matching is case-insensitive and word-boundary aware: keywords match whole
+words only, with a simple plural folding ("market" matches "markets" but not
+"supermarket"). Like the loops it replaces, each distinct keyword counts once
+no matter how often it appears.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+from config import CATEGORY_KEYWORDS, RELEVANCE_KEYWORDS
+
+RELEVANCE = 'relevance'
+
+# Words, plus standalone punctuation so that terms never match across a
+# sentence break. Hyphens are treated as spaces ("muslim-majority").
+TOKEN_RE = re.compile(r"\w+|[^\w\s-]")
+
+_END = ''  # trie key marking the end of a term; never a token
+
+
+def fold(token: str) -> str:
+    """Fold simple English plurals so "markets" and "market" share a key."""
+    if len(token) > 3 and token[-1] == 's' and token[-2] not in 'sui':
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [fold(token) for token in TOKEN_RE.findall(text.lower())]
+
+
+def normalize_term(term: str) -> str:
+    return ' '.join(term.lower().split())
+
+
+@dataclass
+class KeywordMatch:
+    relevance_hits: Set[str] = field(default_factory=set)
+    category_scores: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def relevance_score(self) -> int:
+        return len(self.relevance_hits)
+
+    def best_category(self, default: str = 'analysis') -> str:
+        """Highest-scoring category; ties go to the first in config order."""
+        if not self.category_scores:
+            return default
+        best = max(self.category_scores, key=self.category_scores.get)
+        return best if self.category_scores[best] > 0 else default
+
+
+class KeywordMatcher:
+    """Compiled matcher over relevance keywords and category keyword lists."""
+
+    def __init__(self, relevance_keywords: Iterable[str], category_keywords: Dict[str, List[str]]):
+        self.categories = list(category_keywords)
+        self._trie: Dict = {}
+
+        for keyword in relevance_keywords:
+            self._add(keyword, (RELEVANCE, normalize_term(keyword)))
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                self._add(keyword, (category, normalize_term(keyword)))
+
+    def _add(self, keyword: str, label: Tuple[str, str]) -> None:
+        tokens = tokenize(keyword)
+        if not tokens:
+            return
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(_END, set()).add(label)
+
+    def match(self, text: str) -> KeywordMatch:
+        result = KeywordMatch(category_scores={category: 0 for category in self.categories})
+        seen: Set[Tuple[str, str]] = set()
+        tokens = tokenize(text)
+        root = self._trie
+
+        for start in range(len(tokens)):
+            node = root.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                labels = node.get(_END)
+                if labels:
+                    seen.update(labels)
+                if position >= len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+
+        for group, term in seen:
+            if group == RELEVANCE:
+                result.relevance_hits.add(term)
+            else:
+                result.category_scores[group] += 1
+
+        return result
+
+
+MATCHER = KeywordMatcher(RELEVANCE_KEYWORDS, CATEGORY_KEYWORDS)
+
+
+def match_article(title: str, summary: str) -> KeywordMatch:
+    """Scan an article's title and summary once with the shared matcher."""
+    return MATCHER.match(title + " " + summary)
@@ -0,0 +1,215 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+
+Responses are keyed by a hash of everything that determines the output
+(provider, model, generation settings, system prompt, user prompt and response
+schema), so rerunning a job on identical input - a Tier 2 retry, a --force
+rerun, a dry re-render - returns the stored text in milliseconds instead of
+paying for another model call.
+
+Entries live one file per key under LLM_CACHE_DIR. Each carries its own TTL,
+hits refresh the file's mtime, and the least recently used entries are evicted
+once the directory grows past LLM_CACHE_MAX_MB. Set LLM_CACHE=off (or pass the
+scripts' --no-llm-cache flag) to bypass the cache entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from config import LLM_CACHE_DIR, LLM_CACHE_MAX_MB, LLM_CACHE_TTL_HOURS
+
+logger = logging.getLogger(__name__)
+
+KEY_VERSION = 1
+
+
+def cache_key(parts: Dict[str, Any]) -> str:
+    """Stable SHA-256 over the request parts that determine the response."""
+    payload = json.dumps({'v': KEY_VERSION, **parts}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Size-bounded LRU cache of response texts, one JSON file per key."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = LLM_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds: float = LLM_CACHE_TTL_HOURS * 3600,
+        enabled: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if time.time() > entry.get('expires_at', 0):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get('response')
+
+    def put(self, key: str, response: str, ttl_seconds: Optional[float] = None) -> None:
+        if not self.enabled or not response:
+            return
+
+        now = time.time()
+        entry = {
+            'created_at': now,
+            'expires_at': now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds),
+            'response': response,
+        }
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write LLM cache entry: {e}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._size is not None:
+                self._size += path.stat().st_size
+        self._evict_if_needed()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+        with self._lock:
+            self._size = None  # recounted on the next write
+
+    def cached_call(
+        self,
+        parts: Dict[str, Any],
+        call: Callable[[], str],
+        ttl_seconds: Optional[float] = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> str:
+        """
+        Return the cached response for parts, or run call() and store it.
+
+        With `validate`, only responses it accepts are stored, so a truncated
+        or malformed reply is requested again next time instead of being
+        replayed until it expires. A cached entry it rejects counts as a miss
+        and is deleted.
+        """
+        key = cache_key(parts)
+        cached = self.get(key)
+        if cached is not None:
+            if validate is None or validate(cached):
+                return cached
+            logger.warning("Discarding cached LLM response that fails validation")
+            self.delete(key)
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+
+        response = call()
+        if validate is None or validate(response):
+            self.put(key, response, ttl_seconds)
+        return response
+
+    def _evict_if_needed(self) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(p.stat().st_size for p in self.directory.glob('*/*.json'))
+            if self._size <= self.max_bytes:
+                return
+
+            files = []
+            for path in self.directory.glob('*/*.json'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            files.sort()
+
+            size = sum(entry[1] for entry in files)
+            target = int(self.max_bytes * 0.9)
+            for _, file_size, path in files:
+                if size <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                size -= file_size
+                self.evictions += 1
+            self._size = size
+
+    def log_stats(self) -> None:
+        if not self.enabled:
+            logger.info("LLM cache: disabled")
+            return
+        logger.info(
+            f"LLM cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.writes} writes, {self.evictions} evicted"
+        )
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide cache rooted at LLM_CACHE_DIR under the project root."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            project_root = Path(__file__).resolve().parent.parent
+            enabled = os.environ.get('LLM_CACHE', 'on').lower() not in ('0', 'off', 'false', 'no')
+            _cache = LLMCache(project_root / LLM_CACHE_DIR, enabled=enabled)
+        return _cache
+
+
+def disable_llm_cache() -> None:
+    """Bypass the cache for the rest of this process (--no-llm-cache)."""
+    get_llm_cache().enabled = False
@@ -0,0 +1,162 @@
+"""
+Diversity-aware selection of the day's stories.
+
+Picks the best N candidates by maximal marginal relevance (MMR): each pick
+maximizes
+
+    SELECTION_LAMBDA * relevance - (1 - SELECTION_LAMBDA) * redundancy
+
+where relevance is the candidate's rank score normalized to [0, 1], and
+redundancy is its highest similarity to a story already picked. Similarity
+mixes category, source and topic overlap. A candidate's term set is built
+once, the first time it is compared, so each pair costs one set intersection.
+
+A candidate's MMR score can only go down as more stories are picked. Selection
+is therefore a lazy greedy over a max-heap: the top entry is re-scored against
+the current picks and taken if it still beats the next entry's stale bound;
+otherwise it is pushed back. Most candidates are never re-scored, and each of
+the k picks costs O(log n) heap operations.
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from config import (
+    SELECTION_CATEGORY_WEIGHT, SELECTION_LAMBDA, SELECTION_SOURCE_WEIGHT,
+    SELECTION_TOPIC_WEIGHT
+)
+from relevance_ranker import terms
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Pick:
+    """Why a candidate was chosen; stored on the article as 'selection'."""
+    rank: int
+    mmr: float
+    relevance: float
+    redundancy: float
+    most_similar: Optional[str] = None
+
+    def as_dict(self) -> Dict:
+        return {
+            'rank': self.rank,
+            'mmr': round(self.mmr, 4),
+            'relevance': round(self.relevance, 4),
+            'redundancy': round(self.redundancy, 4),
+            'most_similar': self.most_similar,
+        }
+
+
+class _Candidate:
+    __slots__ = ('article', 'relevance', 'category', 'source', '_topic')
+
+    def __init__(self, article: Dict, relevance: float):
+        self.article = article
+        self.relevance = relevance
+        self.category = article.get('assigned_category')
+        self.source = article.get('source')
+        self._topic: Optional[FrozenSet[str]] = None
+
+    @property
+    def topic(self) -> FrozenSet[str]:
+        """Term set, built on first use; most candidates are never compared."""
+        if self._topic is None:
+            self._topic = frozenset(
+                terms(f"{self.article.get('title', '')} {self.article.get('summary', '')}")
+            )
+        return self._topic
+
+
+def similarity(a: _Candidate, b: _Candidate) -> float:
+    """Weighted category / source / topic (Jaccard) overlap in [0, 1]."""
+    score = 0.0
+    if a.category and a.category == b.category:
+        score += SELECTION_CATEGORY_WEIGHT
+    if a.source and a.source == b.source:
+        score += SELECTION_SOURCE_WEIGHT
+    if a.topic and b.topic:
+        shared = len(a.topic & b.topic)
+        if shared:
+            score += SELECTION_TOPIC_WEIGHT * shared / (len(a.topic) + len(b.topic) - shared)
+    return score
+
+
+def select_diverse(
+    articles: List[Dict],
+    n: int,
+    lam: float = SELECTION_LAMBDA,
+    score_key: str = 'rank_score',
+) -> List[Dict]:
+    """
+    Select up to n articles balancing relevance against overlap.
+
+    Args:
+        articles: Candidates with assigned_category and a relevance score
+        n: Number of articles to select
+        lam: Relevance weight; 1.0 picks purely by score, lower values favour variety
+        score_key: Article field holding the relevance score (falls back to
+            relevance_score)
+
+    Returns:
+        Selected articles in pick order, each annotated with article['selection']
+    """
+    if n <= 0 or not articles:
+        return []
+
+    raw = [float(a.get(score_key, a.get('relevance_score', 0)) or 0) for a in articles]
+    top = max(raw) or 1.0
+    candidates = [_Candidate(article, score / top) for article, score in zip(articles, raw)]
+
+    # Max-heap of (-upper bound on MMR, input order, candidate index). A bound
+    # is exact once it has been scored against every pick made so far.
+    heap: List[Tuple[float, int, int]] = [
+        (-lam * candidate.relevance, i, i) for i, candidate in enumerate(candidates)
+    ]
+    heapq.heapify(heap)
+
+    picked: List[int] = []
+    scored_against = [0] * len(candidates)
+    details: Dict[int, Tuple[float, float, Optional[int]]] = {}  # index -> (mmr, redundancy, nearest)
+
+    while heap and len(picked) < n:
+        _, order, index = heapq.heappop(heap)
+        candidate = candidates[index]
+
+        if scored_against[index] < len(picked):
+            redundancy, nearest = 0.0, None
+            for chosen in picked:
+                sim = similarity(candidate, candidates[chosen])
+                if sim > redundancy:
+                    redundancy, nearest = sim, chosen
+            mmr = lam * candidate.relevance - (1 - lam) * redundancy
+            scored_against[index] = len(picked)
+            details[index] = (mmr, redundancy, nearest)
+            if heap and -heap[0][0] > mmr:
+                heapq.heappush(heap, (-mmr, order, index))
+                continue
+
+        picked.append(index)
+
+    selected = []
+    for rank, index in enumerate(picked, start=1):
+        candidate = candidates[index]
+        mmr, redundancy, nearest = details.get(index, (lam * candidate.relevance, 0.0, None))
+        pick = Pick(
+            rank=rank,
+            mmr=mmr,
+            relevance=candidate.relevance,
+            redundancy=redundancy,
+            most_similar=candidates[nearest].article.get('title') if nearest is not None else None,
+        )
+        logger.info(
+            f"Pick {rank}: mmr={mmr:.3f} relevance={candidate.relevance:.3f} "
+            f"redundancy={redundancy:.3f} [{candidate.category}] {candidate.article.get('title', '')}"
+        )
+        candidate.article['selection'] = pick.as_dict()
+        selected.append(candidate.article)
+
+    return selected
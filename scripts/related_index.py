@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Related-articles index for Al-Tijarah article pages.
+
+Every article in the store is reduced to a sparse, L2-normalized term vector
+built from its title, tags, category and body text (field-weighted, log term
+frequency times IDF, strongest RELATED_MAX_TERMS terms). An in-memory inverted
+index over those terms means adding an article only scores the articles it
+shares terms with. That one pass yields the new article's top-k and updates
+the top-k lists it now belongs in. Pages look their related links up by URL in
+O(1) and never scan articles.json.
+
+The index lives in .cache/newspaper/related_index.json and records how much
+of the article log it has consumed. sync() catches up from that offset, and a
+missing or outdated index is rebuilt from the whole log with global IDF
+weights, one block of the sparse similarity matrix at a time when NumPy and
+SciPy are installed. Incremental adds use the IDF at the time they are added,
+so run --rebuild occasionally to re-weight everything.
+
+Usage:
+    python scripts/related_index.py            # catch up with the article log
+    python scripts/related_index.py --rebuild  # rebuild from the whole log
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from article_store import ArticleStore, write_json_atomic
+from config import CACHE_DIR, RELATED_ARTICLES_COUNT, RELATED_MAX_TERMS
+from keyword_matcher import tokenize
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'category': 1.0, 'body': 1.0}
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can for from had has have how in into is it its "
+    "more most not of on or our over than that the their them then there these they this "
+    "those through to under was we were what when where which while who will with would".split()
+)
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Rows of the similarity matrix computed at a time during a rebuild.
+REBUILD_BLOCK_ROWS = 512
+
+
+def _words(text: str) -> List[str]:
+    return [
+        token for token in tokenize(text)
+        if token.isalnum() and len(token) > 2 and token not in STOPWORDS
+    ]
+
+
+def article_terms(article: Dict) -> Counter:
+    """Field-weighted term counts for an article record."""
+    counts: Counter = Counter()
+    for word in _words(article.get('title', '')):
+        counts[word] += FIELD_WEIGHTS['title']
+    for tag in article.get('tags') or []:
+        counts[f"tag:{' '.join(tag.lower().split())}"] += FIELD_WEIGHTS['tags']
+    if article.get('category'):
+        counts[f"cat:{article['category'].lower()}"] += FIELD_WEIGHTS['category']
+    body = TAG_RE.sub(' ', article.get('content_html') or article.get('excerpt', ''))
+    for word in _words(body):
+        counts[word] += FIELD_WEIGHTS['body']
+    return counts
+
+
+def display_meta(article: Dict) -> Dict[str, str]:
+    """Fields the article template shows for a related link."""
+    excerpt = article.get('excerpt', '')
+    if len(excerpt) > 180:
+        excerpt = excerpt[:177].rsplit(' ', 1)[0] + '...'
+    return {
+        'slug': article.get('slug', ''),
+        'title': article.get('title', ''),
+        'excerpt': excerpt,
+        'date_formatted': article.get('date_formatted', ''),
+    }
+
+
+class RelatedIndex:
+    """Top-k related articles per article URL, maintained incrementally."""
+
+    def __init__(self, k: int = RELATED_ARTICLES_COUNT, max_terms: int = RELATED_MAX_TERMS):
+        self.k = k
+        self.max_terms = max_terms
+        self.log_size = 0
+
+        self.urls: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.vectors: List[Dict[str, float]] = []
+        self.meta: List[Dict[str, str]] = []
+        self.related: List[List[Tuple[float, int]]] = []  # per doc, best first
+        self.df: Counter = Counter()
+        self.postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    # -- vectors -----------------------------------------------------------
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self.urls)) / (1 + self.df[term])) + 1.0
+
+    def _vector(self, counts: Counter) -> Dict[str, float]:
+        weights = {term: (1.0 + math.log(count)) * self._idf(term) for term, count in counts.items()}
+        top = heapq.nlargest(self.max_terms, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1.0
+        return {term: weight / norm for term, weight in top}
+
+    def _scores(self, vector: Dict[str, float], exclude: int) -> Dict[int, float]:
+        """Dot products with every indexed doc sharing at least one term."""
+        scores: Dict[int, float] = {}
+        for term, weight in vector.items():
+            for doc in self.postings.get(term, ()):
+                scores[doc] = scores.get(doc, 0.0) + weight * self.vectors[doc][term]
+        scores.pop(exclude, None)
+        return scores
+
+    def _insert(self, doc: int, vector: Dict[str, float], meta: Dict[str, str]) -> None:
+        self.vectors.append(vector)
+        self.meta.append(meta)
+        self.related.append([])
+        for term in vector:
+            self.postings.setdefault(term, []).append(doc)
+
+    def _offer(self, doc: int, score: float, other: int) -> bool:
+        """Offer `other` as a related article of `doc`; True if the list changed."""
+        current = self.related[doc]
+        if len(current) >= self.k and score <= current[-1][0]:
+            return False
+        current.append((score, other))
+        current.sort(key=lambda item: (-item[0], item[1]))
+        del current[self.k:]
+        return True
+
+    # -- updates -----------------------------------------------------------
+
+    def add(self, article: Dict) -> Set[str]:
+        """
+        Index one article and update the top-k lists it enters.
+
+        Returns:
+            URLs whose related links changed (the new article's included)
+        """
+        url = article.get('url')
+        if not url or url in self.ids:
+            return set()
+
+        counts = article_terms(article)
+        doc = len(self.urls)
+        self.urls.append(url)
+        self.ids[url] = doc
+        self.df.update(counts.keys())
+        vector = self._vector(counts)
+
+        scores = self._scores(vector, exclude=doc)
+        self._insert(doc, vector, display_meta(article))
+
+        changed = {url}
+        best = heapq.nlargest(self.k, scores.items(), key=lambda item: (item[1], -item[0]))
+        self.related[doc] = [(score, other) for other, score in best]
+        for other, score in scores.items():
+            if self._offer(other, score, doc):
+                changed.add(self.urls[other])
+        return changed
+
+    def rebuild(self, articles: Iterable[Dict]) -> None:
+        """Index all articles from scratch with IDF over the whole collection."""
+        self.__init__(self.k, self.max_terms)
+        records = [(a['url'], article_terms(a), a) for a in articles if a.get('url')]
+        for url, counts, _ in records:
+            if url not in self.ids:
+                self.ids[url] = len(self.urls)
+                self.urls.append(url)
+                self.df.update(counts.keys())
+
+        seen: Set[str] = set()
+        for url, counts, article in records:
+            if url in seen:
+                continue
+            seen.add(url)
+            self._insert(self.ids[url], self._vector(counts), display_meta(article))
+
+        # numpy and scipy are imported here rather than at module level: they
+        # dominate this module's import time and only a rebuild needs them.
+        try:
+            import numpy as np
+            from scipy import sparse
+        except ImportError:
+            np = sparse = None
+        if np is not None:
+            self._rank_all_sparse(np, sparse)
+            return
+        for doc, vector in enumerate(self.vectors):
+            scores = self._scores(vector, exclude=doc)
+            best = heapq.nlargest(self.k, scores.items(), key=lambda item: (item[1], -item[0]))
+            self.related[doc] = [(score, other) for other, score in best]
+
+    def _rank_all_sparse(self, np, sparse) -> None:
+        """Top-k of every doc from the similarity matrix, one block of rows at a time."""
+        columns: Dict[str, int] = {}
+        indptr, indices, data = [0], [], []
+        for vector in self.vectors:
+            for term, weight in vector.items():
+                indices.append(columns.setdefault(term, len(columns)))
+                data.append(weight)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(self.vectors), len(columns)))
+
+        k = min(self.k, len(self.vectors) - 1)
+        if k <= 0:
+            return
+        for start in range(0, matrix.shape[0], REBUILD_BLOCK_ROWS):
+            # Sparse times dense: the product is dense anyway once a shared
+            # category or tag links most articles.
+            block = np.ascontiguousarray((matrix @ matrix[start:start + REBUILD_BLOCK_ROWS].T.toarray()).T)
+            rows = np.arange(block.shape[0])
+            block[rows, rows + start] = -1.0
+            top = np.argpartition(block, -k, axis=1)[:, -k:]
+            for row, candidates in enumerate(top):
+                ranked = sorted(
+                    ((float(block[row, other]), int(other)) for other in candidates),
+                    key=lambda item: (-item[0], item[1]),
+                )
+                self.related[start + row] = [(score, other) for score, other in ranked if score > 0]
+
+    def sync(self, store: ArticleStore) -> Set[str]:
+        """Index records appended to the store since the last sync."""
+        if self.log_size > store.log_size:
+            logger.info("Article log shrank; rebuilding related-articles index")
+            self.log_size = 0
+        if self.log_size == 0 and not self.urls:
+            self.rebuild(store.records_since(0))
+            self.log_size = store.log_size
+            return set(self.urls)
+
+        changed: Set[str] = set()
+        for article in store.records_since(self.log_size):
+            changed |= self.add(article)
+        self.log_size = store.log_size
+        return changed
+
+    # -- lookups -----------------------------------------------------------
+
+    def lookup(self, url: str) -> List[Dict[str, str]]:
+        """Related-article display fields for a page, best first."""
+        doc = self.ids.get(url)
+        if doc is None:
+            return []
+        return [self.meta[other] for _, other in self.related[doc]]
+
+    # -- persistence -------------------------------------------------------
+
+    @staticmethod
+    def default_path(project_root: Path) -> Path:
+        return Path(project_root) / CACHE_DIR / 'related_index.json'
+
+    def _params(self) -> Dict:
+        return {'k': self.k, 'max_terms': self.max_terms, 'fields': FIELD_WEIGHTS}
+
+    @classmethod
+    def load(cls, path: Path) -> 'RelatedIndex':
+        index = cls()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if data.get('version') != INDEX_VERSION or data.get('params') != index._params():
+            logger.info("Related-articles index parameters changed; it will be rebuilt")
+            return index
+
+        for doc, entry in enumerate(data['docs']):
+            index.urls.append(entry['url'])
+            index.ids[entry['url']] = doc
+            index._insert(doc, entry['vector'], entry['meta'])
+            index.related[doc] = [(score, other) for score, other in entry['related']]
+        index.df = Counter(data['df'])
+        index.log_size = data['log_size']
+        return index
+
+    def save(self, path: Path) -> None:
+        docs = [
+            {
+                'url': url,
+                'vector': {term: round(weight, 5) for term, weight in vector.items()},
+                'meta': meta,
+                'related': [[round(score, 5), other] for score, other in related],
+            }
+            for url, vector, meta, related in zip(self.urls, self.vectors, self.meta, self.related)
+        ]
+        write_json_atomic(
+            path,
+            {
+                'version': INDEX_VERSION,
+                'params': self._params(),
+                'log_size': self.log_size,
+                'df': self.df,
+                'docs': docs,
+            },
+            indent=None,
+        )
+
+
+def open_related_index(project_root: Path, store: Optional[ArticleStore] = None) -> RelatedIndex:
+    """Load the index for a project and bring it up to date with the store."""
+    index = RelatedIndex.load(RelatedIndex.default_path(project_root))
+    changed = index.sync(store or ArticleStore.open(project_root))
+    if changed:
+        logger.info(f"Related-articles index: {len(index)} articles, {len(changed)} pages affected")
+    return index
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Update the related-articles index.')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild from the whole article log')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent
+    path = RelatedIndex.default_path(project_root)
+    store = ArticleStore.open(project_root)
+
+    if args.rebuild:
+        index = RelatedIndex()
+        index.rebuild(store.records_since(0))
+        index.log_size = store.log_size
+    else:
+        index = open_related_index(project_root, store)
+
+    index.save(path)
+    logger.info(f"Related-articles index: {len(index)} articles written to {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Client-side search index for the Al-Tijarah blog.
+
+Writes a sharded inverted index of the current articles to Website/data/search/
+so blog.html can search without a server. js/blog-search.js reads it.
+
+    index.json        manifest: format version, prefix length, stopwords,
+                      docs.json hash, shards
+    docs.json         doc id -> [url, title, date, category]
+    shards/<key>.bin  postings of every term starting with <key>
+
+Terms are tokenized like keyword_matcher, so plurals fold, and sharded on their
+first SEARCH_SHARD_PREFIX_LENGTH characters. A query only fetches the shards
+of its own terms. A shard is a sequence of unsigned LEB128 varints:
+
+    shard   := count(terms) term*
+    term    := len(utf-8 bytes) bytes count(postings) posting*
+    posting := doc id - previous doc id, weight
+
+Terms are sorted and doc ids ascend within each posting list, so the gaps stay
+small. The weight is the field-weighted term count (title x3, tags x2).
+
+The index covers the current articles and every archived one (see
+archive_store), so search reaches past the front-page window. Archived
+articles are read from their partitions each time the index is synced.
+
+Doc ids are never reused, and a new article always gets a higher id than every
+indexed one, so adding it only appends to the posting lists it touches.
+data/search_index.json records which shards each article occupies. Adding or
+archiving articles therefore re-encodes only the shards they touch, and the
+rest of the index is left as it is.
+
+Usage:
+    python scripts/search_index.py            # sync with articles.json and the archive
+    python scripts/search_index.py --rebuild  # re-encode every shard
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from archive_store import ArchiveStore
+from article_store import date_key, write_json_atomic
+from config import DATA_DIR, SEARCH_SHARD_PREFIX_LENGTH
+from keyword_matcher import tokenize
+from related_index import STOPWORDS, TAG_RE
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+FIELD_WEIGHTS = {'title': 3, 'tags': 2, 'category': 1, 'body': 1}
+MAX_WEIGHT = 255
+
+ASCII_KEY_RE = re.compile(r'[a-z0-9_]+')
+
+Postings = Dict[str, List[Tuple[int, int]]]
+
+
+# -- encoding --------------------------------------------------------------
+
+def encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_shard(postings: Postings) -> bytes:
+    out = bytearray()
+    encode_varint(len(postings), out)
+    for term in sorted(postings):
+        raw = term.encode('utf-8')
+        encode_varint(len(raw), out)
+        out += raw
+        encode_varint(len(postings[term]), out)
+        previous = 0
+        for doc, weight in postings[term]:
+            encode_varint(doc - previous, out)
+            encode_varint(weight, out)
+            previous = doc
+    return bytes(out)
+
+
+def decode_shard(data: bytes) -> Postings:
+    postings: Postings = {}
+    count, pos = decode_varint(data, 0)
+    for _ in range(count):
+        length, pos = decode_varint(data, pos)
+        term = data[pos:pos + length].decode('utf-8')
+        pos += length
+        entries, pos = decode_varint(data, pos)
+        docs = []
+        doc = 0
+        for _ in range(entries):
+            gap, pos = decode_varint(data, pos)
+            weight, pos = decode_varint(data, pos)
+            doc += gap
+            docs.append((doc, weight))
+        postings[term] = docs
+    return postings
+
+
+# -- terms -----------------------------------------------------------------
+
+def shard_key(term: str, prefix_length: int = SEARCH_SHARD_PREFIX_LENGTH) -> str:
+    """File-safe shard name: the prefix itself if ASCII, else 'u' + its UTF-8 hex."""
+    prefix = term[:prefix_length]
+    if ASCII_KEY_RE.fullmatch(prefix):
+        return prefix
+    return 'u' + prefix.encode('utf-8').hex()
+
+
+def document_terms(article: Dict) -> Dict[str, int]:
+    """Searchable terms of an article with their field-weighted counts."""
+    counts: Counter = Counter()
+    fields = [
+        ('title', article.get('title', '')),
+        ('tags', ' '.join(article.get('tags') or [])),
+        ('category', article.get('category', '')),
+        ('body', TAG_RE.sub(' ', article.get('content_html') or article.get('excerpt', ''))),
+    ]
+    for field, text in fields:
+        for token in tokenize(text):
+            if len(token) > 1 and token.isalnum() and token not in STOPWORDS:
+                counts[token] += FIELD_WEIGHTS[field]
+    return {term: min(count, MAX_WEIGHT) for term, count in counts.items()}
+
+
+# -- index -----------------------------------------------------------------
+
+class SearchIndex:
+    """The published shards plus the doc -> shard bookkeeping to update them."""
+
+    def __init__(self, project_root: Path, prefix_length: int = SEARCH_SHARD_PREFIX_LENGTH):
+        self.project_root = Path(project_root)
+        self.prefix_length = prefix_length
+        self.output_dir = self.project_root / 'Website' / 'data' / 'search'
+        self.shard_dir = self.output_dir / 'shards'
+        self.manifest_path = self.output_dir / 'index.json'
+        self.docs_path = self.output_dir / 'docs.json'
+        self.state_path = self.project_root / DATA_DIR / 'search_index.json'
+
+        self.next_id = 0
+        self.docs: Dict[str, List] = {}  # url -> [doc id, shard keys]
+        self.display: Dict[str, List[str]] = {}  # doc id -> [url, title, date, category]
+        self.shards: Dict[str, Dict] = {}  # shard key -> manifest entry
+
+    @classmethod
+    def load(cls, project_root: Path, prefix_length: int = SEARCH_SHARD_PREFIX_LENGTH) -> 'SearchIndex':
+        """Load the published index; an inconsistent or outdated one loads empty."""
+        index = cls(project_root, prefix_length)
+        try:
+            with open(index.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            with open(index.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            with open(index.docs_path, 'r', encoding='utf-8') as f:
+                display = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if (manifest.get('version') != INDEX_VERSION
+                or manifest.get('prefix_length') != prefix_length
+                or state.get('version') != INDEX_VERSION
+                or len(display) != len(state.get('docs', {}))):
+            logger.info("Search index format changed; rebuilding")
+            return index
+
+        index.next_id = state['next_id']
+        index.docs = state['docs']
+        index.display = display
+        index.shards = manifest['shards']
+        return index
+
+    def _read_shard(self, key: str) -> Postings:
+        entry = self.shards.get(key)
+        if entry is None:
+            return {}
+        return decode_shard((self.shard_dir / entry['file']).read_bytes())
+
+    def _write_shard(self, key: str, postings: Postings) -> None:
+        path = self.shard_dir / f"{key}.bin"
+        if not postings:
+            self.shards.pop(key, None)
+            path.unlink(missing_ok=True)
+            return
+
+        data = encode_shard(postings)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.bin.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        self.shards[key] = {
+            'file': path.name,
+            'hash': hashlib.sha256(data).hexdigest()[:12],
+            'terms': len(postings),
+            'bytes': len(data),
+        }
+
+    def update(self, articles: Iterable[Dict]) -> Tuple[int, int, int]:
+        """
+        Make the index cover exactly the given articles.
+
+        Articles missing from the index are added oldest first, and indexed
+        articles that are no longer given (archived) are removed. Only the
+        shards those articles touch are read and rewritten.
+
+        Returns:
+            (articles added, articles removed, shards rewritten)
+        """
+        current = {a['url']: a for a in articles if a.get('url')}
+        removed = [url for url in self.docs if url not in current]
+        added = sorted(
+            (a for url, a in current.items() if url not in self.docs),
+            key=lambda a: date_key(a.get('date')),
+        )
+        if not added and not removed:
+            if not self.manifest_path.exists():
+                # Publish an empty index, so an empty site is not stale forever.
+                self._save()
+            return 0, 0, 0
+        if not self.docs:
+            # Starting over: drop shards left by an older or unreadable index.
+            for path in self.shard_dir.glob('*.bin'):
+                path.unlink()
+            self.shards = {}
+
+        removed_ids: Dict[str, Set[int]] = {}
+        for url in removed:
+            doc, keys = self.docs.pop(url)
+            self.display.pop(str(doc), None)
+            for key in keys:
+                removed_ids.setdefault(key, set()).add(doc)
+
+        additions: Dict[str, Postings] = {}
+        for article in added:
+            doc = self.next_id
+            self.next_id += 1
+            keys = set()
+            for term, weight in document_terms(article).items():
+                key = shard_key(term, self.prefix_length)
+                keys.add(key)
+                additions.setdefault(key, {}).setdefault(term, []).append((doc, weight))
+            self.docs[article['url']] = [doc, sorted(keys)]
+            self.display[str(doc)] = [
+                article['url'],
+                article.get('title', ''),
+                article.get('date_formatted', ''),
+                article.get('category', ''),
+            ]
+
+        touched = set(removed_ids) | set(additions)
+        for key in touched:
+            postings = self._read_shard(key)
+            gone = removed_ids.get(key)
+            if gone:
+                postings = {
+                    term: kept for term, docs in postings.items()
+                    if (kept := [entry for entry in docs if entry[0] not in gone])
+                }
+            for term, docs in additions.get(key, {}).items():
+                # New ids are above every indexed id, so appending keeps order.
+                postings.setdefault(term, []).extend(docs)
+            self._write_shard(key, postings)
+
+        self._save()
+        return len(added), len(removed), len(touched)
+
+    def rebuild(self, articles: Iterable[Dict]) -> Tuple[int, int, int]:
+        """Discard the published index and encode every shard again."""
+        self.next_id = 0
+        self.docs, self.display, self.shards = {}, {}, {}
+        return self.update(articles)
+
+    def _save(self) -> None:
+        write_json_atomic(self.docs_path, self.display, indent=None)
+        # The browser fetches docs.json?v=<docs_hash>, so a fresh index is
+        # never paired with a cached docs table.
+        docs_hash = hashlib.sha256(json.dumps(self.display, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        write_json_atomic(
+            self.manifest_path,
+            {
+                'version': INDEX_VERSION,
+                'prefix_length': self.prefix_length,
+                'doc_count': len(self.docs),
+                'docs_hash': docs_hash,
+                # Not indexed; the browser drops them from queries too.
+                'stopwords': sorted(STOPWORDS),
+                'shards': dict(sorted(self.shards.items())),
+            },
+            indent=None,
+        )
+        write_json_atomic(
+            self.state_path,
+            {'version': INDEX_VERSION, 'next_id': self.next_id, 'docs': self.docs},
+            indent=None,
+        )
+
+
+def archive_dir(project_root: Path) -> Path:
+    return Path(project_root) / 'Website' / 'data' / 'archive'
+
+
+def searchable_articles(articles: List[Dict], project_root: Path) -> List[Dict]:
+    """Archived articles followed by the current ones, which win on a shared URL."""
+    archive = ArchiveStore.open(archive_dir(project_root))
+    archived = [article for entry in archive.index() for article in archive.load_month(entry['month'])]
+    return archived + list(articles)
+
+
+def update_search_index(articles: List[Dict], project_root: Path) -> SearchIndex:
+    """Sync the blog search index with the current and archived articles, logging the change."""
+    index = SearchIndex.load(project_root)
+    added, removed, shards = index.update(searchable_articles(articles, project_root))
+    if added or removed:
+        logger.info(
+            f"Search index: +{added} / -{removed} articles, {shards} of {len(index.shards)} shards rewritten"
+        )
+    return index
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Update the blog search index.')
+    parser.add_argument('--rebuild', action='store_true', help='Re-encode every shard')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent
+    articles_file = project_root / 'Website' / 'data' / 'articles.json'
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+
+    if args.rebuild:
+        index = SearchIndex.load(project_root)
+        added, _, shards = index.rebuild(searchable_articles(articles, project_root))
+        logger.info(f"Search index rebuilt: {added} articles in {shards} shards")
+    else:
+        index = update_search_index(articles, project_root)
+
+    total = sum(entry['bytes'] for entry in index.shards.values())
+    logger.info(f"Search index: {len(index.docs)} articles, {len(index.shards)} shards, {total / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
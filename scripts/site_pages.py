@@ -0,0 +1,294 @@
+"""
+Page rendering for the Al-Tijarah blog.
+
+Renders article pages and the blog.html front page through the shared template
+service. Pages keep plain links to css/, js/ and source images, like the
+hand-written ones; the deploy workflow points them at fingerprinted assets
+(assets.py) and resized image variants (images.py) on the uploaded copy of
+the site. Used by
+generate_newspaper.py after each generation run and by build_site.py for full
+or incremental site rebuilds.
+"""
+
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import template_service
+from config import CACHE_DIR, DEFAULT_OG_IMAGE, SITE_ORIGIN
+from related_index import RelatedIndex
+
+logger = logging.getLogger(__name__)
+
+
+def generate_slug(title: str, date_prefix: bool = True) -> str:
+    """
+    Create URL-friendly slug from title.
+
+    Args:
+        title: Article title
+        date_prefix: Whether to prepend date (default True)
+
+    Returns:
+        URL-friendly slug
+    """
+    slug = re.sub(r'[^a-zA-Z0-9\s-]', '', title)
+    slug = re.sub(r'\s+', '-', slug.strip())
+    slug = slug.lower()
+    slug = slug[:60]
+
+    if date_prefix:
+        date_str = datetime.now().strftime('%Y%m%d')
+        slug = f"{date_str}-{slug}"
+
+    return slug
+
+
+def assign_slug(article_data: Dict) -> str:
+    """Give a new article its slug and blog URL, keeping any it already has."""
+    if not article_data.get('slug'):
+        slug = generate_slug(article_data['title'])
+        article_data['slug'] = slug
+        article_data['url'] = f"blog/{slug}.html"
+    return article_data['slug']
+
+
+def og_image_url(article_data: Dict, project_root: Path) -> str:
+    """Absolute URL of an article's image; deploy swaps in the social-card variant."""
+    return f"{SITE_ORIGIN}/{article_data.get('image') or DEFAULT_OG_IMAGE}"
+
+
+def write_article_html(article_data: Dict, project_root: Path,
+                       related_index: Optional[RelatedIndex] = None) -> Optional[str]:
+    """
+    Render article template and write to file.
+
+    Args:
+        article_data: Dict with article metadata and content
+        project_root: Path to project root
+        related_index: Index to take the related-article links from
+
+    Returns:
+        Path to written file or None if error
+    """
+    return write_articles_html([article_data], project_root, related_index)[0]
+
+
+def write_articles_html(articles: List[Dict], project_root: Path,
+                        related_index: Optional[RelatedIndex] = None) -> List[Optional[str]]:
+    """
+    Render many articles against one compiled template and write them out.
+
+    Args:
+        articles: Article dicts with metadata and content
+        project_root: Path to project root
+        related_index: Index to take the related-article links from; pages
+            are written without related links when it is None
+
+    Returns:
+        Path to each written file, or None where rendering or writing failed
+    """
+    blog_dir = project_root / 'Website' / 'blog'
+    blog_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        template = template_service.get_template(project_root, 'article_template.html')
+    except Exception as e:
+        logger.error(f"Error loading article template: {e}")
+        return [None] * len(articles)
+
+    paths: List[Optional[str]] = []
+    for article_data in articles:
+        try:
+            slug = assign_slug(article_data)
+            related = related_index.lookup(article_data['url']) if related_index else []
+            html_content = template.render(**{
+                **article_data,
+                'related_articles': related,
+                'og_image': og_image_url(article_data, project_root),
+            })
+
+            article_path = blog_dir / f"{slug}.html"
+            with open(article_path, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+
+            logger.info(f"Wrote article to {article_path}")
+            paths.append(str(article_path))
+
+        except Exception as e:
+            logger.error(f"Error writing article HTML: {e}")
+            paths.append(None)
+
+    return paths
+
+
+def rebuild_article_page(article: Dict, project_root: Path,
+                         related: Optional[List[Dict]] = None) -> bool:
+    """
+    Re-render an existing article page from its stored record.
+
+    Args:
+        article: Stored article record with its url
+        project_root: Path to project root
+        related: Related-article links for the page (see related_index)
+
+    Returns:
+        True if the page was written, False if it was already up to date
+    """
+    context = {
+        **article,
+        'related_articles': related or [],
+        'og_image': og_image_url(article, project_root),
+    }
+    html_content = template_service.render(project_root, 'article_template.html', **context)
+    return template_service.write_if_changed(project_root / 'Website' / article['url'], html_content)
+
+
+# Front-page sections: (context key, lower-cased category names, slot count)
+FRONT_PAGE_SECTIONS = [
+    ('analysis_articles', {'analysis', 'economic analysis', 'markets & commodities'}, 3),
+    ('oic_articles', {'oic economies', 'oic'}, 4),
+    ('opinion_articles', {'opinion & commentary', 'opinion'}, 5),
+    ('scripture_articles', {'islamic principles', 'scripture'}, 3),
+]
+SECONDARY_LEAD_SLOTS = 3
+
+
+def _newest_first(articles_db: List[Dict]) -> List[Dict]:
+    """Return articles newest first, skipping the sort when already ordered."""
+    dates = [a.get('date', '') for a in articles_db]
+    if all(dates[i] >= dates[i + 1] for i in range(len(dates) - 1)):
+        return articles_db
+    return sorted(articles_db, key=lambda a: a.get('date', ''), reverse=True)
+
+
+def bucket_front_page(articles_db: List[Dict]) -> Dict:
+    """
+    Fill the lead, secondary and section slots in a single pass.
+
+    Articles are visited newest first and the traversal stops as soon as
+    every slot is full. As before, the lead stories also count towards
+    their category's section.
+
+    Args:
+        articles_db: List of all article dicts
+
+    Returns:
+        Dict of blog template context entries for the article slots
+    """
+    buckets: Dict = {key: [] for key, _, _ in FRONT_PAGE_SECTIONS}
+    lead_article = None
+    secondary_leads: List[Dict] = []
+    open_slots = 1 + SECONDARY_LEAD_SLOTS + sum(limit for _, _, limit in FRONT_PAGE_SECTIONS)
+
+    for article in _newest_first(articles_db):
+        if lead_article is None:
+            lead_article = article
+            open_slots -= 1
+        elif len(secondary_leads) < SECONDARY_LEAD_SLOTS:
+            secondary_leads.append(article)
+            open_slots -= 1
+
+        category = article.get('category', '').lower()
+        for key, names, limit in FRONT_PAGE_SECTIONS:
+            if category in names and len(buckets[key]) < limit:
+                buckets[key].append(article)
+                open_slots -= 1
+                break
+
+        if open_slots == 0:
+            break
+
+    return {'lead_article': lead_article, 'secondary_leads': secondary_leads, **buckets}
+
+
+BLOG_TEMPLATE_MARKER = '<!-- Rendered from scripts/templates/blog_template.html -->'
+
+
+def blog_is_template_owned(blog_file: Path) -> bool:
+    """
+    Whether blog.html may be overwritten by the template.
+
+    A page rendered from blog_template.html carries BLOG_TEMPLATE_MARKER near
+    the top; the hand-curated page does not, and is left alone. Delete the
+    page (or add the marker) to hand it over to the template.
+    """
+    try:
+        with open(blog_file, 'r', encoding='utf-8') as f:
+            head = f.read(4096)
+    except FileNotFoundError:
+        return True
+    return BLOG_TEMPLATE_MARKER in head
+
+
+def regenerate_blog_html(articles_db: List[Dict], project_root: Path) -> Optional[bool]:
+    """
+    Regenerate blog.html from articles database.
+
+    The render context and template source are hashed and compared with the
+    previous build's stamp, so an unchanged front page is neither re-rendered
+    nor rewritten. Without a stamp the page is rendered and only written when
+    its bytes differ from the file on disk.
+
+    Args:
+        articles_db: List of all article dicts
+        project_root: Path to project root
+
+    An empty or missing article list renders nothing, so the hand-curated
+    blog.html is never replaced by an empty front page; nor is a blog.html
+    that was not rendered from the template (see blog_is_template_owned).
+    Both are deliberate skips, not failures.
+
+    Returns:
+        True if successful, None if skipped, False on error
+    """
+    if not articles_db:
+        logger.info("No articles to render; keeping the existing blog.html")
+        return None
+    if not blog_is_template_owned(project_root / 'Website' / 'blog.html'):
+        logger.info("blog.html is hand-curated, not rendered from blog_template.html; leaving it alone")
+        return None
+
+    try:
+        ticker_items = [
+            {'label': 'Brent Crude', 'value': '$75.20', 'change': '-0.8%', 'direction': 'down'},
+            {'label': 'Gold', 'value': '$2,842', 'change': '+0.3%', 'direction': 'up'},
+            {'label': 'Islamic Finance AUM', 'value': '$4.5T', 'change': '+11.3%', 'direction': 'up'},
+        ]
+
+        context = {
+            'current_date': datetime.now().strftime('%A, %B %d, %Y'),
+            **bucket_front_page(articles_db),
+            'ticker_items': ticker_items,
+        }
+
+        template = template_service.get_template(project_root, 'blog_template.html')
+        context_hash = template_service.context_digest(project_root, 'blog_template.html', context)
+
+        blog_file = project_root / 'Website' / 'blog.html'
+        stamp_file = project_root / CACHE_DIR / 'blog_context.sha256'
+        try:
+            previous_hash = stamp_file.read_text(encoding='utf-8').strip()
+        except OSError:
+            previous_hash = None
+
+        if previous_hash == context_hash and blog_file.exists():
+            logger.info("blog.html is up to date; skipping render")
+            return True
+
+        html_content = template.render(**context)
+
+        if template_service.write_if_changed(blog_file, html_content):
+            logger.info(f"Regenerated blog.html from {len(articles_db)} articles")
+        else:
+            logger.info("blog.html unchanged; skipping write")
+
+        stamp_file.parent.mkdir(parents=True, exist_ok=True)
+        stamp_file.write_text(context_hash, encoding='utf-8')
+        return True
+
+    except Exception as e:
+        logger.error(f"Error regenerating blog.html: {e}")
+        return False
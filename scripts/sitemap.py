@@ -0,0 +1,96 @@
+"""
+sitemap.xml reading and writing for the site build.
+
+Entries are dicts with loc, lastmod, changefreq and priority. Up to
+SITEMAP_MAX_URLS entries are written as a single <urlset> in sitemap.xml.
+Past that, sitemap.xml becomes a <sitemapindex> over sitemap-1.xml,
+sitemap-2.xml, ... as the sitemaps.org protocol requires. Either layout is
+read back transparently. Child files that are no longer needed are removed.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import template_service
+from config import SITEMAP_MAX_URLS
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+URL_RE = re.compile(
+    r'<url><loc>(?P<loc>[^<]+)</loc><lastmod>(?P<lastmod>[^<]*)</lastmod>'
+    r'<changefreq>(?P<changefreq>[^<]*)</changefreq><priority>(?P<priority>[^<]*)</priority></url>'
+)
+CHILD_RE = re.compile(r'<sitemap><loc>[^<]*/(?P<name>sitemap-\d+\.xml)</loc>')
+CHILD_NAME = 'sitemap-{}.xml'
+
+
+def read_sitemap(path: Path) -> List[Dict[str, str]]:
+    """Entries of sitemap.xml, following a sitemap index into its children."""
+    try:
+        text = path.read_text(encoding='utf-8')
+    except OSError:
+        return []
+
+    children = CHILD_RE.findall(text)
+    if not children:
+        return [m.groupdict() for m in URL_RE.finditer(text)]
+
+    entries: List[Dict[str, str]] = []
+    for name in children:
+        try:
+            child_text = (path.parent / name).read_text(encoding='utf-8')
+        except OSError:
+            continue
+        entries.extend(m.groupdict() for m in URL_RE.finditer(child_text))
+    return entries
+
+
+def _urlset(entries: List[Dict[str, str]]) -> str:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{XMLNS}">']
+    lines.extend(
+        f"<url><loc>{e['loc']}</loc><lastmod>{e['lastmod']}</lastmod>"
+        f"<changefreq>{e['changefreq']}</changefreq><priority>{e['priority']}</priority></url>"
+        for e in entries
+    )
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+
+def write_sitemap(
+    path: Path, entries: List[Dict[str, str]], origin: str, max_urls: int = SITEMAP_MAX_URLS
+) -> Tuple[int, int]:
+    """
+    Write entries as one sitemap or as an index plus child sitemaps.
+
+    Files are only rewritten when their content changes, so an unchanged
+    child keeps its mtime.
+
+    Returns:
+        (child sitemaps written, files whose content changed)
+    """
+    chunks = [entries[i:i + max_urls] for i in range(0, len(entries), max_urls)] or [[]]
+    changed = 0
+
+    if len(chunks) == 1:
+        changed += template_service.write_if_changed(path, _urlset(entries))
+        children = 0
+    else:
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{XMLNS}">']
+        for number, chunk in enumerate(chunks, start=1):
+            name = CHILD_NAME.format(number)
+            changed += template_service.write_if_changed(path.parent / name, _urlset(chunk))
+            lastmod = max(e['lastmod'] for e in chunk)
+            lines.append(f"<sitemap><loc>{origin}/{name}</loc><lastmod>{lastmod}</lastmod></sitemap>")
+        lines.append('</sitemapindex>')
+        changed += template_service.write_if_changed(path, '\n'.join(lines) + '\n')
+        children = len(chunks)
+
+    # Children beyond the current count belong to a larger, older sitemap.
+    number = children + 1
+    while (path.parent / CHILD_NAME.format(number)).exists():
+        (path.parent / CHILD_NAME.format(number)).unlink()
+        changed += 1
+        number += 1
+
+    return children, changed
@@ -0,0 +1,118 @@
+"""
+Shared Jinja template service for the Al-Tijarah page renderers.
+
+One Environment is built per process and reused for every page, so each
+template is compiled once rather than once per article. Compiled templates are
+also persisted in an on-disk bytecode cache, which lets the next run skip
+compilation entirely. Template files are only re-checked for changes in dev
+mode (TEMPLATE_DEV_MODE=1), where auto-reload is switched on.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, meta
+
+from config import CACHE_DIR, TEMPLATE_DIR
+
+DEV_MODE = os.environ.get('TEMPLATE_DEV_MODE', '').lower() in ('1', 'true', 'yes')
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+_environments: Dict[Path, Environment] = {}
+_lock = threading.Lock()
+
+
+def get_environment(project_root: Path) -> Environment:
+    """Return the cached Environment for a project root, creating it once."""
+    project_root = Path(project_root).resolve()
+
+    with _lock:
+        env = _environments.get(project_root)
+        if env is None:
+            bytecode_dir = project_root / CACHE_DIR / 'jinja'
+            bytecode_dir.mkdir(parents=True, exist_ok=True)
+            env = Environment(
+                # Templates ship next to the scripts; a project-level
+                # TEMPLATE_DIR still takes precedence when present.
+                loader=FileSystemLoader([
+                    str(project_root / TEMPLATE_DIR),
+                    str(SCRIPTS_DIR / TEMPLATE_DIR),
+                ]),
+                bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+                auto_reload=DEV_MODE,
+            )
+            _environments[project_root] = env
+        return env
+
+
+def get_template(project_root: Path, name: str) -> Template:
+    return get_environment(project_root).get_template(name)
+
+
+def render(project_root: Path, name: str, **context) -> str:
+    """Render a single template with the shared environment."""
+    return get_template(project_root, name).render(**context)
+
+
+def template_files(project_root: Path, name: str) -> List[Path]:
+    """
+    Files a template is built from: itself plus everything it extends,
+    includes or imports, transitively, in name order.
+
+    Only references with a literal name can be followed; a template chosen
+    by a variable at render time is not covered.
+    """
+    env = get_environment(project_root)
+    files: Dict[str, Path] = {}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in files:
+            continue
+        source, filename, _ = env.loader.get_source(env, current)
+        files[current] = Path(filename)
+        pending.extend(ref for ref in meta.find_referenced_templates(env.parse(source)) if ref)
+    return [files[key] for key in sorted(files)]
+
+
+def template_digest(project_root: Path, name: str) -> str:
+    """SHA-256 over the sources of a template and its dependencies, for build staleness checks."""
+    digest = hashlib.sha256()
+    for path in template_files(project_root, name):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def context_digest(project_root: Path, name: str, context: Dict[str, Any]) -> str:
+    """SHA-256 over a template's sources and a render context."""
+    digest = hashlib.sha256(template_digest(project_root, name).encode('ascii'))
+    digest.update(json.dumps(context, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Atomically write content unless the file already holds exactly it.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
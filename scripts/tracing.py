@@ -0,0 +1,239 @@
+"""
+Lightweight span tracing for pipeline runs.
+
+A Tracer records a tree of timed spans. Each span carries its wall time, any
+attributes, its own counters (feeds fetched, bytes, tokens, cache hits, ...)
+and the process's peak RSS when it ended, so the span during which the peak
+grew is visible. Spans nest through a per-thread stack. Work handed to a
+thread pool names its parent explicitly:
+
+    tracer = get_tracer()
+    with tracer.span('generate'):
+        parent = tracer.current()
+        ...  # in a worker thread:
+        with tracer.span('generate_article', parent=parent):
+            tracer.count('tokens_output', 812)
+
+Counters also roll up into run totals. write() stores the run as JSON under
+TRACE_DIR (one file per run, the newest TRACE_KEEP kept) and log_summary()
+logs a per-span table. Recording a span costs two perf_counter() calls and a
+getrusage(), so tracing is always on.
+"""
+
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from article_store import write_json_atomic
+from config import TRACE_DIR, TRACE_KEEP
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    end: Optional[float] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    counters: Dict[str, float] = field(default_factory=dict)
+    children: List['Span'] = field(default_factory=list)
+    status: str = 'ok'  # ok / error
+    error: str = ''
+    peak_rss_mb: Optional[float] = None
+    thread: str = ''
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float) -> Dict:
+        data = {
+            'name': self.name,
+            'start_s': round(self.start - origin, 6),
+            'duration_s': round(self.duration, 6),
+            'status': self.status,
+        }
+        if self.error:
+            data['error'] = self.error
+        if self.thread:
+            data['thread'] = self.thread
+        if self.attrs:
+            data['attrs'] = self.attrs
+        if self.counters:
+            data['counters'] = self.counters
+        if self.peak_rss_mb is not None:
+            data['peak_rss_mb'] = round(self.peak_rss_mb, 1)
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+class Tracer:
+    """A tree of spans plus run-wide counter totals for one run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self.root = Span(name, time.perf_counter())
+        self.totals: Dict[str, float] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Span:
+        """Innermost open span on this thread, or the root."""
+        stack = self._stack()
+        return stack[-1] if stack else self.root
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attrs: Any) -> Iterator[Span]:
+        """Time a block as a child of `parent` (default: the current span)."""
+        parent = parent or self.current()
+        span = Span(name, time.perf_counter(), attrs=dict(attrs))
+        if threading.current_thread() is not threading.main_thread():
+            span.thread = threading.current_thread().name
+        with self._lock:
+            parent.children.append(span)
+
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = 'error'
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.perf_counter()
+            span.peak_rss_mb = peak_rss_mb()
+            stack.pop()
+
+    def count(self, name: str, value: float = 1, span: Optional[Span] = None) -> None:
+        """Add to a counter on a span (default: the current one) and to the run total."""
+        span = span or self.current()
+        with self._lock:
+            span.counters[name] = span.counters.get(name, 0) + value
+            self.totals[name] = self.totals.get(name, 0) + value
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes to the current span."""
+        self.current().attrs.update(attrs)
+
+    def finish(self) -> None:
+        if self.root.end is None:
+            self.root.end = time.perf_counter()
+            self.root.peak_rss_mb = peak_rss_mb()
+
+    # -- output ------------------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': TRACE_VERSION,
+            'run': self.name,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_s': round(self.root.duration, 6),
+            'peak_rss_mb': round(self.root.peak_rss_mb, 1) if self.root.peak_rss_mb is not None else None,
+            'counters': self.totals,
+            'spans': [child.to_dict(self.root.start) for child in self.root.children],
+        }
+
+    def write(self, project_root: Path, path: Optional[Path] = None) -> Path:
+        """
+        Write the trace as JSON.
+
+        Args:
+            project_root: Path to project root
+            path: Explicit file; by default <TRACE_DIR>/<run>-<timestamp>.json,
+                pruning all but the newest TRACE_KEEP traces of this run
+
+        Returns:
+            Path of the written trace
+        """
+        if path is None:
+            trace_dir = Path(project_root) / TRACE_DIR
+            path = trace_dir / f"{self.name}-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json"
+            # Timestamped names sort oldest first; make room for this one.
+            traces = sorted(trace_dir.glob(f"{self.name}-*.json"))
+            for old in traces[:max(0, len(traces) - TRACE_KEEP + 1)]:
+                old.unlink()
+        write_json_atomic(Path(path), self.to_dict())
+        return Path(path)
+
+    def log_summary(self) -> None:
+        """Log every span as an indented table row, then the counter totals."""
+        total = self.root.duration or 1e-9
+        logger.info(f"Run trace ({self.name}):")
+        logger.info(f"  {'span':<32} {'status':<6} {'time':>8} {'share':>6} {'peak MB':>8}  counters")
+
+        def rows(span: Span, depth: int) -> None:
+            label = f"{'  ' * depth}{span.name}"
+            if span.thread:
+                label += f" [{span.thread}]"
+            peak = f"{span.peak_rss_mb:.0f}" if span.peak_rss_mb is not None else '-'
+            counters = ', '.join(f"{key}={_format(value)}" for key, value in sorted(span.counters.items()))
+            logger.info(
+                f"  {label:<32} {span.status:<6} {span.duration:>7.2f}s "
+                f"{span.duration / total:>6.0%} {peak:>8}  {counters}"
+            )
+            for child in span.children:
+                rows(child, depth + 1)
+
+        for child in self.root.children:
+            rows(child, 0)
+
+        totals = ', '.join(f"{key}={_format(value)}" for key, value in sorted(self.totals.items()))
+        peak = f", peak RSS {self.root.peak_rss_mb:.0f} MB" if self.root.peak_rss_mb is not None else ''
+        logger.info(f"Run took {self.root.duration:.2f}s{peak}; {totals or 'no counters'}")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.2f}"
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def start_trace(name: str) -> Tracer:
+    """Begin a new process-wide trace, replacing any earlier one."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = Tracer(name)
+        return _tracer
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer; library code records into it unconditionally."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer('run')
+        return _tracer